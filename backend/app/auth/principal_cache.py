@@ -0,0 +1,76 @@
+from typing import Optional
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.user import User
+from app.utils.cache import TTLCache
+
+# Resolved principals keyed by (user_id, token). Most requests only need the
+# id and role, so a hit skips the users lookup entirely; anything else is
+# loaded lazily from the request's session by CurrentUser.
+_principal_cache = TTLCache(maxsize=settings.AUTH_CACHE_MAXSIZE, ttl=settings.AUTH_CACHE_TTL_SECONDS)
+
+PRINCIPAL_FIELDS = ("id", "role", "is_active", "kyc_status")
+
+
+class CurrentUser:
+    """
+    The authenticated user as seen by route handlers. Principal fields are
+    served from the cache; any other attribute (name, email, password, ...)
+    loads the users row on first access, and assignments go to that row so
+    existing handlers can keep mutating current_user and committing.
+    """
+
+    def __init__(self, db: Session, principal: dict, record: Optional[User] = None):
+        object.__setattr__(self, "_db", db)
+        object.__setattr__(self, "_record", record)
+        for field in PRINCIPAL_FIELDS:
+            object.__setattr__(self, field, principal[field])
+
+    @property
+    def record(self) -> User:
+        """The underlying users row, attached to the request's session"""
+        record = object.__getattribute__(self, "_record")
+        if record is None:
+            record = self._db.get(User, self.id)
+            if record is None:
+                raise AttributeError("User no longer exists")
+            object.__setattr__(self, "_record", record)
+        return record
+
+    def __getattr__(self, name):
+        # Only called for attributes that are not principal fields
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.record, name)
+
+    def __setattr__(self, name, value):
+        setattr(self.record, name, value)
+        if name in PRINCIPAL_FIELDS:
+            object.__setattr__(self, name, getattr(self.record, name))
+            invalidate_user(self.id)
+
+    def __repr__(self):
+        return f"<CurrentUser id={self.id} role={self.role}>"
+
+
+def get_principal(user_id: int, token: str) -> Optional[dict]:
+    return _principal_cache.get((user_id, token))
+
+
+def cache_principal(user: User, token: str) -> dict:
+    principal = {field: getattr(user, field) for field in PRINCIPAL_FIELDS}
+    _principal_cache.set((user.id, token), principal)
+    return principal
+
+
+def invalidate_user(user_id: int) -> int:
+    """Drop every cached token for a user. Call after committing a change to their account"""
+    return _principal_cache.invalidate(lambda key: key[0] == user_id)
+
+
+def clear():
+    _principal_cache.clear()
+
+
+def stats() -> dict:
+    return _principal_cache.stats()
@@ -3,8 +3,9 @@ from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from app.database import get_db
 from app.dependencies import get_current_user
+from app.auth import principal_cache
 from app.models.user import User, UserRole
-from app.utils.hash_password import verify_password, hash_password
+from app.utils.hash_password import verify_password_pooled, hash_password_pooled
 from app.auth.security import create_access_token
 from datetime import timedelta, datetime
 
@@ -56,7 +57,7 @@ def login(request: LoginRequest, db: Session = Depends(get_db)):
         if not user.is_active:
             raise HTTPException(status_code=401, detail="Account is deactivated")
         
-        if not verify_password(request.password, user.password):
+        if not verify_password_pooled(request.password, user.password):
             print(f"Password verification failed for: {request.email}")
             raise HTTPException(status_code=401, detail="Invalid credentials")
         
@@ -94,7 +95,7 @@ def signup(request: SignupRequest, db: Session = Depends(get_db)):
         user = User(
             name=request.name,
             email=request.email,
-            password=hash_password(request.password),
+            password=hash_password_pooled(request.password),
             role=UserRole.user,
             is_active=True
         )
@@ -201,8 +202,9 @@ def reset_password(request: ResetPasswordRequest, db: Session = Depends(get_db))
     
     # Verify OTP via in-memory store first
     if verify_otp_logic(request.email, request.otp):
-        user.password = hash_password(request.new_password)
+        user.password = hash_password_pooled(request.new_password)
         db.commit()
+        principal_cache.invalidate_user(user.id)
         print(f"✅ Password reset successful for {user.email}")
         return {"message": "Password reset successfully"}
     
@@ -225,8 +227,9 @@ def reset_password(request: ResetPasswordRequest, db: Session = Depends(get_db))
         db.add(pr)
         
         # Reset password
-        user.password = hash_password(request.new_password)
+        user.password = hash_password_pooled(request.new_password)
         db.commit()
+        principal_cache.invalidate_user(user.id)
         
         print(f"✅ Password reset successful for {user.email}")
         return {"message": "Password reset successfully"}
@@ -250,7 +253,7 @@ def change_password(
             raise HTTPException(status_code=400, detail="New passwords do not match")
         
         # Verify old password
-        if not verify_password(request.old_password, current_user.password):
+        if not verify_password_pooled(request.old_password, current_user.password):
             raise HTTPException(status_code=400, detail="Current password is incorrect")
         
         # Check new password is different from old
@@ -258,8 +261,9 @@ def change_password(
             raise HTTPException(status_code=400, detail="New password must be different from current password")
         
         # Update password
-        current_user.password = hash_password(request.new_password)
+        current_user.password = hash_password_pooled(request.new_password)
         db.commit()
+        principal_cache.invalidate_user(current_user.id)
         
         print(f"✅ Password changed successfully for user {current_user.email}")
         return {"message": "Password changed successfully"}
@@ -0,0 +1,106 @@
+import threading
+import time
+from sqlalchemy import text
+from app.database import engine, Base, SessionLocal, init_database, wait_for_db
+
+# Everything that touches the schema or seeds data lives here and runs once per
+# deploy from `python init_db.py`, never on import or per request. The web
+# process only checks that the database answers, lazily, when asked.
+
+
+def _register_models():
+    """Import every mapped class so Base.metadata knows all tables"""
+    import app.models  # noqa: F401
+    from app.routers.support import SupportTicket, ChatMessage  # noqa: F401
+
+
+def _drop_legacy_objects():
+    # Left behind by an old categories table; its sequence blocks create_all on Postgres
+    if engine.dialect.name != "postgresql":
+        return
+    with engine.begin() as connection:
+        connection.execute(text("DROP SEQUENCE IF EXISTS categories_id_seq CASCADE"))
+
+
+def seed_default_users():
+    """Create the default admin, sample and test users if they are missing"""
+    from app.models.user import User, UserRole
+    from app.utils.hash_password import hash_password
+
+    defaults = [
+        ("admin@bank.com", "admin123", "Admin User", UserRole.admin),
+        ("user@bank.com", "user123", "Regular User", UserRole.user),
+        ("test@test.com", "test123", "Test User", UserRole.user),
+    ]
+
+    db = SessionLocal()
+    try:
+        existing = {
+            user.email: user
+            for user in db.query(User).filter(User.email.in_([email for email, *_ in defaults])).all()
+        }
+        for email, password, name, role in defaults:
+            user = existing.get(email)
+            if user is None:
+                db.add(User(
+                    email=email,
+                    password=hash_password(password),
+                    name=name,
+                    role=role,
+                    is_active=True,
+                    kyc_status="verified"
+                ))
+                print(f"Created default user: {email} / {password}")
+            elif role == UserRole.admin and not user.is_active:
+                # Re-enable the admin if its row was deactivated, so there is always a way in
+                user.is_active = True
+                print(f"Re-activated default user: {email}")
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def bootstrap(wait: bool = True):
+    """
+    One-shot database setup: wait for the server, create missing tables,
+    apply pending migrations and seed the default users. Idempotent.
+    """
+    from app.migrations import run_migrations
+
+    if wait and not wait_for_db(engine):
+        raise RuntimeError("Database is not reachable")
+    _register_models()
+    _drop_legacy_objects()
+    init_database()
+    run_migrations(engine)
+    seed_default_users()
+
+
+# --- Lazy readiness ---
+
+_READY_TTL_SECONDS = 5.0
+_ready_lock = threading.Lock()
+_ready_state = {"ok": None, "checked_at": 0.0, "error": None}
+
+
+def database_status(refresh: bool = True) -> dict:
+    """
+    Whether the database answers a trivial query. The result is reused for a
+    few seconds so probes do not open a connection each time; with
+    refresh=False the last known state is returned without touching the
+    database (None until something has checked).
+    """
+    with _ready_lock:
+        fresh = time.monotonic() - _ready_state["checked_at"] < _READY_TTL_SECONDS
+        if refresh and not fresh:
+            try:
+                with engine.connect() as connection:
+                    connection.execute(text("SELECT 1"))
+                _ready_state.update(ok=True, error=None)
+            except Exception as e:
+                _ready_state.update(ok=False, error=str(e).splitlines()[0])
+            _ready_state["checked_at"] = time.monotonic()
+        return {"ok": _ready_state["ok"], "error": _ready_state["error"]}
@@ -0,0 +1,57 @@
+import logging
+import threading
+from typing import Optional
+from app.config import settings
+from app.database import SessionLocal, try_advisory_lock
+from app.budgets.service import BudgetService
+
+logger = logging.getLogger(__name__)
+
+# Only one process reconciles at a time on Postgres (arbitrary application-wide key)
+_ADVISORY_LOCK_KEY = 72164002
+
+_stop = threading.Event()
+_thread: Optional[threading.Thread] = None
+
+
+def reconcile_budgets(user_id: Optional[int] = None) -> Optional[int]:
+    """
+    Run one reconciliation pass. Returns the number of budgets corrected, or
+    None when another process holds the reconciliation lock.
+    """
+    with try_advisory_lock(_ADVISORY_LOCK_KEY) as acquired:
+        if not acquired:
+            return None
+        db = SessionLocal()
+        try:
+            return BudgetService.reconcile_spent_amounts(db, user_id)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+def _run(interval: float):
+    while not _stop.wait(interval):
+        try:
+            corrected = reconcile_budgets()
+            if corrected:
+                logger.warning(f"Budget reconciliation corrected {corrected} budget(s)")
+        except Exception as e:
+            logger.error(f"Budget reconciliation failed: {e}")
+
+
+def start_reconciler():
+    """Reconcile every BUDGET_RECONCILE_INTERVAL_SECONDS on a daemon thread"""
+    global _thread
+    interval = settings.BUDGET_RECONCILE_INTERVAL_SECONDS
+    if interval <= 0 or (_thread is not None and _thread.is_alive()):
+        return
+    _stop.clear()
+    _thread = threading.Thread(target=_run, args=(interval,), name="budget-reconciler", daemon=True)
+    _thread.start()
+
+
+def stop_reconciler():
+    _stop.set()
@@ -1,16 +1,23 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import DateTime, Integer, and_, func, literal, select, union_all, update
 from fastapi import HTTPException, status
 from app.models.budget import Budget
 from app.models.transaction import Transaction
 from app.budgets.schemas import BudgetCreate, BudgetUpdate
-from typing import List, Optional
+from app.services.rollup_service import RollupDeltas
+from app.utils.cache import TTLCache, user_write_versions
+from typing import Dict, Iterable, List, Optional, Tuple
 from datetime import datetime
+from decimal import Decimal
 import logging
 
 # Set up logging to see errors in the console
 logger = logging.getLogger(__name__)
 
+# Debit totals per category for one user and month, keyed by the user's write
+# version so any committed transaction write makes the entry unreachable
+_month_spend_cache = TTLCache(maxsize=20000, ttl=3600)
+
 # Category mapping: category_id -> category_name
 CATEGORY_MAP = {
     1: "Food & Dining",
@@ -23,6 +30,13 @@ CATEGORY_MAP = {
     8: "General"
 }
 
+def _month_range(year: int, month: int) -> Tuple[datetime, datetime]:
+    """Half-open [start, end) datetime range covering one calendar month"""
+    start = datetime(year, month, 1)
+    end = datetime(year + month // 12, month % 12 + 1, 1)
+    return start, end
+
+
 class BudgetService:
     
     @staticmethod
@@ -76,16 +90,8 @@ class BudgetService:
             if year:
                 query = query.filter(Budget.year == year)
             
-            budgets = query.all()
-            
-            # Recalculate spent amounts for each budget
-            for budget in budgets:
-                budget.spent_amount = BudgetService._calculate_spent_amount(
-                    db, user_id, budget.category_id, budget.month, budget.year
-                )
-            
-            db.commit()
-            return budgets
+            # spent_amount is kept current by transaction writes, so this is a plain read
+            return query.all()
             
         except Exception as e:
             logger.error(f"FETCH ERROR: {str(e)}")
@@ -93,13 +99,7 @@ class BudgetService:
     
     @staticmethod
     def get_budget_by_id(db: Session, budget_id: int, user_id: int) -> Optional[Budget]:
-        budget = db.query(Budget).filter(Budget.id == budget_id, Budget.user_id == user_id).first()
-        if budget:
-            budget.spent_amount = BudgetService._calculate_spent_amount(
-                db, user_id, budget.category_id, budget.month, budget.year
-            )
-            db.commit()
-        return budget
+        return db.query(Budget).filter(Budget.id == budget_id, Budget.user_id == user_id).first()
 
     @staticmethod
     def update_budget(db: Session, budget_id: int, budget_data: BudgetUpdate, user_id: int) -> Optional[Budget]:
@@ -135,27 +135,128 @@ class BudgetService:
         db.commit()
         return True
 
+    @staticmethod
+    def get_month_spend(db: Session, user_id: int, periods: Iterable[Tuple[int, int]]) -> Dict[Tuple[int, int], Dict[str, float]]:
+        """
+        Debit totals by category for each (year, month) in `periods`, as
+        {(year, month): {category: spent}}. Months not in the cache are
+        computed together in one grouped query: a derived table of month
+        ranges joined to transactions on half-open txn_date bounds, so the
+        (user_id, category, txn_date) index is used instead of extract().
+        """
+        version = user_write_versions.get(user_id)
+        spend: Dict[Tuple[int, int], Dict[str, float]] = {}
+        missing = []
+        for period in sorted(set(periods)):
+            cached = _month_spend_cache.get((user_id, version) + period)
+            if cached is not None:
+                spend[period] = cached
+            else:
+                missing.append(period)
+
+        if missing:
+            for period, totals in BudgetService._query_month_spend(db, user_id, missing).items():
+                _month_spend_cache.set((user_id, version) + period, totals)
+                spend[period] = totals
+
+        return spend
+
+    @staticmethod
+    def _query_month_spend(db: Session, user_id: int, periods: List[Tuple[int, int]]) -> Dict[Tuple[int, int], Dict[str, float]]:
+        if not periods:
+            return {}
+        months = union_all(*[
+            select(
+                literal(year, Integer).label("year"),
+                literal(month, Integer).label("month"),
+                literal(start, DateTime).label("start"),
+                literal(end, DateTime).label("end")
+            )
+            for (year, month), (start, end) in ((p, _month_range(*p)) for p in periods)
+        ]).subquery("months")
+
+        rows = db.query(
+            months.c.year, months.c.month, Transaction.category, func.sum(Transaction.amount)
+        ).select_from(months).join(Transaction, and_(
+            Transaction.user_id == user_id,
+            Transaction.txn_type == 'debit',
+            Transaction.txn_date >= months.c.start,
+            Transaction.txn_date < months.c.end
+        )).group_by(months.c.year, months.c.month, Transaction.category).all()
+
+        spend = {period: {} for period in periods}
+        for year, month, category, spent in rows:
+            spend[(year, month)][category] = abs(float(spent)) if spent else 0.0
+        return spend
+
+    @staticmethod
+    def apply_spend_deltas(db: Session, deltas: RollupDeltas):
+        """
+        Adjust spent_amount on the budgets matching the debits in `deltas`, in
+        the caller's transaction. These are the daily rollup deltas every
+        transaction write already builds, so creates, edits, deletes and
+        imports all move budgets the same way.
+        """
+        by_budget: Dict[Tuple[int, int, int, str], Decimal] = {}
+        for (user_id, _, day, category, txn_type), (amount, _) in deltas.items():
+            if txn_type != 'debit' or not amount:
+                continue
+            key = (user_id, day.year, day.month, category)
+            by_budget[key] = by_budget.get(key, Decimal("0")) + amount
+
+        for (user_id, year, month, category), amount in by_budget.items():
+            if not amount:
+                continue
+            db.execute(
+                update(Budget)
+                .where(
+                    Budget.user_id == user_id,
+                    Budget.year == year,
+                    Budget.month == month,
+                    Budget.category == category
+                )
+                .values(spent_amount=func.coalesce(Budget.spent_amount, 0) + amount)
+                .execution_options(synchronize_session=False)
+            )
+
+    @staticmethod
+    def reconcile_spent_amounts(db: Session, user_id: Optional[int] = None) -> int:
+        """
+        Recompute spent_amount from the transactions table and correct budgets
+        that drifted. Each user's budgets are locked while they are checked, so
+        a concurrent increment waits for the correction instead of being
+        overwritten by it. Returns the number of budgets corrected.
+        """
+        query = db.query(Budget.user_id).distinct()
+        if user_id is not None:
+            query = query.filter(Budget.user_id == user_id)
+        user_ids = [row[0] for row in query.all()]
+        db.rollback()
+
+        corrected = 0
+        for uid in user_ids:
+            budgets = db.query(Budget).filter(Budget.user_id == uid).with_for_update().all()
+            spend = BudgetService._query_month_spend(db, uid, sorted({(b.year, b.month) for b in budgets}))
+            for budget in budgets:
+                actual = Decimal(str(spend[(budget.year, budget.month)].get(budget.category, 0.0))).quantize(Decimal("0.01"))
+                if budget.spent_amount is None or Decimal(str(budget.spent_amount)) != actual:
+                    logger.warning(
+                        f"Budget {budget.id} spent_amount drifted: stored {budget.spent_amount}, actual {actual}"
+                    )
+                    budget.spent_amount = actual
+                    corrected += 1
+            db.commit()
+        return corrected
+
     @staticmethod
     def _calculate_spent_amount(db: Session, user_id: int, category_id: int, month: int, year: int) -> float:
         """
         Calculate total spent for a category by matching category name from category_id.
         """
         try:
-            # Get category name from category_id
             category_name = CATEGORY_MAP.get(category_id, "General")
-            
-            # Query debit transactions matching the category name
-            query = db.query(func.sum(Transaction.amount)).filter(
-                Transaction.user_id == user_id,
-                func.extract('month', Transaction.txn_date) == month,
-                func.extract('year', Transaction.txn_date) == year,
-                Transaction.txn_type == 'debit',
-                Transaction.category == category_name  # Match by category name
-            )
-
-            spent = query.scalar()
-            result = abs(float(spent)) if spent else 0.0
-            
+            spend = BudgetService.get_month_spend(db, user_id, [(year, month)])
+            result = spend[(year, month)].get(category_name, 0.0)
             logger.info(f"💰 Calculated spent for category '{category_name}' (id={category_id}): ₹{result}")
             return result
             
@@ -194,11 +295,8 @@ class BudgetService:
             
             logger.info(f"📊 Budget check for '{budget.name}': ₹{current_spent} + ₹{abs(amount)} = ₹{new_total} / ₹{limit}")
             
+            # Only a preview: spent_amount moves when the transaction itself is written
             if new_total > limit:
-                # Update spent amount and create alert
-                budget.spent_amount = new_total
-                db.commit()
-                
                 return {
                     "alert": True,
                     "message": f"This transaction exceeds your '{budget.name}' budget! You've spent ₹{new_total:.2f} of ₹{limit:.2f}",
@@ -206,19 +304,11 @@ class BudgetService:
                     "budget_name": budget.name
                 }
             elif new_total > (limit * 0.8):
-                # Update spent amount
-                budget.spent_amount = new_total
-                db.commit()
-                
                 return {
                     "warning": True,
                     "message": f"You've used {(new_total/limit*100):.0f}% of your '{budget.name}' budget (₹{new_total:.2f} / ₹{limit:.2f})",
                     "budget_name": budget.name
                 }
-            else:
-                # Update spent amount
-                budget.spent_amount = new_total
-                db.commit()
         
         except Exception as e:
             logger.error(f"BUDGET CHECK ERROR: {e}")
@@ -237,13 +327,6 @@ class BudgetService:
             
             budgets = query.all()
             
-            # Recalculate spent amounts
-            for budget in budgets:
-                budget.spent_amount = BudgetService._calculate_spent_amount(
-                    db, user_id, budget.category_id, budget.month, budget.year
-                )
-            db.commit()
-            
             total_budget = sum(float(b.limit_amount) for b in budgets)
             total_spent = sum(float(b.spent_amount) for b in budgets)
             
@@ -6,6 +6,8 @@ from fastapi.security import OAuth2PasswordBearer
 from app.models.user import User
 from jose import jwt, JWTError
 from app.auth.security import SECRET_KEY, ALGORITHM 
+from app.auth import principal_cache
+from app.auth.principal_cache import CurrentUser
 
 security = HTTPBearer()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
@@ -31,16 +33,20 @@ def get_current_user(request: Request, db: Session = Depends(get_db)):
             if user_id is None:
                 raise HTTPException(status_code=401, detail="Invalid token")
             
-            # Get the user from database
-            user = db.query(User).filter(
-                User.id == int(user_id),
-                User.is_active == True
-            ).first()
-            
-            if not user:
-                raise HTTPException(status_code=401, detail="User not found or inactive")
+            user = None
+            principal = principal_cache.get_principal(int(user_id), token)
+            if principal is None:
+                # Get the user from database
+                user = db.query(User).filter(
+                    User.id == int(user_id),
+                    User.is_active == True
+                ).first()
+                
+                if not user:
+                    raise HTTPException(status_code=401, detail="User not found or inactive")
+                principal = principal_cache.cache_principal(user, token)
                 
-            return user
+            return CurrentUser(db, principal, user)
             
         except JWTError:
             raise HTTPException(status_code=401, detail="Invalid token")
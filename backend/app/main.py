@@ -1,24 +1,23 @@
+import threading
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi import Request, Response
+from fastapi.responses import JSONResponse
 import uvicorn
-from sqlalchemy import text
 
-from app.database import engine, Base, SessionLocal, init_database
+from app.config import settings
+from app.database import engine, dispose_async_engine
+from app.bootstrap import bootstrap, database_status
+from app.budgets.reconcile import start_reconciler, stop_reconciler
+from app.services.bill_scheduler import start_bill_scheduler, stop_bill_scheduler
+from app.utils.loop_monitor import LoopMonitorMiddleware
 
-# Import all models first (IMPORTANT!)
-from app.models.user import User, UserRole
-from app.models.account import Account
-from app.models.transaction import Transaction
-from app.models.alert import Alert
-from app.models.budget import Budget
-from app.models.bill import Bill
-from app.models.reward import Reward
-from app.models.admin_log import AdminLog
-from app.models.expense import Expense
-# Import support models to ensure tables are created
-from app.routers.support import SupportTicket, ChatMessage
-from app.utils.hash_password import hash_password
+# Import all models first (IMPORTANT!) - only to register their tables with
+# the metadata before the routers load, as app/bootstrap.py does
+from app import models  # noqa: F401
+from app.routers.support import SupportTicket, ChatMessage  # noqa: F401
 
 from app.auth.router_simple import router as auth_router
 from app.accounts.router import router as accounts_router
@@ -29,7 +28,6 @@ from app.routers.alerts import router as alerts_api_router
 from app.routers.rewards import router as rewards_api_router
 from app.routers.bills import router as bills_api_router
 from app.budgets.router import router as budgets_router
-from app.dashboard_router import router as dashboard_router
 from app.routers.insights import router as insights_router
 from app.routers.exports import router as exports_router
 from app.routers.admin import router as admin_router
@@ -40,7 +38,54 @@ from app.routers.support import router as support_router
 from app.routers.expenses import router as expenses_router
 from app.routers.currency import router as currency_router
 
-app = FastAPI(title="Banking System API", version="1.0.0")
+def _mask_db_url(url: str) -> str:
+    if '@' in url and '://' in url:
+        prefix, rest = url.split('://', 1)
+        if '@' in rest:
+            before, after = rest.split('@', 1)
+            if ':' in before:
+                user, pwd = before.split(':', 1)
+                return f"{prefix}://{user}:***@{after}"
+    return url
+
+
+def _resume_import_jobs():
+    """Pick up CSV import jobs interrupted by the previous process"""
+    try:
+        from app.transactions.import_jobs import resume_pending_jobs
+        resumed = resume_pending_jobs()
+        if resumed:
+            print(f"Resumed {resumed} pending import job(s)")
+    except Exception as e:
+        print(f"Warning: could not resume import jobs: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Schema and seed data are set up by `python init_db.py` at deploy time;
+    # startup does no database work unless INIT_DB_ON_STARTUP asks for it
+    print(f"Database URL: {_mask_db_url(settings.DATABASE_URL)}")
+    if settings.INIT_DB_ON_STARTUP:
+        try:
+            bootstrap(wait=False)
+        except Exception as e:
+            print(f"Warning: failed to initialize database on startup: {e}")
+    # Off the startup path, so a slow or unavailable database cannot delay serving
+    threading.Thread(target=_resume_import_jobs, name="resume-import-jobs", daemon=True).start()
+    start_reconciler()
+    start_bill_scheduler()
+    yield
+    stop_bill_scheduler()
+    stop_reconciler()
+    await dispose_async_engine()
+    engine.dispose()
+
+
+app = FastAPI(title="Banking System API", version="1.0.0", lifespan=lifespan)
+
+# Event-loop lag monitor (LOOP_MONITOR_ENABLED); metrics at /api/admin/system/event-loop
+if settings.LOOP_MONITOR_ENABLED:
+    app.add_middleware(LoopMonitorMiddleware)
 
 # Add CORS middleware
 app.add_middleware(
@@ -60,132 +105,8 @@ async def options_handler(request: Request, response: Response):
     response.headers["Access-Control-Allow-Credentials"] = "true"
     return response
 
-# Database initialization
-try:
-    # Clear any stuck transactions first
-    engine.dispose()
-    
-    # Only run Postgres-specific cleanup when using Postgres
-    if "postgresql" in str(engine.url):
-        with engine.connect() as connection:
-            connection.execute(text("DROP SEQUENCE IF EXISTS categories_id_seq CASCADE;"))
-            connection.commit()
-except Exception as e:
-    print(f"Warning during database cleanup: {e}")
-    pass
-
-def setup_database():
-    """Setup database with admin user and sample data"""
-    print("Setting up database...")
-    
-    # Initialize database tables
-    init_database()
-    
-    db = SessionLocal()
-    try:
-        # Check if admin user exists
-        admin_user = db.query(User).filter(User.email == "admin@bank.com").first()
-        
-        if not admin_user:
-            # Create admin user
-            admin_user = User(
-                email="admin@bank.com",
-                password=hash_password("admin123"),
-                name="Admin User",
-                role=UserRole.admin,
-                is_active=True,
-                kyc_status="verified"
-            )
-            db.add(admin_user)
-            db.commit()
-            print("✅ Created default admin user")
-            # Print credentials for first time creation
-            print("Admin user created: admin@bank.com / admin123")
-        else:
-            # FORCE ENABLE the admin user if they already exist
-            # This fixes the "Account is deactivated" error if the data got corrupted
-            if not admin_user.is_active:
-                admin_user.is_active = True
-                db.commit()
-                print("✅ Re-activated existing admin user")
-            print("Admin user already exists: admin@bank.com")
-        
-        # Create sample regular user if not exists
-        regular_user = db.query(User).filter(User.email == "user@bank.com").first()
-        if not regular_user:
-            regular_user = User(
-                email="user@bank.com",
-                password=hash_password("user123"),
-                name="Regular User",
-                role=UserRole.user,
-                is_active=True,
-                kyc_status="verified"
-            )
-            db.add(regular_user)
-            db.commit()
-            db.refresh(regular_user)
-            print("Sample user created: user@bank.com / user123")
-        else:
-            print("Sample user already exists: user@bank.com")
-            
-        # Create test user for login debugging
-        test_user = db.query(User).filter(User.email == "test@test.com").first()
-        if not test_user:
-            test_user = User(
-                email="test@test.com",
-                password=hash_password("test123"),
-                name="Test User",
-                role=UserRole.user,
-                is_active=True,
-                kyc_status="verified"
-            )
-            db.add(test_user)
-            db.commit()
-            db.refresh(test_user)
-            print("Test user created: test@test.com / test123")
-        
-        # Print all users for debugging
-        all_users = db.query(User).all()
-        print(f"Total users in database: {len(all_users)}")
-        for u in all_users:
-            print(f"  - {u.email} (active: {u.is_active}, role: {u.role})")
-        
-        print("Database setup complete!")
-        
-    except Exception as e:
-        print(f"Error setting up database: {e}")
-        db.rollback()
-    finally:
-        db.close()
-
-try:
-    Base.metadata.create_all(bind=engine)
-    setup_database()
-except Exception as e:
-    # If database is unavailable at startup, log a warning and allow the app to start.
-    # This prevents the server from refusing connections due to transient DB issues.
-    print(f"Warning: failed to initialize database on startup: {e}")
-
-# Print masked DB URL for debugging (do not leak secret in logs)
-try:
-    from app.config import settings
-    def _mask_db_url(url: str) -> str:
-        if '@' in url and '://' in url:
-            prefix, rest = url.split('://', 1)
-            if '@' in rest:
-                before, after = rest.split('@', 1)
-                if ':' in before:
-                    user, pwd = before.split(':', 1)
-                    pwd_mask = '***'
-                    return f"{prefix}://{user}:{pwd_mask}@{after}"
-        return url
-    print(f"Database URL: {_mask_db_url(settings.DATABASE_URL)}")
-except Exception:
-    pass
-
 # Router registration
 app.include_router(auth_router, prefix="/api/auth", tags=["Auth"])
-app.include_router(dashboard_router, prefix="/api", tags=["Dashboard Main"])
 app.include_router(accounts_router, prefix="/api/accounts", tags=["Accounts"])
 app.include_router(transactions_router, prefix="/api/transactions", tags=["Transactions"])
 app.include_router(dashboard_stats_router, prefix="/api", tags=["Dashboard"])
@@ -248,7 +169,21 @@ def read_root():
 
 @app.get("/health")
 def health_check():
-    return {"status": "healthy", "timestamp": "2024-01-01T00:00:00Z", "database": "connected"}
+    """Liveness: answers without touching the database"""
+    database = database_status(refresh=False)["ok"]
+    return {
+        "status": "healthy",
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "database": {True: "connected", False: "unreachable", None: "unchecked"}[database]
+    }
+
+@app.get("/health/ready")
+def readiness_check():
+    """Readiness: 503 until the database answers"""
+    database = database_status()
+    if not database["ok"]:
+        return JSONResponse(status_code=503, content={"status": "unavailable", "database": database["error"]})
+    return {"status": "ready", "database": "connected"}
 
 @app.get("/api/health")
 def api_health_check():
@@ -0,0 +1,4 @@
+"""
+Versioned schema migrations, applied at deploy time with `python migrate.py`
+"""
+from .runner import run_migrations, migration_status
@@ -0,0 +1,160 @@
+import importlib
+import pkgutil
+import time
+from datetime import datetime, timezone
+from typing import List, Optional, Sequence
+from sqlalchemy import Column, DateTime, Float, MetaData, String, Table, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+from app.database import engine as default_engine
+
+# Applied versions live in their own table, outside the application models
+_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    _metadata,
+    Column("version", String(32), primary_key=True),
+    Column("description", String(255)),
+    Column("applied_at", DateTime(timezone=True)),
+    Column("duration_ms", Float),
+)
+
+# Serializes concurrent deploys on Postgres (arbitrary application-wide key)
+_ADVISORY_LOCK_KEY = 72164001
+
+
+# --- Operations shared by migration modules ---
+
+def has_table(conn: Connection, table: str) -> bool:
+    return inspect(conn).has_table(table)
+
+
+def add_column(conn: Connection, table: str, column: str, ddl: str):
+    """ALTER TABLE ... ADD COLUMN unless the table is missing (create_all builds it) or already has it"""
+    if not has_table(conn, table):
+        return
+    if column in {c["name"] for c in inspect(conn).get_columns(table)}:
+        return
+    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+
+
+def _pg_index_valid(conn: Connection, name: str) -> Optional[bool]:
+    """pg_index.indisvalid of an index visible on the search path, None when there is none"""
+    return conn.execute(text(
+        "SELECT i.indisvalid FROM pg_class c JOIN pg_index i ON i.indexrelid = c.oid "
+        "WHERE c.relname = :name AND pg_table_is_visible(c.oid)"
+    ), {"name": name}).scalar()
+
+
+def create_index(conn: Connection, name: str, table: str, columns: Sequence[str], unique: bool = False):
+    """
+    Create an index if it does not exist. On Postgres the build is
+    CONCURRENTLY, so writes continue while it runs; such migrations must set
+    ONLINE = True so they run outside a transaction. A failed concurrent build
+    leaves an INVALID index behind, which is dropped and built again.
+    """
+    if not has_table(conn, table):
+        return
+    if conn.dialect.name == "postgresql":
+        valid = _pg_index_valid(conn, name)
+        if valid:
+            return
+        if valid is False:
+            conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+    elif name in {ix["name"] for ix in inspect(conn).get_indexes(table)}:
+        return
+    concurrently = "CONCURRENTLY " if conn.dialect.name == "postgresql" else ""
+    kind = "UNIQUE INDEX" if unique else "INDEX"
+    conn.execute(text(f"CREATE {kind} {concurrently}IF NOT EXISTS {name} ON {table} ({', '.join(columns)})"))
+
+
+# --- Runner ---
+
+def _discover() -> list:
+    """Migration modules from app.migrations.versions, ordered by VERSION"""
+    from app.migrations import versions
+    modules = [
+        importlib.import_module(f"{versions.__name__}.{info.name}")
+        for info in pkgutil.iter_modules(versions.__path__)
+    ]
+    return sorted(modules, key=lambda m: m.VERSION)
+
+
+def _description(module) -> str:
+    return (module.__doc__ or module.__name__).strip().splitlines()[0]
+
+
+def _applied(conn: Connection) -> dict:
+    rows = conn.execute(select(schema_migrations)).mappings().all()
+    return {row["version"]: dict(row) for row in rows}
+
+
+def _apply(engine: Engine, module) -> float:
+    started = time.perf_counter()
+    if getattr(module, "ONLINE", False) and engine.dialect.name == "postgresql":
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            module.upgrade(conn)
+    else:
+        with engine.begin() as conn:
+            module.upgrade(conn)
+    return round((time.perf_counter() - started) * 1000, 2)
+
+
+def run_migrations(engine: Optional[Engine] = None, target: Optional[str] = None) -> List[dict]:
+    """
+    Apply pending migrations in version order, up to and including `target`.
+    Safe to run repeatedly: applied versions are skipped and every operation
+    is itself idempotent. Returns one entry per migration applied.
+    """
+    engine = engine or default_engine
+    _metadata.create_all(engine)
+
+    applied_now = []
+    with engine.connect() as lock_conn:
+        is_postgres = engine.dialect.name == "postgresql"
+        if is_postgres:
+            lock_conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": _ADVISORY_LOCK_KEY})
+            lock_conn.commit()
+        try:
+            applied = _applied(lock_conn)
+            lock_conn.rollback()
+            for module in _discover():
+                if module.VERSION in applied:
+                    continue
+                if target is not None and module.VERSION > target:
+                    break
+
+                description = _description(module)
+                print(f"Applying migration {module.VERSION}: {description}")
+                duration_ms = _apply(engine, module)
+                with engine.begin() as conn:
+                    conn.execute(schema_migrations.insert().values(
+                        version=module.VERSION,
+                        description=description,
+                        applied_at=datetime.now(timezone.utc),
+                        duration_ms=duration_ms
+                    ))
+                print(f"  done in {duration_ms} ms")
+                applied_now.append({"version": module.VERSION, "description": description, "duration_ms": duration_ms})
+        finally:
+            if is_postgres:
+                lock_conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": _ADVISORY_LOCK_KEY})
+                lock_conn.commit()
+
+    return applied_now
+
+
+def migration_status(engine: Optional[Engine] = None) -> List[dict]:
+    """Every known migration with its applied time and duration (None when pending)"""
+    engine = engine or default_engine
+    _metadata.create_all(engine)
+    with engine.connect() as conn:
+        applied = _applied(conn)
+    return [
+        {
+            "version": module.VERSION,
+            "description": _description(module),
+            "applied_at": applied.get(module.VERSION, {}).get("applied_at"),
+            "duration_ms": applied.get(module.VERSION, {}).get("duration_ms"),
+        }
+        for module in _discover()
+    ]
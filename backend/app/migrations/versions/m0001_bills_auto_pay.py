@@ -0,0 +1,9 @@
+"""Add bills.auto_pay"""
+from app.migrations.runner import add_column
+
+VERSION = "0001"
+
+
+def upgrade(conn):
+    default = "FALSE" if conn.dialect.name == "postgresql" else "0"
+    add_column(conn, "bills", "auto_pay", f"BOOLEAN DEFAULT {default}")
@@ -0,0 +1,9 @@
+"""Add rewards.reward_type and rewards.reward_value"""
+from app.migrations.runner import add_column
+
+VERSION = "0002"
+
+
+def upgrade(conn):
+    add_column(conn, "rewards", "reward_type", "VARCHAR DEFAULT 'points'")
+    add_column(conn, "rewards", "reward_value", "VARCHAR")
@@ -0,0 +1,24 @@
+"""Composite indexes for per-user lookups on the hot read paths"""
+from app.migrations.runner import create_index
+
+VERSION = "0003"
+# Postgres builds these CONCURRENTLY, which cannot run inside a transaction
+ONLINE = True
+
+INDEXES = [
+    ("ix_transactions_user_date_id", "transactions", ["user_id", "txn_date", "id"]),
+    ("ix_transactions_account_date_id", "transactions", ["account_id", "txn_date", "id"]),
+    ("ix_transactions_user_category_date", "transactions", ["user_id", "category", "txn_date"]),
+    ("ix_accounts_user", "accounts", ["user_id"]),
+    ("ix_budgets_user_period", "budgets", ["user_id", "year", "month"]),
+    ("ix_bills_user_due", "bills", ["user_id", "due_date"]),
+    ("ix_alerts_user_created", "alerts", ["user_id", "created_at"]),
+    ("ix_rewards_user", "rewards", ["user_id"]),
+    ("ix_support_tickets_user_created", "support_tickets", ["user_id", "created_at"]),
+    ("ix_daily_rollups_user_day", "daily_rollups", ["user_id", "day"]),
+]
+
+
+def upgrade(conn):
+    for name, table, columns in INDEXES:
+        create_index(conn, name, table, columns)
@@ -0,0 +1,11 @@
+"""Add alerts.dedup_key with a unique (user_id, dedup_key) index"""
+from app.migrations.runner import add_column, create_index
+
+VERSION = "0004"
+# The unique index is built CONCURRENTLY on Postgres
+ONLINE = True
+
+
+def upgrade(conn):
+    add_column(conn, "alerts", "dedup_key", "VARCHAR")
+    create_index(conn, "ux_alerts_user_dedup", "alerts", ["user_id", "dedup_key"], unique=True)
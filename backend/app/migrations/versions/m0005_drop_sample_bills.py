@@ -0,0 +1,15 @@
+"""Delete the default sample bills older versions created for every user"""
+from sqlalchemy import text
+from app.migrations.runner import has_table
+
+VERSION = "0005"
+
+
+def upgrade(conn):
+    # Previously removed by GET /api/bills on every request
+    if not has_table(conn, "bills"):
+        return
+    conn.execute(text(
+        "DELETE FROM bills "
+        "WHERE biller_name IN ('Electricity Bill', 'Internet Bill') AND amount_due IN (150.00, 80.00)"
+    ))
@@ -0,0 +1,10 @@
+"""Index bills by (due_date, status) for the bill scheduler"""
+from app.migrations.runner import create_index
+
+VERSION = "0006"
+# Postgres builds it CONCURRENTLY, which cannot run inside a transaction
+ONLINE = True
+
+
+def upgrade(conn):
+    create_index(conn, "ix_bills_due_status", "bills", ["due_date", "status"])
@@ -0,0 +1,8 @@
+"""Add import_jobs.owner_host"""
+from app.migrations.runner import add_column
+
+VERSION = "0007"
+
+
+def upgrade(conn):
+    add_column(conn, "import_jobs", "owner_host", "VARCHAR")
@@ -18,4 +18,6 @@ from .reward import Reward
 from .alert import Alert
 from .bill import Bill
 from .expense import Expense
-from .admin_log import AdminLog
\ No newline at end of file
+from .admin_log import AdminLog
+from .import_job import ImportJob, ImportJobStatus
+from .daily_rollup import DailyRollup
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Enum, Boolean, ForeignKey, Numeric, DateTime
+from sqlalchemy import Column, Integer, String, Enum, Boolean, ForeignKey, Numeric, DateTime, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.database import Base
@@ -14,7 +14,10 @@ class AccountType(str, enum.Enum):
 
 class Account(Base):
     __tablename__ = "accounts"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        Index("ix_accounts_user", "user_id"),
+        {'extend_existing': True},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Enum, Boolean, ForeignKey, Numeric, DateTime
+from sqlalchemy import Column, Integer, String, Enum, Boolean, ForeignKey, Numeric, DateTime, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.database import Base
@@ -11,13 +11,20 @@ class AlertType(str, enum.Enum):
 
 class Alert(Base):
     __tablename__ = "alerts"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        # Alert lists are per user, newest first
+        Index("ix_alerts_user_created", "user_id", "created_at"),
+        # Generated alerts carry a key so each condition is reported once
+        Index("ux_alerts_user_dedup", "user_id", "dedup_key", unique=True),
+        {'extend_existing': True},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
     type = Column(Enum(AlertType), nullable=False)
     message = Column(String, nullable=False)
     is_read = Column(Boolean, default=False)
+    dedup_key = Column(String, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
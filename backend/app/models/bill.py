@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Enum, Boolean, ForeignKey, Numeric, DateTime, Date
+from sqlalchemy import Column, Integer, String, Enum, Boolean, ForeignKey, Numeric, DateTime, Date, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.database import Base
@@ -11,7 +11,13 @@ class BillStatus(str, enum.Enum):
 
 class Bill(Base):
     __tablename__ = "bills"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        # Bill lists and the scheduler look bills up by owner and due date
+        Index("ix_bills_user_due", "user_id", "due_date"),
+        # The bill scheduler scans due dates across all users
+        Index("ix_bills_due_status", "due_date", "status"),
+        {'extend_existing': True},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     biller_name = Column(String, nullable=False)
@@ -1,11 +1,15 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Numeric, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, Numeric, DateTime, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.database import Base
 
 class Budget(Base):
     __tablename__ = "budgets"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        # Budgets are read per user and month
+        Index("ix_budgets_user_period", "user_id", "year", "month"),
+        {'extend_existing': True},
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
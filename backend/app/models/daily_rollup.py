@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, Numeric, Enum, Index
+from app.database import Base
+from app.models.transaction import TxnType
+
+class DailyRollup(Base):
+    """Per-day spending totals maintained alongside every transaction write"""
+    __tablename__ = "daily_rollups"
+    __table_args__ = (
+        Index("ix_daily_rollups_user_day", "user_id", "day"),
+        {'extend_existing': True},
+    )
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    account_id = Column(Integer, ForeignKey("accounts.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    category = Column(String(50), primary_key=True, default="")  # '' when the transaction has no category
+    txn_type = Column(Enum(TxnType), primary_key=True)
+    total_amount = Column(Numeric(18, 2), nullable=False, default=0)
+    txn_count = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,30 @@
+from sqlalchemy import Column, Integer, String, Enum, ForeignKey, DateTime, Text
+from sqlalchemy.sql import func
+from app.database import Base
+import enum
+
+class ImportJobStatus(str, enum.Enum):
+    queued = "queued"
+    running = "running"
+    completed = "completed"
+    failed = "failed"
+
+class ImportJob(Base):
+    __tablename__ = "import_jobs"
+    __table_args__ = {'extend_existing': True}
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
+    account_id = Column(Integer, ForeignKey("accounts.id", ondelete="CASCADE"))
+    filename = Column(String, nullable=True)
+    file_path = Column(String, nullable=False)  # Spooled copy of the upload
+    owner_host = Column(String, nullable=True)  # Instance whose spool dir holds file_path
+    status = Column(Enum(ImportJobStatus), default=ImportJobStatus.queued)
+    rows_processed = Column(Integer, default=0)
+    rows_failed = Column(Integer, default=0)
+    rows_consumed = Column(Integer, default=0)  # CSV records covered by committed batches
+    errors = Column(Text, nullable=True)  # JSON list of per-row error messages
+    error_message = Column(Text, nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    finished_at = Column(DateTime(timezone=True), nullable=True)
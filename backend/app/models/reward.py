@@ -1,11 +1,14 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.database import Base
 
 class Reward(Base):
     __tablename__ = "rewards"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        Index("ix_rewards_user", "user_id"),
+        {'extend_existing': True},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     program_name = Column(String, nullable=False)
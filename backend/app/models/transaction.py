@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Numeric, Text, Enum
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Numeric, Text, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -10,7 +10,14 @@ class TxnType(str, enum.Enum):
 
 class Transaction(Base):
     __tablename__ = "transactions"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        # Keyset pagination seeks on (owner, txn_date, id)
+        Index("ix_transactions_user_date_id", "user_id", "txn_date", "id"),
+        Index("ix_transactions_account_date_id", "account_id", "txn_date", "id"),
+        # Per-category spend over a date range (budgets, insights)
+        Index("ix_transactions_user_category_date", "user_id", "category", "txn_date"),
+        {'extend_existing': True},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     amount = Column(Numeric(15, 2), nullable=False)
@@ -1,12 +1,26 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, Response
-from sqlalchemy.orm import Session
-from sqlalchemy import func, desc, and_, or_
-from app.database import get_db
-from app.models.user import User, KYCStatus, UserRole
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, desc, and_, or_, exists, select, text
+from app.database import get_async_db, pool_stats
+from app.models.user import User, UserRole
 from app.models.account import Account
 from app.models.transaction import Transaction
 from app.models.alert import Alert
 from app.dependencies import require_admin
+from app.auth import principal_cache
+from app.utils.hash_password import hash_passwords, hashing_stats
+from app.utils.loop_monitor import monitor as loop_monitor
+from app.utils.pagination import paginate_keyset, count_rows
+from app.utils.streaming import stream_query, csv_chunks, csv_download, columnar_download
+from app.services.insights_service import parse_date_window
+from app.services.rollup_service import RollupService
+from app.budgets.service import BudgetService
+from app.services.alert_evaluator import track_transaction_writes, evaluator_stats
+from app.services.bill_scheduler import scheduler_stats
+from app.services.timeseries_service import TimeSeriesService
+from app.services.dashboard_service import DashboardService
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 from pydantic import BaseModel
@@ -38,8 +52,8 @@ class AdminRewardRequest(BaseModel):
     message: Optional[str] = None
 
 @router.get("/users")
-async def get_all_users(db: Session = Depends(get_db), admin: User = Depends(require_admin)):
-    users = db.query(User).all()
+async def get_all_users(db: AsyncSession = Depends(get_async_db), admin: User = Depends(require_admin)):
+    users = (await db.scalars(select(User))).all()
     print(f"DEBUG: Found {len(users)} users in database")
     return [{
         "id": u.id,
@@ -52,8 +66,10 @@ async def get_all_users(db: Session = Depends(get_db), admin: User = Depends(req
     } for u in users]
 
 @router.get("/accounts")
-async def get_all_accounts(db: Session = Depends(get_db), admin: User = Depends(require_admin)):
-    accounts = db.query(Account).join(User).all()
+async def get_all_accounts(db: AsyncSession = Depends(get_async_db), admin: User = Depends(require_admin)):
+    accounts = (await db.scalars(
+        select(Account).join(User, Account.user_id == User.id).options(joinedload(Account.user))
+    )).all()
     print(f"DEBUG: Found {len(accounts)} accounts in database")
     return [{
         "id": a.id,
@@ -67,40 +83,86 @@ async def get_all_accounts(db: Session = Depends(get_db), admin: User = Depends(
     } for a in accounts]
 
 @router.get("/transactions")
-async def get_all_transactions(db: Session = Depends(get_db)):
-    transactions = db.query(Transaction).join(Account).join(User).all()
-    return [{
-        "id": t.id,
-        "user_name": t.account.user.name or "N/A",
-        "amount": float(t.amount) if t.amount else 0.0,
-        "txn_type": t.txn_type.value if t.txn_type else "debit",
-        "description": t.description or "N/A",
-        "txn_date": t.txn_date
-    } for t in transactions]
-
-@router.get("/system-summary")
-async def get_system_summary(db: Session = Depends(get_db)):
-    users = db.query(User).all()
-    accounts = db.query(Account).all()
-    transactions = db.query(Transaction).all()
-    
+async def get_all_transactions(
+    db: AsyncSession = Depends(get_async_db),
+    admin: User = Depends(require_admin),
+    limit: int = Query(100, ge=1, le=1000),
+    after: Optional[str] = Query(None, description="Cursor from the previous page's next_cursor"),
+    user_id: Optional[int] = Query(None),
+    start_date: Optional[str] = Query(None, description="ISO date, inclusive"),
+    end_date: Optional[str] = Query(None, description="ISO date, inclusive"),
+    txn_type: Optional[str] = Query(None, pattern="^(credit|debit)$"),
+    min_amount: Optional[float] = Query(None, ge=0),
+    max_amount: Optional[float] = Query(None, ge=0),
+    count: str = Query("estimated", pattern="^(exact|estimated|none)$")
+):
+    start, end = parse_date_window(start_date, end_date)
+    # paginate_keyset and count_rows work on Query objects, so the page is built
+    # on the session's sync facade; its I/O still goes through the async driver
+    return await db.run_sync(
+        _transactions_page, limit, after, user_id, start, end, txn_type, min_amount, max_amount, count
+    )
+
+def _transactions_page(db: Session, limit, after, user_id, start, end, txn_type, min_amount, max_amount, count) -> dict:
+    # Only the displayed columns, with the owner's name joined in, so a page is one query
+    query = db.query(
+        Transaction.id,
+        Account.user_id,
+        User.name.label("user_name"),
+        Transaction.amount,
+        Transaction.txn_type,
+        Transaction.category,
+        Transaction.description,
+        Transaction.txn_date
+    ).select_from(Transaction).join(
+        Account, Transaction.account_id == Account.id
+    ).join(User, Account.user_id == User.id)
+
+    if user_id is not None:
+        query = query.filter(Transaction.user_id == user_id)
+    if start:
+        query = query.filter(Transaction.txn_date >= start)
+    if end:
+        query = query.filter(Transaction.txn_date < end)
+    if txn_type:
+        query = query.filter(Transaction.txn_type == txn_type)
+    if min_amount is not None:
+        query = query.filter(Transaction.amount >= min_amount)
+    if max_amount is not None:
+        query = query.filter(Transaction.amount <= max_amount)
+
+    total, total_is_estimate = count_rows(query, count) if not after else (None, False)
+    transactions, next_cursor = paginate_keyset(query, Transaction.txn_date, Transaction.id, after, limit)
     return {
-        "total_users": len(users),
-        "active_users": len([u for u in users if u.is_active]),
-        "total_accounts": len(accounts),
-        "total_transactions": len(transactions),
-        "pending_kyc": len([u for u in users if u.kyc_status == KYCStatus.unverified]),
-        "verified_kyc": len([u for u in users if u.kyc_status == KYCStatus.verified])
+        "transactions": [{
+            "id": t.id,
+            "user_id": t.user_id,
+            "user_name": t.user_name or "N/A",
+            "amount": float(t.amount) if t.amount else 0.0,
+            "txn_type": t.txn_type.value if t.txn_type else "debit",
+            "category": t.category,
+            "description": t.description or "N/A",
+            "txn_date": t.txn_date
+        } for t in transactions],
+        "next_cursor": next_cursor,
+        "total": total,
+        "total_is_estimate": total_is_estimate
     }
 
+@router.get("/system-summary")
+async def get_system_summary(db: AsyncSession = Depends(get_async_db), admin: User = Depends(require_admin)):
+    return await db.run_sync(DashboardService.get_system_summary)
+
 @router.get("/alerts")
-async def get_system_alerts(db: Session = Depends(get_db), admin: User = Depends(require_admin)):
-    alerts = db.query(Alert).order_by(Alert.created_at.desc()).all()
+async def get_system_alerts(db: AsyncSession = Depends(get_async_db), admin: User = Depends(require_admin)):
+    alerts = (await db.scalars(
+        select(Alert).options(joinedload(Alert.user)).order_by(Alert.created_at.desc())
+    )).all()
     return [{"id": a.id, "user_id": a.user_id, "user_name": a.user.name if a.user else "System", "type": a.type, "message": a.message, "created_at": a.created_at, "is_read": a.is_read} for a in alerts]
 
 @router.get("/kyc-overview")
-async def get_kyc_overview(db: Session = Depends(get_db), admin: User = Depends(require_admin)):
-    users = db.query(User).all()
+async def get_kyc_overview(db: AsyncSession = Depends(get_async_db), admin: User = Depends(require_admin)):
+    users = (await db.scalars(select(User))).all()
     kyc_data = []
     for user in users:
         kyc_data.append({
@@ -113,11 +175,15 @@ async def get_kyc_overview(db: Session = Depends(get_db), admin: User = Depends(
     return kyc_data
 
 @router.get("/suspicious-activity")
-async def get_suspicious_activity(db: Session = Depends(get_db), admin: User = Depends(require_admin)):
+async def get_suspicious_activity(db: AsyncSession = Depends(get_async_db), admin: User = Depends(require_admin)):
     suspicious = []
     
     # Large transactions (>10000)
-    large_txns = db.query(Transaction).filter(Transaction.amount > 10000).join(Account).join(User).all()
+    large_txns = (await db.scalars(
+        select(Transaction).join(Account, Transaction.account_id == Account.id).filter(
+            Transaction.amount > 10000
+        ).options(joinedload(Transaction.account).joinedload(Account.user))
+    )).all()
     for txn in large_txns:
         suspicious.append({
             "type": "large_transaction",
@@ -129,7 +195,7 @@ async def get_suspicious_activity(db: Session = Depends(get_db), admin: User = D
         })
     
     # Inactive users with recent activity
-    inactive_users = db.query(User).filter(User.is_active == False).all()
+    inactive_users = (await db.scalars(select(User).filter(User.is_active == False))).all()
     for user in inactive_users:
         suspicious.append({
             "type": "inactive_user",
@@ -142,8 +208,8 @@ async def get_suspicious_activity(db: Session = Depends(get_db), admin: User = D
     return suspicious
 
 @router.post("/send-email/{user_id}")
-async def send_email_to_user(user_id: int, subject: str, message: str, db: Session = Depends(get_db), admin: User = Depends(require_admin)):
-    user = db.query(User).filter(User.id == user_id).first()
+async def send_email_to_user(user_id: int, subject: str, message: str, db: AsyncSession = Depends(get_async_db), admin: User = Depends(require_admin)):
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
@@ -156,8 +222,8 @@ async def send_email_to_user(user_id: int, subject: str, message: str, db: Sessi
 
 # Enhanced Admin Endpoints
 @router.put("/users/{user_id}")
-async def update_user(user_id: int, user_data: UserUpdateRequest, db: Session = Depends(get_db), admin: User = Depends(require_admin)):
-    user = db.query(User).filter(User.id == user_id).first()
+async def update_user(user_id: int, user_data: UserUpdateRequest, db: AsyncSession = Depends(get_async_db), admin: User = Depends(require_admin)):
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
@@ -170,94 +236,101 @@ async def update_user(user_id: int, user_data: UserUpdateRequest, db: Session =
     if user_data.role:
         user.role = UserRole(user_data.role)
     
-    db.commit()
+    await db.commit()
+    principal_cache.invalidate_user(user_id)
     return {"message": "User updated successfully"}
 
 @router.delete("/users/{user_id}")
-async def delete_user(user_id: int, db: Session = Depends(get_db), admin: User = Depends(require_admin)):
-    user = db.query(User).filter(User.id == user_id).first()
+async def delete_user(user_id: int, db: AsyncSession = Depends(get_async_db), admin: User = Depends(require_admin)):
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
     # Check if user has accounts or transactions
-    if user.accounts or user.transactions:
+    has_history = await db.scalar(select(
+        exists().where(Account.user_id == user_id) | exists().where(Transaction.user_id == user_id)
+    ))
+    if has_history:
         raise HTTPException(status_code=400, detail="Cannot delete user with existing accounts or transactions")
     
-    db.delete(user)
-    db.commit()
+    await db.delete(user)
+    await db.commit()
+    principal_cache.invalidate_user(user_id)
     return {"message": "User deleted successfully"}
 
 @router.get("/analytics/users")
-async def get_user_analytics(db: Session = Depends(get_db), admin: User = Depends(require_admin)):
-    # User registration trends (last 12 months)
-    monthly_registrations = []
-    for i in range(12):
-        start_date = datetime.now() - timedelta(days=30*(i+1))
-        end_date = datetime.now() - timedelta(days=30*i)
-        count = db.query(User).filter(
-            and_(User.created_at >= start_date, User.created_at < end_date)
-        ).count()
-        monthly_registrations.append({
-            "month": start_date.strftime("%Y-%m"),
-            "registrations": count
-        })
+async def get_user_analytics(
+    months: int = Query(12, ge=1, le=120),
+    db: AsyncSession = Depends(get_async_db),
+    admin: User = Depends(require_admin)
+):
+    # User registration trends, one bucketed query for the whole window
+    start, end = TimeSeriesService.trailing_window(months, "month")
+    monthly_registrations = [{
+        "month": point["bucket"].strftime("%Y-%m"),
+        "registrations": point["registrations"]
+    } for point in await db.run_sync(
+        TimeSeriesService.bucketed, User.created_at, start, end, "month",
+        {"registrations": func.count(User.id)}
+    )]
     
     # Role distribution
-    role_stats = db.query(User.role, func.count(User.id)).group_by(User.role).all()
+    role_stats = (await db.execute(select(User.role, func.count(User.id)).group_by(User.role))).all()
     role_distribution = [{"role": role, "count": count} for role, count in role_stats]
     
     return {
-        "monthly_registrations": monthly_registrations[::-1],
+        "monthly_registrations": monthly_registrations,
         "role_distribution": role_distribution
     }
 
 @router.get("/analytics/transactions")
-async def get_transaction_analytics(db: Session = Depends(get_db), admin: User = Depends(require_admin)):
-    # Transaction volume trends (last 30 days)
-    daily_transactions = []
-    for i in range(30):
-        date = datetime.now().date() - timedelta(days=i)
-        count = db.query(Transaction).filter(
-            func.date(Transaction.txn_date) == date
-        ).count()
-        volume = db.query(func.sum(Transaction.amount)).filter(
-            func.date(Transaction.txn_date) == date
-        ).scalar() or 0
-        daily_transactions.append({
-            "date": date.isoformat(),
-            "count": count,
-            "volume": float(volume)
-        })
+async def get_transaction_analytics(
+    periods: int = Query(30, ge=1, le=3660, description="Number of buckets, ending with the current one"),
+    granularity: str = Query("day", pattern="^(day|week|month)$"),
+    db: AsyncSession = Depends(get_async_db),
+    admin: User = Depends(require_admin)
+):
+    # Transaction volume trends, one bucketed query for the whole window
+    start, end = TimeSeriesService.trailing_window(periods, granularity)
+    daily_transactions = [{
+        "date": point["bucket"].isoformat(),
+        "count": point["count"],
+        "volume": float(point["volume"])
+    } for point in await db.run_sync(
+        TimeSeriesService.bucketed, Transaction.txn_date, start, end, granularity,
+        {"count": func.count(Transaction.id), "volume": func.coalesce(func.sum(Transaction.amount), 0)}
+    )]
     
     # Transaction type distribution
-    type_stats = db.query(Transaction.txn_type, func.count(Transaction.id)).group_by(Transaction.txn_type).all()
+    type_stats = (await db.execute(
+        select(Transaction.txn_type, func.count(Transaction.id)).group_by(Transaction.txn_type)
+    )).all()
     type_distribution = [{"type": str(txn_type), "count": count} for txn_type, count in type_stats]
     
     return {
-        "daily_transactions": daily_transactions[::-1],
+        "daily_transactions": daily_transactions,
         "type_distribution": type_distribution
     }
 
 @router.get("/reports/financial")
-async def get_financial_report(db: Session = Depends(get_db), admin: User = Depends(require_admin)):
-    # Total system balance
-    total_balance = db.query(func.sum(Account.balance)).scalar() or 0
-    
-    # Average account balance
-    avg_balance = db.query(func.avg(Account.balance)).scalar() or 0
+async def get_financial_report(db: AsyncSession = Depends(get_async_db), admin: User = Depends(require_admin)):
+    # Total and average system balance
+    total_balance, avg_balance = (await db.execute(
+        select(func.coalesce(func.sum(Account.balance), 0), func.coalesce(func.avg(Account.balance), 0))
+    )).one()
     
     # Transaction volume by type
-    credit_volume = db.query(func.sum(Transaction.amount)).filter(
-        Transaction.txn_type == 'credit'
-    ).scalar() or 0
-    debit_volume = db.query(func.sum(Transaction.amount)).filter(
-        Transaction.txn_type == 'debit'
-    ).scalar() or 0
+    credit_volume, debit_volume = (await db.execute(select(
+        func.coalesce(func.sum(Transaction.amount).filter(Transaction.txn_type == 'credit'), 0),
+        func.coalesce(func.sum(Transaction.amount).filter(Transaction.txn_type == 'debit'), 0)
+    ))).one()
     
     # Top accounts by balance
-    top_accounts = db.query(Account, User).join(User).order_by(
-        desc(Account.balance)
-    ).limit(10).all()
+    top_accounts = (await db.execute(
+        select(Account, User).join(User, Account.user_id == User.id).order_by(
+            desc(Account.balance)
+        ).limit(10)
+    )).all()
     
     top_accounts_data = [{
         "user_name": user.name,
@@ -275,12 +348,14 @@ async def get_financial_report(db: Session = Depends(get_db), admin: User = Depe
     }
 
 @router.get("/audit-logs")
-async def get_audit_logs(db: Session = Depends(get_db), admin: User = Depends(require_admin)):
+async def get_audit_logs(db: AsyncSession = Depends(get_async_db), admin: User = Depends(require_admin)):
     # Recent user activities
-    recent_users = db.query(User).order_by(desc(User.created_at)).limit(20).all()
-    recent_transactions = db.query(Transaction, User).join(Account).join(User).order_by(
-        desc(Transaction.txn_date)
-    ).limit(50).all()
+    recent_users = (await db.scalars(select(User).order_by(desc(User.created_at)).limit(20))).all()
+    recent_transactions = (await db.execute(
+        select(Transaction, User).join(Account, Transaction.account_id == Account.id).join(
+            User, Account.user_id == User.id
+        ).order_by(desc(Transaction.txn_date)).limit(50)
+    )).all()
     
     user_activities = [{
         "type": "user_registration",
@@ -303,24 +378,24 @@ async def get_audit_logs(db: Session = Depends(get_db), admin: User = Depends(re
     return {"activities": all_activities[:100]}
 
 @router.post("/system/maintenance")
-async def toggle_maintenance_mode(enabled: bool, db: Session = Depends(get_db), admin: User = Depends(require_admin)):
+async def toggle_maintenance_mode(enabled: bool, db: AsyncSession = Depends(get_async_db), admin: User = Depends(require_admin)):
     # This would typically update a system configuration table
     return {"message": f"Maintenance mode {'enabled' if enabled else 'disabled'}"}
 
 @router.get("/system/health")
-async def get_system_health(db: Session = Depends(get_db), admin: User = Depends(require_admin)):
+async def get_system_health(db: AsyncSession = Depends(get_async_db), admin: User = Depends(require_admin)):
     try:
         # Test database connection
-        db.execute("SELECT 1")
+        await db.execute(text("SELECT 1"))
         
         # Check for any critical issues
-        failed_transactions = db.query(Transaction).filter(
+        failed_transactions = await db.scalar(select(func.count(Transaction.id)).filter(
             Transaction.txn_date >= datetime.now() - timedelta(hours=1)
-        ).count()
+        ))
         
-        inactive_users_with_recent_activity = db.query(User).filter(
+        inactive_users_with_recent_activity = await db.scalar(select(func.count(User.id)).filter(
             and_(User.is_active == False, User.created_at >= datetime.now() - timedelta(days=1))
-        ).count()
+        ))
         
         health_status = "healthy"
         issues = []
@@ -350,26 +425,30 @@ async def get_system_health(db: Session = Depends(get_db), admin: User = Depends
 
 # Bulk user operations
 @router.post("/users/bulk-activate")
-async def bulk_activate_users(user_ids: List[int], db: Session = Depends(get_db), admin: User = Depends(require_admin)):
-    users = db.query(User).filter(User.id.in_(user_ids)).all()
+async def bulk_activate_users(user_ids: List[int], db: AsyncSession = Depends(get_async_db), admin: User = Depends(require_admin)):
+    users = (await db.scalars(select(User).filter(User.id.in_(user_ids)))).all()
     for u in users:
         u.is_active = True
-    db.commit()
+    await db.commit()
+    for u in users:
+        principal_cache.invalidate_user(u.id)
     return {"updated": len(users)}
 
 @router.post("/users/bulk-deactivate")
-async def bulk_deactivate_users(user_ids: List[int], db: Session = Depends(get_db), admin: User = Depends(require_admin)):
-    users = db.query(User).filter(User.id.in_(user_ids)).all()
+async def bulk_deactivate_users(user_ids: List[int], db: AsyncSession = Depends(get_async_db), admin: User = Depends(require_admin)):
+    users = (await db.scalars(select(User).filter(User.id.in_(user_ids)))).all()
     for u in users:
         u.is_active = False
-    db.commit()
+    await db.commit()
+    for u in users:
+        principal_cache.invalidate_user(u.id)
     return {"updated": len(users)}
 
 # Export/Import users (simple CSV export / list import)
 @router.get("/export/users")
-async def export_users(db: Session = Depends(get_db), admin: User = Depends(require_admin)):
+async def export_users(db: AsyncSession = Depends(get_async_db), admin: User = Depends(require_admin)):
     import io, csv
-    users = db.query(User).all()
+    users = (await db.scalars(select(User))).all()
     output = io.StringIO()
     writer = csv.writer(output)
     writer.writerow(["id", "name", "email", "role", "is_active", "created_at"])
@@ -379,222 +458,288 @@ async def export_users(db: Session = Depends(get_db), admin: User = Depends(requ
     return {"csv": csv_data}
 
 @router.post("/import/users")
-async def import_users(users: List[Dict[str, Any]], db: Session = Depends(get_db), admin: User = Depends(require_admin)):
-    created = 0
+async def import_users(users: List[Dict[str, Any]], db: AsyncSession = Depends(get_async_db), admin: User = Depends(require_admin)):
+    pending = []
+    # One lookup for every email in the payload instead of one per row
+    emails = [udata["email"] for udata in users if udata.get("email")]
+    seen = set((await db.scalars(select(User.email).filter(User.email.in_(emails)))).all()) if emails else set()
     for udata in users:
         # basic validation
         if not udata.get("email") or not udata.get("name"):
             continue
-        exists = db.query(User).filter(User.email == udata["email"]).first()
-        if exists:
+        if udata["email"] in seen:
             continue
+        seen.add(udata["email"])
+        pending.append(udata)
+
+    # Hash on the shared bcrypt pool in parallel, off the event loop
+    to_hash = [udata["password"] for udata in pending if udata.get("password")]
+    hashed = iter(await run_in_threadpool(hash_passwords, to_hash))
+
+    for udata in pending:
         new_user = User(
             name=udata.get("name"),
             email=udata.get("email"),
-            password=udata.get("password", ""),
+            password=next(hashed) if udata.get("password") else "",
             role=udata.get("role", "user"),
             is_active=udata.get("is_active", True)
         )
         db.add(new_user)
-        created += 1
-    db.commit()
-    return {"imported": created}
+    await db.commit()
+    return {"imported": len(pending)}
+
+def _export_timestamp(value) -> str:
+    return value.isoformat() if value else ""
+
+# Typed columns for parquet/arrow exports, in the order each export selects them
+_TXN_EXPORT_COLUMNS = [
+    ("id", "int"), ("account_id", "int"), ("account_type", "string"), ("amount", "decimal"),
+    ("txn_type", "string"), ("category", "string"), ("description", "string"),
+    ("merchant", "string"), ("currency", "string"), ("txn_date", "timestamp"),
+    ("posted_date", "timestamp"), ("created_at", "timestamp")
+]
+_ALL_TXN_EXPORT_COLUMNS = [
+    ("id", "int"), ("user_id", "int"), ("user_name", "string"), ("user_email", "string")
+] + _TXN_EXPORT_COLUMNS[1:]
 
 @router.get("/transactions/export")
-async def export_transactions_csv(db: Session = Depends(get_db), admin: User = Depends(require_admin)):
-    """Export all transactions to CSV format"""
-    try:
-        transactions = db.query(Transaction).join(Account).join(User).all()
-        
-        import io, csv
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Write headers
-        writer.writerow([
+async def export_transactions_csv(
+    gzip: bool = False,
+    export_format: str = Query("csv", alias="format", pattern="^(csv|parquet|arrow)$"),
+    admin: User = Depends(require_admin)
+):
+    """Stream all transactions as CSV (or .csv.gz), Parquet or Arrow"""
+    rows = stream_query(lambda db: db.query(
+        Transaction.id, Transaction.user_id, User.name, User.email, Transaction.account_id,
+        Account.account_type, Transaction.amount, Transaction.txn_type, Transaction.category,
+        Transaction.description, Transaction.merchant, Transaction.currency,
+        Transaction.txn_date, Transaction.posted_date, Transaction.created_at
+    ).select_from(Transaction).join(
+        Account, Transaction.account_id == Account.id
+    ).join(User, Account.user_id == User.id).order_by(Transaction.id))
+
+    filename = f"transactions_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    if export_format != "csv":
+        return columnar_download(_ALL_TXN_EXPORT_COLUMNS, rows, filename, export_format)
+
+    chunks = csv_chunks(
+        [
             "id", "user_id", "user_name", "user_email", "account_id", "account_type",
             "amount", "txn_type", "category", "description", "merchant", "currency",
             "txn_date", "posted_date", "created_at"
-        ])
-        
-        # Write transaction data
-        for t in transactions:
-            writer.writerow([
-                t.id,
-                t.user_id,
-                t.account.user.name or "N/A",
-                t.account.user.email,
-                t.account_id,
-                t.account.account_type.value if t.account.account_type else "N/A",
-                float(t.amount) if t.amount else 0.0,
-                t.txn_type.value if t.txn_type else "N/A",
-                t.category or "N/A",
-                t.description or "N/A",
-                t.merchant or "N/A",
-                t.currency or "INR",
-                t.txn_date.isoformat() if t.txn_date else "",
-                t.posted_date.isoformat() if t.posted_date else "",
-                t.created_at.isoformat() if t.created_at else ""
-            ])
-        
-        csv_data = output.getvalue()
-        output.close()
-        
-        return {"csv_data": csv_data, "filename": f"transactions_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"}
-    except Exception as e:
-        print(f"Error exporting transactions: {e}")
-        raise HTTPException(status_code=500, detail="Failed to export transactions")
+        ],
+        rows,
+        lambda t: [
+            t.id,
+            t.user_id,
+            t.name or "N/A",
+            t.email,
+            t.account_id,
+            t.account_type.value if t.account_type else "N/A",
+            float(t.amount) if t.amount else 0.0,
+            t.txn_type.value if t.txn_type else "N/A",
+            t.category or "N/A",
+            t.description or "N/A",
+            t.merchant or "N/A",
+            t.currency or "INR",
+            _export_timestamp(t.txn_date),
+            _export_timestamp(t.posted_date),
+            _export_timestamp(t.created_at)
+        ]
+    )
+    return csv_download(chunks, f"{filename}.csv", gzip)
 
 @router.get("/transactions/user/{user_id}/export")
-async def export_user_transactions_csv(user_id: int, db: Session = Depends(get_db), admin: User = Depends(require_admin)):
-    """Export transactions for a specific user to CSV format"""
-    try:
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
-            
-        transactions = db.query(Transaction).join(Account).filter(Account.user_id == user_id).all()
-        
-        import io, csv
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Write headers
-        writer.writerow([
+async def export_user_transactions_csv(
+    user_id: int,
+    gzip: bool = False,
+    export_format: str = Query("csv", alias="format", pattern="^(csv|parquet|arrow)$"),
+    db: AsyncSession = Depends(get_async_db),
+    admin: User = Depends(require_admin)
+):
+    """Stream transactions for a specific user as CSV (or .csv.gz), Parquet or Arrow"""
+    user = (await db.execute(select(User.id, User.name).filter(User.id == user_id))).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    rows = stream_query(lambda db: db.query(
+        Transaction.id, Transaction.account_id, Account.account_type, Transaction.amount,
+        Transaction.txn_type, Transaction.category, Transaction.description, Transaction.merchant,
+        Transaction.currency, Transaction.txn_date, Transaction.posted_date, Transaction.created_at
+    ).select_from(Transaction).join(
+        Account, Transaction.account_id == Account.id
+    ).filter(Account.user_id == user_id).order_by(Transaction.id))
+
+    filename = f"{user.name or 'user'}_{user_id}_transactions_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    if export_format != "csv":
+        return columnar_download(_TXN_EXPORT_COLUMNS, rows, filename, export_format)
+
+    chunks = csv_chunks(
+        [
             "id", "account_id", "account_type", "amount", "txn_type", "category",
             "description", "merchant", "currency", "txn_date", "posted_date", "created_at"
-        ])
-        
-        # Write transaction data
-        for t in transactions:
-            writer.writerow([
-                t.id,
-                t.account_id,
-                t.account.account_type.value if t.account.account_type else "N/A",
-                float(t.amount) if t.amount else 0.0,
-                t.txn_type.value if t.txn_type else "N/A",
-                t.category or "N/A",
-                t.description or "N/A",
-                t.merchant or "N/A",
-                t.currency or "INR",
-                t.txn_date.isoformat() if t.txn_date else "",
-                t.posted_date.isoformat() if t.posted_date else "",
-                t.created_at.isoformat() if t.created_at else ""
-            ])
-        
-        csv_data = output.getvalue()
-        output.close()
-        
-        return {
-            "csv_data": csv_data, 
-            "filename": f"{user.name or 'user'}_{user_id}_transactions_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        }
-    except Exception as e:
-        print(f"Error exporting user transactions: {e}")
-        raise HTTPException(status_code=500, detail="Failed to export user transactions")
+        ],
+        rows,
+        lambda t: [
+            t.id,
+            t.account_id,
+            t.account_type.value if t.account_type else "N/A",
+            float(t.amount) if t.amount else 0.0,
+            t.txn_type.value if t.txn_type else "N/A",
+            t.category or "N/A",
+            t.description or "N/A",
+            t.merchant or "N/A",
+            t.currency or "INR",
+            _export_timestamp(t.txn_date),
+            _export_timestamp(t.posted_date),
+            _export_timestamp(t.created_at)
+        ]
+    )
+    return csv_download(chunks, f"{filename}.csv", gzip)
 
 @router.post("/transactions/import")
-async def import_transactions_csv(file_data: Dict[str, Any], db: Session = Depends(get_db), admin: User = Depends(require_admin)):
+async def import_transactions_csv(file_data: Dict[str, Any], db: AsyncSession = Depends(get_async_db), admin: User = Depends(require_admin)):
     """Import transactions from CSV data"""
     try:
         csv_content = file_data.get("csv_content", "")
         if not csv_content:
             raise HTTPException(status_code=400, detail="No CSV content provided")
         
-        import csv, io
-        from app.models.transaction import TransactionType
-        from app.models.account import AccountType
-        
-        csv_file = io.StringIO(csv_content)
-        reader = csv.DictReader(csv_file)
-        
-        imported_count = 0
-        errors = []
-        
-        for row_num, row in enumerate(reader, start=2):
-            try:
-                # Validate required fields
-                if not all([row.get('user_id'), row.get('amount'), row.get('txn_type')]):
-                    errors.append(f"Row {row_num}: Missing required fields (user_id, amount, txn_type)")
-                    continue
-                
-                # Check if user exists
-                user_id = int(row['user_id'])
-                user = db.query(User).filter(User.id == user_id).first()
-                if not user:
-                    errors.append(f"Row {row_num}: User with ID {user_id} not found")
-                    continue
-                
-                # Get or create account for user
-                account = db.query(Account).filter(Account.user_id == user_id).first()
-                if not account:
-                    # Create a default account for the user
-                    account = Account(
-                        user_id=user_id,
-                        account_number=f"ACC{user_id}{datetime.now().strftime('%Y%m%d')}",
-                        account_type=AccountType.savings,
-                        balance=0.0,
-                        is_active=True
-                    )
-                    db.add(account)
-                    db.flush()  # Get the account ID
-                
-                # Create transaction
-                transaction = Transaction(
-                    user_id=user_id,
-                    account_id=account.id,
-                    amount=float(row['amount']),
-                    txn_type=TransactionType(row['txn_type'].lower()),
-                    category=row.get('category', 'Imported'),
-                    description=row.get('description', 'Imported from CSV'),
-                    merchant=row.get('merchant'),
-                    currency=row.get('currency', 'INR'),
-                    txn_date=datetime.now(),
-                    posted_date=datetime.now()
-                )
-                
-                db.add(transaction)
-                imported_count += 1
-                
-            except Exception as e:
-                errors.append(f"Row {row_num}: {str(e)}")
-                continue
-        
-        if imported_count > 0:
-            db.commit()
-        else:
-            db.rollback()
-        
-        return {
-            "message": f"Import completed. {imported_count} transactions imported.",
-            "imported_count": imported_count,
-            "errors": errors[:10],  # Limit errors to first 10
-            "total_errors": len(errors)
-        }
+        # Row-by-row ORM work with flushes, so it runs on the session's sync facade
+        return await db.run_sync(_import_transactions, csv_content)
         
+    except HTTPException:
+        raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         print(f"Error importing transactions: {e}")
         raise HTTPException(status_code=500, detail="Failed to import transactions")
+
+def _import_transactions(db: Session, csv_content: str) -> dict:
+    import csv, io
+    from app.models.transaction import TxnType
+    from app.models.account import AccountType
+
+    csv_file = io.StringIO(csv_content)
+    reader = csv.DictReader(csv_file)
+
+    imported_count = 0
+    errors = []
+    rollup_deltas = {}
+
+    for row_num, row in enumerate(reader, start=2):
+        try:
+            # Validate required fields
+            if not all([row.get('user_id'), row.get('amount'), row.get('txn_type')]):
+                errors.append(f"Row {row_num}: Missing required fields (user_id, amount, txn_type)")
+                continue
+
+            # Check if user exists
+            user_id = int(row['user_id'])
+            user = db.query(User).filter(User.id == user_id).first()
+            if not user:
+                errors.append(f"Row {row_num}: User with ID {user_id} not found")
+                continue
+
+            # Get or create account for user
+            account = db.query(Account).filter(Account.user_id == user_id).first()
+            if not account:
+                # Create a default account for the user
+                account = Account(
+                    user_id=user_id,
+                    account_number=f"ACC{user_id}{datetime.now().strftime('%Y%m%d')}",
+                    account_type=AccountType.savings,
+                    balance=0.0,
+                    is_active=True
+                )
+                db.add(account)
+                db.flush()  # Get the account ID
+
+            # Create transaction
+            transaction = Transaction(
+                user_id=user_id,
+                account_id=account.id,
+                amount=float(row['amount']),
+                txn_type=TxnType(row['txn_type'].lower()),
+                category=row.get('category', 'Imported'),
+                description=row.get('description', 'Imported from CSV'),
+                merchant=row.get('merchant'),
+                currency=row.get('currency', 'INR'),
+                txn_date=datetime.now(),
+                posted_date=datetime.now()
+            )
+
+            db.add(transaction)
+            RollupService.add_transaction(rollup_deltas, transaction)
+            imported_count += 1
+
+        except Exception as e:
+            errors.append(f"Row {row_num}: {str(e)}")
+            continue
+
+    if imported_count > 0:
+        RollupService.apply(db, rollup_deltas)
+        BudgetService.apply_spend_deltas(db, rollup_deltas)
+        track_transaction_writes(db, rollup_deltas)
+        db.commit()
+    else:
+        db.rollback()
+
+    return {
+        "message": f"Import completed. {imported_count} transactions imported.",
+        "imported_count": imported_count,
+        "errors": errors[:10],  # Limit errors to first 10
+        "total_errors": len(errors)
+    }
 @router.post("/system/backup")
-async def perform_backup(db: Session = Depends(get_db), admin: User = Depends(require_admin)):
+async def perform_backup(db: AsyncSession = Depends(get_async_db), admin: User = Depends(require_admin)):
     # Simulated backup operation
     print("🔁 Performing system backup...")
     return {"message": "Backup started", "status": "ok"}
 
 @router.post("/system/clear-cache")
 async def clear_system_cache(admin: User = Depends(require_admin)):
-    # Simulated cache clear
     print("🧹 Clearing system cache...")
+    principal_cache.clear()
     return {"message": "Cache cleared", "status": "ok"}
 
+@router.get("/system/hashing")
+async def get_hashing_stats(admin: User = Depends(require_admin)):
+    """Queue depth, rejections and wait times of the bcrypt hashing pool"""
+    return hashing_stats()
+
+@router.get("/system/db-pool")
+async def get_db_pool_stats(admin: User = Depends(require_admin)):
+    """Connection pool occupancy and the checkout wait histogram (ms)"""
+    return pool_stats()
+
+@router.get("/system/event-loop")
+async def get_event_loop_stats(admin: User = Depends(require_admin)):
+    """Event-loop lag histogram (ms) and, in debug mode, recent stalls with their route and stack"""
+    return loop_monitor.stats()
+
+@router.get("/system/alerts")
+async def get_alert_evaluator_stats(admin: User = Depends(require_admin)):
+    """Post-commit alert evaluator: queued users, merged and dropped schedules, alerts created"""
+    return evaluator_stats()
+
+@router.get("/system/bill-scheduler")
+async def get_bill_scheduler_stats(admin: User = Depends(require_admin)):
+    """Bill scheduler settings and the counts of its last pass in this process"""
+    return scheduler_stats()
+
+@router.get("/system/auth-cache")
+async def get_auth_cache_stats(admin: User = Depends(require_admin)):
+    """Size and hit ratio of the get_current_user principal cache"""
+    return principal_cache.stats()
+
 # System configuration endpoints
 @router.get("/system/config")
 async def get_system_config(admin: User = Depends(require_admin)):
     return _system_config
 
 @router.put("/system/config")
-async def update_system_config(config: SystemConfigRequest, db: Session = Depends(get_db), admin: User = Depends(require_admin)):
+async def update_system_config(config: SystemConfigRequest, db: AsyncSession = Depends(get_async_db), admin: User = Depends(require_admin)):
     # Update the in-memory config for demo purposes
     if config.maintenance_mode is not None:
         _system_config["maintenance_mode"] = config.maintenance_mode
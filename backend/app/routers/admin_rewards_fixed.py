@@ -1,71 +1,67 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 from fastapi.responses import JSONResponse
-from app.database import SessionLocal
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
 from app.models.reward import Reward
 from app.models.user import User
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
 @router.get("/rewards/recent")
-async def get_recent_rewards():
-    db = SessionLocal()
-    try:
-        recent_rewards = db.query(Reward, User).join(User).filter(
+async def get_recent_rewards(db: AsyncSession = Depends(get_async_db)):
+    recent_rewards = (await db.execute(
+        select(Reward, User).join(User, Reward.user_id == User.id).filter(
             Reward.given_by_admin == True
-        ).order_by(Reward.created_at.desc()).limit(20).all()
-        
-        return JSONResponse(
-            content=[{
-                "id": reward.id,
-                "title": getattr(reward, 'title', None) or reward.program_name,
-                "points": reward.points_balance,
-                "reward_type": getattr(reward, 'reward_type', 'points'),
-                "reward_value": getattr(reward, 'reward_value', ''),
-                "admin_message": getattr(reward, 'admin_message', None),
-                "created_at": reward.created_at.isoformat(),
-                "user": {
-                    "id": user.id,
-                    "name": user.name,
-                    "email": user.email
-                }
-            } for reward, user in recent_rewards],
-            headers={"Access-Control-Allow-Origin": "*"}
-        )
-    finally:
-        db.close()
+        ).order_by(Reward.created_at.desc()).limit(20)
+    )).all()
+    
+    return JSONResponse(
+        content=[{
+            "id": reward.id,
+            "title": getattr(reward, 'title', None) or reward.program_name,
+            "points": reward.points_balance,
+            "reward_type": getattr(reward, 'reward_type', 'points'),
+            "reward_value": getattr(reward, 'reward_value', ''),
+            "admin_message": getattr(reward, 'admin_message', None),
+            "created_at": reward.created_at.isoformat(),
+            "user": {
+                "id": user.id,
+                "name": user.name,
+                "email": user.email
+            }
+        } for reward, user in recent_rewards],
+        headers={"Access-Control-Allow-Origin": "*"}
+    )
 
 @router.post("/users/{user_id}/give-reward")
-async def give_reward_to_user(user_id: int, reward_data: dict):
-    db = SessionLocal()
-    try:
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
-            return JSONResponse(
-                content={"error": "User not found"},
-                headers={"Access-Control-Allow-Origin": "*"}
-            )
-        
-        # Calculate points - if it's a points reward use that, else 0 or maybe convert?
-        # For now, let's keep points_balance as 0 for non-points rewards unless specified
-        points = reward_data.get('points', 0)
-        
-        new_reward = Reward(
-            user_id=user_id,
-            program_name=reward_data.get('title', 'Admin Reward'),
-            points_balance=points,
-            reward_type=reward_data.get('reward_type', 'points'),
-            reward_value=str(reward_data.get('reward_value', '')),
-            given_by_admin=True,
-            admin_message=reward_data.get('admin_message', f"Admin reward: {points} points"),
-            title=reward_data.get('title', 'Admin Reward')
-        )
-        
-        db.add(new_reward)
-        db.commit()
-        
+async def give_reward_to_user(user_id: int, reward_data: dict, db: AsyncSession = Depends(get_async_db)):
+    user = await db.get(User, user_id)
+    if not user:
         return JSONResponse(
-            content={"message": f"Successfully gave reward to {user.name}"},
+            content={"error": "User not found"},
             headers={"Access-Control-Allow-Origin": "*"}
         )
-    finally:
-        db.close()
\ No newline at end of file
+    
+    # Calculate points - if it's a points reward use that, else 0 or maybe convert?
+    # For now, let's keep points_balance as 0 for non-points rewards unless specified
+    points = reward_data.get('points', 0)
+    
+    new_reward = Reward(
+        user_id=user_id,
+        program_name=reward_data.get('title', 'Admin Reward'),
+        points_balance=points,
+        reward_type=reward_data.get('reward_type', 'points'),
+        reward_value=str(reward_data.get('reward_value', '')),
+        given_by_admin=True,
+        admin_message=reward_data.get('admin_message', f"Admin reward: {points} points"),
+        title=reward_data.get('title', 'Admin Reward')
+    )
+    
+    db.add(new_reward)
+    await db.commit()
+    
+    return JSONResponse(
+        content={"message": f"Successfully gave reward to {user.name}"},
+        headers={"Access-Control-Allow-Origin": "*"}
+    )
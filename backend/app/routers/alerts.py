@@ -4,6 +4,7 @@ from pydantic import BaseModel
 from app.database import get_db
 from app.dependencies import get_current_user
 from app.models.alert import Alert, AlertType
+from app.services.bill_scheduler import remind_user_bills
 
 router = APIRouter()
 
@@ -151,11 +152,8 @@ def check_reminders(current_user = Depends(get_current_user), db: Session = Depe
 
 @router.post("/bill-reminders")
 def check_bill_reminders(current_user = Depends(get_current_user), db: Session = Depends(get_db)):
-    # Return empty array for now - no reminders
-    return {
-        "reminders": [],
-        "count": 0
-    }
+    # The bill scheduler sends these for every user; this checks the caller's bills right away
+    return remind_user_bills(db, current_user.id)
 
 @router.get("/summary")
 def get_alerts_summary(current_user = Depends(get_current_user), db: Session = Depends(get_db)):
@@ -1,12 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func, desc, and_, or_
-from app.database import get_db
+from sqlalchemy.orm import Session, contains_eager, joinedload, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, desc, or_, select
+from app.database import get_async_db
 from app.models.user import User, KYCStatus, UserRole
 from app.models.account import Account
 from app.models.transaction import Transaction
 from app.models.alert import Alert
 from app.dependencies import get_current_user
+from app.utils.pagination import paginate_keyset
+from app.services.timeseries_service import TimeSeriesService
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 
@@ -19,8 +22,8 @@ def require_auditor(current_user: User = Depends(get_current_user)):
 
 # Read-Only User Data
 @router.get("/users")
-async def get_users_audit(db: Session = Depends(get_db), auditor: User = Depends(require_auditor)):
-    users = db.query(User).all()
+async def get_users_audit(db: AsyncSession = Depends(get_async_db), auditor: User = Depends(require_auditor)):
+    users = (await db.scalars(select(User).options(selectinload(User.accounts)))).all()
     return [{
         "id": u.id,
         "name": u.name,
@@ -35,10 +38,14 @@ async def get_users_audit(db: Session = Depends(get_db), auditor: User = Depends
     } for u in users]
 
 @router.get("/users/{user_id}")
-async def get_user_detail_audit(user_id: int, db: Session = Depends(get_db), auditor: User = Depends(require_auditor)):
-    user = db.query(User).filter(User.id == user_id).first()
+async def get_user_detail_audit(user_id: int, db: AsyncSession = Depends(get_async_db), auditor: User = Depends(require_auditor)):
+    user = await db.get(User, user_id, options=[selectinload(User.accounts)])
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    # Last 10 transactions, oldest first
+    recent_transactions = (await db.scalars(
+        select(Transaction).filter(Transaction.user_id == user_id).order_by(desc(Transaction.id)).limit(10)
+    )).all()[::-1]
     
     return {
         "id": user.id,
@@ -62,13 +69,19 @@ async def get_user_detail_audit(user_id: int, db: Session = Depends(get_db), aud
             "txn_type": txn.txn_type,
             "description": txn.description,
             "txn_date": txn.txn_date
-        } for txn in user.transactions[-10:]]  # Last 10 transactions
+        } for txn in recent_transactions]
     }
 
 # Read-Only Account Data
 @router.get("/accounts")
-async def get_accounts_audit(db: Session = Depends(get_db), auditor: User = Depends(require_auditor)):
-    accounts = db.query(Account).join(User).all()
+async def get_accounts_audit(db: AsyncSession = Depends(get_async_db), auditor: User = Depends(require_auditor)):
+    accounts = (await db.scalars(
+        select(Account).join(User, Account.user_id == User.id).options(contains_eager(Account.user))
+    )).all()
+    # Per-account counts in one grouped query instead of loading every transaction
+    transaction_counts = dict((await db.execute(
+        select(Transaction.account_id, func.count(Transaction.id)).group_by(Transaction.account_id)
+    )).all())
     return [{
         "id": a.id,
         "user_id": a.user_id,
@@ -78,12 +91,14 @@ async def get_accounts_audit(db: Session = Depends(get_db), auditor: User = Depe
         "balance": float(a.balance),
         "bank_name": a.bank_name,
         "created_at": a.created_at,
-        "transaction_count": len(a.transactions) if a.transactions else 0
+        "transaction_count": transaction_counts.get(a.id, 0)
     } for a in accounts]
 
 @router.get("/accounts/{account_id}")
-async def get_account_detail_audit(account_id: int, db: Session = Depends(get_db), auditor: User = Depends(require_auditor)):
-    account = db.query(Account).filter(Account.id == account_id).first()
+async def get_account_detail_audit(account_id: int, db: AsyncSession = Depends(get_async_db), auditor: User = Depends(require_auditor)):
+    account = await db.get(
+        Account, account_id, options=[joinedload(Account.user), selectinload(Account.transactions)]
+    )
     if not account:
         raise HTTPException(status_code=404, detail="Account not found")
     
@@ -108,7 +123,7 @@ async def get_account_detail_audit(account_id: int, db: Session = Depends(get_db
 # Read-Only Transaction Data
 @router.get("/transactions")
 async def get_transactions_audit(
-    db: Session = Depends(get_db), 
+    db: AsyncSession = Depends(get_async_db), 
     auditor: User = Depends(require_auditor),
     limit: int = Query(100, le=1000),
     offset: int = Query(0, ge=0),
@@ -116,9 +131,21 @@ async def get_transactions_audit(
     account_id: Optional[int] = Query(None),
     txn_type: Optional[str] = Query(None),
     start_date: Optional[str] = Query(None),
-    end_date: Optional[str] = Query(None)
+    end_date: Optional[str] = Query(None),
+    after: Optional[str] = Query(None)
 ):
-    query = db.query(Transaction).join(Account).join(User)
+    # paginate_keyset works on Query objects, so the page is built on the
+    # session's sync facade; its I/O still goes through the async driver
+    return await db.run_sync(
+        _transactions_page, limit, offset, user_id, account_id, txn_type, start_date, end_date, after
+    )
+
+def _transactions_page(db: Session, limit, offset, user_id, account_id, txn_type, start_date, end_date, after) -> dict:
+    query = db.query(Transaction).join(
+        Account, Transaction.account_id == Account.id
+    ).join(User, Account.user_id == User.id).options(
+        contains_eager(Transaction.account).contains_eager(Account.user)
+    )
     
     # Apply filters
     if user_id:
@@ -132,7 +159,11 @@ async def get_transactions_audit(
     if end_date:
         query = query.filter(Transaction.txn_date <= datetime.fromisoformat(end_date))
     
-    transactions = query.order_by(desc(Transaction.txn_date)).offset(offset).limit(limit).all()
+    next_cursor = None
+    if after is not None:
+        transactions, next_cursor = paginate_keyset(query, Transaction.txn_date, Transaction.id, after, limit)
+    else:
+        transactions = query.order_by(desc(Transaction.txn_date)).offset(offset).limit(limit).all()
     total_count = query.count()
     
     return {
@@ -153,17 +184,20 @@ async def get_transactions_audit(
         } for t in transactions],
         "total_count": total_count,
         "limit": limit,
-        "offset": offset
+        "offset": offset,
+        "next_cursor": next_cursor
     }
 
 # System Logs and Alerts
 @router.get("/system-logs")
-async def get_system_logs_audit(db: Session = Depends(get_db), auditor: User = Depends(require_auditor)):
+async def get_system_logs_audit(db: AsyncSession = Depends(get_async_db), auditor: User = Depends(require_auditor)):
     # Recent user activities
-    recent_users = db.query(User).order_by(desc(User.created_at)).limit(50).all()
-    recent_transactions = db.query(Transaction, User).join(Account).join(User).order_by(
-        desc(Transaction.txn_date)
-    ).limit(100).all()
+    recent_users = (await db.scalars(select(User).order_by(desc(User.created_at)).limit(50))).all()
+    recent_transactions = (await db.execute(
+        select(Transaction, User).join(Account, Transaction.account_id == Account.id).join(
+            User, Account.user_id == User.id
+        ).order_by(desc(Transaction.txn_date)).limit(100)
+    )).all()
     
     user_activities = [{
         "type": "user_registration",
@@ -199,8 +233,12 @@ async def get_system_logs_audit(db: Session = Depends(get_db), auditor: User = D
     return {"activities": all_activities[:200]}  # Return last 200 activities
 
 @router.get("/alerts")
-async def get_alerts_audit(db: Session = Depends(get_db), auditor: User = Depends(require_auditor)):
-    alerts = db.query(Alert).join(User).order_by(desc(Alert.created_at)).all()
+async def get_alerts_audit(db: AsyncSession = Depends(get_async_db), auditor: User = Depends(require_auditor)):
+    alerts = (await db.scalars(
+        select(Alert).join(User, Alert.user_id == User.id).options(
+            contains_eager(Alert.user)
+        ).order_by(desc(Alert.created_at))
+    )).all()
     return [{
         "id": a.id,
         "user_id": a.user_id,
@@ -214,28 +252,33 @@ async def get_alerts_audit(db: Session = Depends(get_db), auditor: User = Depend
 
 # Compliance Reports
 @router.get("/compliance-summary")
-async def get_compliance_summary(db: Session = Depends(get_db), auditor: User = Depends(require_auditor)):
+async def get_compliance_summary(db: AsyncSession = Depends(get_async_db), auditor: User = Depends(require_auditor)):
     # User compliance metrics
-    total_users = db.query(User).count()
-    active_users = db.query(User).filter(User.is_active == True).count()
-    verified_kyc = db.query(User).filter(User.kyc_status == KYCStatus.verified).count()
-    pending_kyc = db.query(User).filter(User.kyc_status == KYCStatus.unverified).count()
+    total_users, active_users, verified_kyc, pending_kyc = (await db.execute(select(
+        func.count(User.id),
+        func.count(User.id).filter(User.is_active == True),
+        func.count(User.id).filter(User.kyc_status == KYCStatus.verified),
+        func.count(User.id).filter(User.kyc_status == KYCStatus.unverified)
+    ))).one()
     
     # Account metrics
-    total_accounts = db.query(Account).count()
-    total_balance = db.query(func.sum(Account.balance)).scalar() or 0
-    
-    # Transaction metrics
-    total_transactions = db.query(Transaction).count()
-    today_transactions = db.query(Transaction).filter(
-        func.date(Transaction.txn_date) == datetime.now().date()
-    ).count()
+    total_accounts, total_balance = (await db.execute(
+        select(func.count(Account.id), func.coalesce(func.sum(Account.balance), 0))
+    )).one()
     
-    # Large transactions (potential compliance issues)
-    large_transactions = db.query(Transaction).filter(Transaction.amount > 10000).count()
+    # Transaction metrics, with large transactions as potential compliance issues
+    today = datetime.now().date()
+    total_transactions, today_transactions, large_transactions = (await db.execute(select(
+        func.count(Transaction.id),
+        func.count(Transaction.id).filter(
+            Transaction.txn_date >= datetime.combine(today, datetime.min.time()),
+            Transaction.txn_date < datetime.combine(today + timedelta(days=1), datetime.min.time())
+        ),
+        func.count(Transaction.id).filter(Transaction.amount > 10000)
+    ))).one()
     
     # Role distribution
-    role_stats = db.query(User.role, func.count(User.id)).group_by(User.role).all()
+    role_stats = (await db.execute(select(User.role, func.count(User.id)).group_by(User.role))).all()
     
     return {
         "user_metrics": {
@@ -266,21 +309,27 @@ async def get_compliance_summary(db: Session = Depends(get_db), auditor: User =
     }
 
 @router.get("/transaction-patterns")
-async def get_transaction_patterns(db: Session = Depends(get_db), auditor: User = Depends(require_auditor)):
-    # Daily transaction patterns (last 30 days)
-    daily_patterns = []
-    for i in range(30):
-        date = datetime.now().date() - timedelta(days=i)
-        count = db.query(Transaction).filter(func.date(Transaction.txn_date) == date).count()
-        volume = db.query(func.sum(Transaction.amount)).filter(func.date(Transaction.txn_date) == date).scalar() or 0
-        daily_patterns.append({
-            "date": date.isoformat(),
-            "transaction_count": count,
-            "total_volume": float(volume)
-        })
+async def get_transaction_patterns(
+    periods: int = Query(30, ge=1, le=3660, description="Number of buckets, ending with the current one"),
+    granularity: str = Query("day", pattern="^(day|week|month)$"),
+    db: AsyncSession = Depends(get_async_db),
+    auditor: User = Depends(require_auditor)
+):
+    # Daily transaction patterns, one bucketed query for the whole window
+    start, end = TimeSeriesService.trailing_window(periods, granularity)
+    daily_patterns = [{
+        "date": point["bucket"].isoformat(),
+        "transaction_count": point["count"],
+        "total_volume": float(point["volume"])
+    } for point in await db.run_sync(
+        TimeSeriesService.bucketed, Transaction.txn_date, start, end, granularity,
+        {"count": func.count(Transaction.id), "volume": func.coalesce(func.sum(Transaction.amount), 0)}
+    )]
     
     # Transaction type distribution
-    type_stats = db.query(Transaction.txn_type, func.count(Transaction.id), func.sum(Transaction.amount)).group_by(Transaction.txn_type).all()
+    type_stats = (await db.execute(
+        select(Transaction.txn_type, func.count(Transaction.id), func.sum(Transaction.amount)).group_by(Transaction.txn_type)
+    )).all()
     type_distribution = [{
         "type": str(txn_type),
         "count": count,
@@ -288,9 +337,11 @@ async def get_transaction_patterns(db: Session = Depends(get_db), auditor: User
     } for txn_type, count, total_amount in type_stats]
     
     # Category analysis
-    category_stats = db.query(Transaction.category, func.count(Transaction.id), func.sum(Transaction.amount)).filter(
-        Transaction.category.isnot(None)
-    ).group_by(Transaction.category).all()
+    category_stats = (await db.execute(
+        select(Transaction.category, func.count(Transaction.id), func.sum(Transaction.amount)).filter(
+            Transaction.category.isnot(None)
+        ).group_by(Transaction.category)
+    )).all()
     category_distribution = [{
         "category": category,
         "count": count,
@@ -298,32 +349,35 @@ async def get_transaction_patterns(db: Session = Depends(get_db), auditor: User
     } for category, count, total_amount in category_stats]
     
     return {
-        "daily_patterns": daily_patterns[::-1],  # Reverse to show oldest first
+        "daily_patterns": daily_patterns,  # Oldest first
         "type_distribution": type_distribution,
         "category_distribution": category_distribution
     }
 
 @router.get("/user-activity-report")
-async def get_user_activity_report(db: Session = Depends(get_db), auditor: User = Depends(require_auditor)):
-    # User registration trends (last 12 months)
-    monthly_registrations = []
-    for i in range(12):
-        start_date = datetime.now() - timedelta(days=30*(i+1))
-        end_date = datetime.now() - timedelta(days=30*i)
-        count = db.query(User).filter(
-            and_(User.created_at >= start_date, User.created_at < end_date)
-        ).count()
-        monthly_registrations.append({
-            "month": start_date.strftime("%Y-%m"),
-            "registrations": count
-        })
+async def get_user_activity_report(
+    months: int = Query(12, ge=1, le=120),
+    db: AsyncSession = Depends(get_async_db),
+    auditor: User = Depends(require_auditor)
+):
+    # User registration trends, one bucketed query for the whole window
+    start, end = TimeSeriesService.trailing_window(months, "month")
+    monthly_registrations = [{
+        "month": point["bucket"].strftime("%Y-%m"),
+        "registrations": point["registrations"]
+    } for point in await db.run_sync(
+        TimeSeriesService.bucketed, User.created_at, start, end, "month",
+        {"registrations": func.count(User.id)}
+    )]
     
     # Most active users (by transaction count)
-    active_users = db.query(
+    active_users = (await db.execute(select(
         User.id, User.name, User.email, func.count(Transaction.id).label('txn_count')
-    ).join(Account).join(Transaction).group_by(User.id, User.name, User.email).order_by(
+    ).select_from(User).join(Account, Account.user_id == User.id).join(
+        Transaction, Transaction.account_id == Account.id
+    ).group_by(User.id, User.name, User.email).order_by(
         desc('txn_count')
-    ).limit(20).all()
+    ).limit(20))).all()
     
     active_users_data = [{
         "user_id": user_id,
@@ -333,6 +387,6 @@ async def get_user_activity_report(db: Session = Depends(get_db), auditor: User
     } for user_id, name, email, txn_count in active_users]
     
     return {
-        "monthly_registrations": monthly_registrations[::-1],
+        "monthly_registrations": monthly_registrations,
         "most_active_users": active_users_data
     }
\ No newline at end of file
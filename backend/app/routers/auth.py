@@ -16,6 +16,7 @@ from app import models
 from app.models.user import User
 from app.utils.jwt_handler import verify_token, create_access_token, create_refresh_token
 from app.utils.hash_password import verify_password, hash_password
+from app.auth import principal_cache
 
 router = APIRouter(
     prefix="/api/auth",
@@ -298,6 +299,7 @@ def reset_password(request: ResetPassword, db: Session = Depends(get_db)):
         # All good, set new password and commit
         user.password = hash_password(request.new_password)
         db.commit()
+        principal_cache.invalidate_user(user.id)
 
         return {"message": "Password reset successfully"}
 
@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
+from typing import List, Optional
 from app.database import get_db
 from app.dependencies import get_current_user
-from app.models.bill import Bill
+from app.models.bill import Bill, BillStatus
 from pydantic import BaseModel
 from datetime import date
 
@@ -13,21 +15,35 @@ class BillCreate(BaseModel):
     amount: float
     due_date: str
 
-@router.get("")
-def get_bills(current_user = Depends(get_current_user), db: Session = Depends(get_db)):
-    # Auto-cleanup: Delete any leftover default bills from the database
-    db.query(Bill).filter(
-        Bill.user_id == current_user.id,
-        Bill.biller_name.in_(["Electricity Bill", "Internet Bill"]),
-        Bill.amount_due.in_([150.00, 80.00])
-    ).delete(synchronize_session=False)
-    db.commit()
+def list_bills(
+    db: Session,
+    user_id: int,
+    status: Optional[BillStatus] = None,
+    due_from: Optional[date] = None,
+    due_to: Optional[date] = None,
+    limit: Optional[int] = None,
+    offset: int = 0
+) -> List[dict]:
+    """
+    A user's bills, soonest due first. Read-only: a range scan on the
+    (user_id, due_date) index. The old default sample bills are removed once
+    by migration 0005.
+    """
+    query = db.query(Bill).filter(Bill.user_id == user_id)
 
-    bills = db.query(Bill).filter(Bill.user_id == current_user.id).all()
-    
-    # Return empty list if no bills exist (do not create sample bills for new users)
-    if not bills:
-        pass
+    if status == BillStatus.upcoming:
+        # Rows written before status had a default count as upcoming
+        query = query.filter(or_(Bill.status == status, Bill.status.is_(None)))
+    elif status:
+        query = query.filter(Bill.status == status)
+    if due_from:
+        query = query.filter(Bill.due_date >= due_from)
+    if due_to:
+        query = query.filter(Bill.due_date <= due_to)
+
+    query = query.order_by(Bill.due_date, Bill.id).offset(offset)
+    if limit is not None:
+        query = query.limit(limit)
     
     return [
         {
@@ -38,9 +54,21 @@ def get_bills(current_user = Depends(get_current_user), db: Session = Depends(ge
             "status": bill.status.value if bill.status else "pending",
             "autoPay": getattr(bill, 'auto_pay', False),
             "category": "Bills & Utilities"
-        } for bill in bills
+        } for bill in query.all()
     ]
 
+@router.get("")
+def get_bills(
+    status: Optional[BillStatus] = Query(None, description="Only bills with this status"),
+    due_from: Optional[date] = Query(None, description="Earliest due date, inclusive"),
+    due_to: Optional[date] = Query(None, description="Latest due date, inclusive"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size; every bill when omitted"),
+    offset: int = Query(0, ge=0),
+    current_user = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    return list_bills(db, current_user.id, status, due_from, due_to, limit, offset)
+
 @router.post("")
 def create_bill(bill_data: BillCreate, current_user = Depends(get_current_user), db: Session = Depends(get_db)):
     db_bill = Bill(
@@ -3,12 +3,19 @@ from sqlalchemy.orm import Session
 from typing import List
 from app.database import get_db
 from app.dependencies import get_current_user
+from app.auth import principal_cache
 from app.models.account import Account
 from app.models.transaction import Transaction
-from app.models.budget import Budget
 from app.models.user import User, UserRole
 from app.models.alert import Alert
-from datetime import date
+from app.services.dashboard_service import DashboardService
+from app.accounts.service import AccountService
+from app.accounts.schemas import AccountResponse
+from app.budgets.service import BudgetService
+from app.budgets.schemas import BudgetResponse
+from app.routers.alerts import get_alerts
+from app.routers.bills import list_bills
+from app.routers.rewards import get_rewards
 
 router = APIRouter()
 
@@ -24,43 +31,20 @@ from app.dependencies import require_auditor as require_auditor_or_admin, requir
 
 @router.get("/dashboard-stats")
 def get_dashboard_stats(current_user = Depends(get_current_user), db: Session = Depends(get_db)):
-    # Get real data from database
-    accounts = db.query(Account).filter(Account.user_id == current_user.id).all()
-    total_balance = sum(float(acc.balance) for acc in accounts)
-    
-    # Get transactions for current month
-    today = date.today()
-    
-    income_transactions = db.query(Transaction).filter(
-        Transaction.user_id == current_user.id,
-        Transaction.txn_type.in_(['credit']),
-        Transaction.txn_date >= date(today.year, today.month, 1)
-    ).all()
-    
-    expense_transactions = db.query(Transaction).filter(
-        Transaction.user_id == current_user.id,
-        Transaction.txn_type.in_(['debit']),
-        Transaction.txn_date >= date(today.year, today.month, 1)
-    ).all()
-    
-    income_this_month = sum(float(txn.amount) for txn in income_transactions)
-    expenses_this_month = sum(float(txn.amount) for txn in expense_transactions)
-    
-    # Get active budgets
-    active_budgets = db.query(Budget).filter(
-        Budget.user_id == current_user.id,
-        Budget.month == today.month,
-        Budget.year == today.year
-    ).count()
-    
-    return {
-        "total_accounts": len(accounts),
-        "total_balance": total_balance,
-        "income_this_month": income_this_month,
-        "expenses_this_month": expenses_this_month,
-        "net_this_month": income_this_month - expenses_this_month,
-        "active_budgets": active_budgets
-    }
+    return DashboardService.get_stats(db, current_user.id)
+
+@router.get("/dashboard/bundle")
+def get_dashboard_bundle(current_user = Depends(get_current_user)):
+    """Everything the dashboard page renders, authenticated once and loaded concurrently"""
+    user_id = current_user.id
+    return DashboardService.gather_sections({
+        "stats": lambda db: DashboardService.get_stats(db, user_id),
+        "accounts": lambda db: [AccountResponse.model_validate(a) for a in AccountService.get_accounts(db, user_id)],
+        "alerts": lambda db: get_alerts(current_user, db),
+        "budgets": lambda db: [BudgetResponse.model_validate(b) for b in BudgetService.get_budgets(db, user_id)],
+        "bills": lambda db: list_bills(db, user_id),
+        "rewards": lambda db: get_rewards(current_user, db),
+    })
 
 # Admin Endpoints
 @router.get("/admin/users")
@@ -75,6 +59,7 @@ def activate_user(user_id: int, db: Session = Depends(get_db), admin_user: User
         raise HTTPException(status_code=404, detail="User not found")
     user.is_active = True
     db.commit()
+    principal_cache.invalidate_user(user_id)
     return {"message": "User activated successfully"}
 
 @router.put("/admin/users/{user_id}/deactivate")
@@ -84,6 +69,7 @@ def deactivate_user(user_id: int, db: Session = Depends(get_db), admin_user: Use
         raise HTTPException(status_code=404, detail="User not found")
     user.is_active = False
     db.commit()
+    principal_cache.invalidate_user(user_id)
     return {"message": "User deactivated successfully"}
 
 # Removed duplicate endpoint - using the more complete version from admin.py
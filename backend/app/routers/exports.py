@@ -1,23 +1,29 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
 import csv
 import io
-from app.database import get_db
 from app.models.user import User
 from app.models.transaction import Transaction
 from app.models.account import Account
 from app.dependencies import get_current_user
+from app.utils.streaming import stream_query, csv_chunks, csv_download, columnar_download
 
 router = APIRouter(tags=["Exports"])
 
+# Typed columns for parquet/arrow, in the order selected below
+TRANSACTION_EXPORT_COLUMNS = [
+    ("date", "timestamp"), ("amount", "decimal"), ("type", "string"),
+    ("description", "string"), ("category", "string"), ("merchant", "string")
+]
+
 @router.get("/transactions/csv")
 def export_transactions_csv(
     start_date: str = None,
     end_date: str = None,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    gzip: bool = False,
+    export_format: str = Query("csv", alias="format", pattern="^(csv|parquet|arrow)$"),
+    current_user: User = Depends(get_current_user)
 ):
     if start_date:
         start = datetime.fromisoformat(start_date)
@@ -29,36 +35,36 @@ def export_transactions_csv(
     else:
         end = datetime.utcnow()
     
-    transactions = db.query(Transaction).join(Account).filter(
-        Account.user_id == current_user.id,
+    user_id = current_user.id
+    rows = stream_query(lambda db: db.query(
+        Transaction.txn_date,
+        Transaction.amount,
+        Transaction.txn_type,
+        Transaction.description,
+        Transaction.category,
+        Transaction.merchant
+    ).join(Account, Transaction.account_id == Account.id).filter(
+        Account.user_id == user_id,
         Transaction.txn_date >= start,
         Transaction.txn_date <= end
-    ).all()
+    ).order_by(Transaction.txn_date, Transaction.id))
     
-    output = io.StringIO()
-    writer = csv.writer(output)
+    if export_format != "csv":
+        return columnar_download(TRANSACTION_EXPORT_COLUMNS, rows, "transactions", export_format)
     
-    writer.writerow([
-        'date', 'amount', 'type', 'description', 'category', 'merchant'
-    ])
-    
-    for t in transactions:
-        writer.writerow([
+    chunks = csv_chunks(
+        ['date', 'amount', 'type', 'description', 'category', 'merchant'],
+        rows,
+        lambda t: [
             t.txn_date.strftime('%Y-%m-%d'),
             str(t.amount),
-            t.txn_type,
+            t.txn_type.value if t.txn_type else '',
             t.description or '',
             t.category or '',
             t.merchant or ''
-        ])
-    
-    output.seek(0)
-    
-    return StreamingResponse(
-        io.BytesIO(output.getvalue().encode()),
-        media_type="text/csv",
-        headers={"Content-Disposition": "attachment; filename=transactions.csv"}
+        ]
     )
+    return csv_download(chunks, "transactions.csv", gzip)
 
 @router.get("/transactions/template")
 def download_csv_template():
@@ -1,64 +1,47 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from typing import Optional
 from datetime import datetime, timedelta
+import calendar
 from app.database import get_db
-from app.models import User, Transaction, Budget
 from app.dependencies import get_current_user
+from app.services.insights_service import InsightsService, parse_date_window
 
 router = APIRouter(tags=["Insights"])
 
 @router.get("/")
-def get_insights(current_user = Depends(get_current_user), db: Session = Depends(get_db)):
-    # Get real transactions for the current user
-    transactions = db.query(Transaction).filter(Transaction.user_id == current_user.id).all()
-    
-    # Calculate income and expenses
-    income = sum(float(t.amount) for t in transactions if t.txn_type == 'credit')
-    expenses = sum(float(t.amount) for t in transactions if t.txn_type == 'debit')
-    net_savings = income - expenses
-    savings_rate = (net_savings / income * 100) if income > 0 else 0
-    
-    # Get top category
-    category_totals = {}
-    for t in transactions:
-        if t.txn_type == 'debit' and t.category:
-            category_totals[t.category] = category_totals.get(t.category, 0) + float(t.amount)
-    
-    top_category = max(category_totals.items(), key=lambda x: x[1])[0] if category_totals else "None"
-    
-    return {
-        "income": income,
-        "expenses": expenses,
-        "net_flow": net_savings,
-        "savings_rate": savings_rate,
-        "top_category": top_category,
-        "transactions_count": len(transactions)
-    }
+def get_insights(
+    start_date: Optional[str] = Query(None, description="Window start (ISO date)"),
+    end_date: Optional[str] = Query(None, description="Window end, inclusive (ISO date)"),
+    current_user = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    # Aggregated in SQL; defaults to the user's full history when no window is given
+    start, end = parse_date_window(start_date, end_date)
+    return InsightsService.get_summary(db, current_user.id, start, end)
 
 @router.get("/spending")
-def get_spending_analysis(period: str = "month", current_user = Depends(get_current_user), db: Session = Depends(get_db)):
-    # Get transactions for the current user
-    transactions = db.query(Transaction).filter(
-        Transaction.user_id == current_user.id,
-        Transaction.txn_type == 'debit'
-    ).all()
-    
-    total_spent = sum(float(t.amount) for t in transactions)
+def get_spending_analysis(
+    period: str = "month",
+    start_date: Optional[str] = Query(None, description="Window start (ISO date)"),
+    end_date: Optional[str] = Query(None, description="Window end, inclusive (ISO date)"),
+    current_user = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    start, end = parse_date_window(start_date, end_date)
     
-    # Get top merchants
-    merchant_totals = {}
-    for t in transactions:
-        if t.merchant:
-            merchant_totals[t.merchant] = merchant_totals.get(t.merchant, 0) + float(t.amount)
+    # Without an explicit window, analyse the trailing period
+    days_in_period = 30 if period == "month" else 7
+    if start is None and end is None:
+        end = datetime.utcnow()
+        start = end - timedelta(days=days_in_period)
+    elif start and end:
+        days_in_period = max((end - start).days, 1)
     
-    top_merchants = [
-        {"merchant": merchant, "total_spent": amount, "transaction_count": sum(1 for t in transactions if t.merchant == merchant)}
-        for merchant, amount in sorted(merchant_totals.items(), key=lambda x: x[1], reverse=True)[:5]
-    ]
+    total_spent = InsightsService.get_total_spent(db, current_user.id, start, end)
+    top_merchants = InsightsService.get_top_merchants(db, current_user.id, start, end, limit=5)
     
     # Calculate daily burn rate
-    days_in_period = 30 if period == "month" else 7
     daily_burn_rate = total_spent / days_in_period if days_in_period > 0 else 0
     projected_monthly_spend = daily_burn_rate * 30
     
@@ -70,28 +53,54 @@ def get_spending_analysis(period: str = "month", current_user = Depends(get_curr
         "top_merchants": top_merchants
     }
 
-@router.get("/categories")
-def get_category_breakdown(current_user = Depends(get_current_user), db: Session = Depends(get_db)):
+def _category_breakdown(buckets) -> list:
+    totals = {}
+    for bucket in buckets:
+        for category, amount in bucket["categories"].items():
+            totals[category] = totals.get(category, 0.0) + amount
+    grand_total = sum(totals.values())
     return [
-        {"category": "Dining", "amount": 450.0, "percentage": 25.0},
-        {"category": "Groceries", "amount": 380.0, "percentage": 21.1},
-        {"category": "Gas", "amount": 240.0, "percentage": 13.3},
-        {"category": "Shopping", "amount": 320.0, "percentage": 17.8},
-        {"category": "Entertainment", "amount": 210.0, "percentage": 11.7},
-        {"category": "Utilities", "amount": 200.0, "percentage": 11.1}
+        {
+            "category": category,
+            "amount": round(amount, 2),
+            "percentage": round(amount / grand_total * 100, 1) if grand_total else 0.0
+        }
+        for category, amount in sorted(totals.items(), key=lambda x: x[1], reverse=True)
     ]
 
-@router.get("/trends")
-def get_monthly_trends(current_user = Depends(get_current_user), db: Session = Depends(get_db)):
+def _monthly_series(buckets) -> list:
     return [
-        {"month": "August 2024", "income": 5000.0, "expenses": 3200.0, "savings": 1800.0},
-        {"month": "September 2024", "income": 5200.0, "expenses": 3400.0, "savings": 1800.0},
-        {"month": "October 2024", "income": 4800.0, "expenses": 3600.0, "savings": 1200.0},
-        {"month": "November 2024", "income": 5100.0, "expenses": 3300.0, "savings": 1800.0},
-        {"month": "December 2024", "income": 5300.0, "expenses": 3800.0, "savings": 1500.0},
-        {"month": "January 2025", "income": 5000.0, "expenses": 3500.0, "savings": 1500.0}
+        {
+            "month": bucket["label"],
+            "income": round(bucket["income"], 2),
+            "expenses": round(bucket["expenses"], 2),
+            "savings": round(bucket["income"] - bucket["expenses"], 2)
+        }
+        for bucket in buckets
     ]
 
+@router.get("/categories")
+def get_category_breakdown(
+    months: int = Query(1, ge=1, le=24, description="Number of months, including the current one"),
+    current_user = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    return InsightsService.cached(
+        current_user.id, "categories", (months,),
+        lambda: _category_breakdown(InsightsService.get_month_buckets(db, current_user.id, months))
+    )
+
+@router.get("/trends")
+def get_monthly_trends(
+    months: int = Query(6, ge=1, le=24),
+    current_user = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    return InsightsService.cached(
+        current_user.id, "trends", (months,),
+        lambda: _monthly_series(InsightsService.get_month_buckets(db, current_user.id, months))
+    )
+
 @router.get("/budgets")
 def get_budget_insights(current_user = Depends(get_current_user), db: Session = Depends(get_db)):
     return {
@@ -101,61 +110,68 @@ def get_budget_insights(current_user = Depends(get_current_user), db: Session =
         "highest_category": "Dining"
     }
 
+PERIOD_MONTHS = {"monthly": 1, "quarterly": 3, "yearly": 12}
+
 @router.get("/cash-flow")
 def get_cash_flow(
     period: str = "monthly",
+    current_user = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    # Mock data for demo
-    return {
-        "period": period,
-        "income": 5000.0,
-        "expenses": 3500.0,
-        "net_flow": 1500.0,
-        "savings_rate": 30.0
-    }
+    def compute():
+        buckets = InsightsService.get_month_buckets(db, current_user.id, PERIOD_MONTHS.get(period, 1))
+        income = sum(b["income"] for b in buckets)
+        expenses = sum(b["expenses"] for b in buckets)
+        net_flow = income - expenses
+        return {
+            "period": period,
+            "income": round(income, 2),
+            "expenses": round(expenses, 2),
+            "net_flow": round(net_flow, 2),
+            "savings_rate": round(net_flow / income * 100, 1) if income > 0 else 0.0
+        }
+    return InsightsService.cached(current_user.id, "cash-flow", (period,), compute)
 
 @router.get("/top-merchants")
-def get_top_merchants(limit: int = 5):
-    # Mock data for demo
-    return [
-        {"merchant": "Amazon", "total_spent": 450.0, "transaction_count": 8},
-        {"merchant": "Walmart", "total_spent": 320.0, "transaction_count": 12},
-        {"merchant": "Starbucks", "total_spent": 180.0, "transaction_count": 15},
-        {"merchant": "Shell", "total_spent": 240.0, "transaction_count": 6},
-        {"merchant": "Target", "total_spent": 290.0, "transaction_count": 9}
-    ]
+def get_top_merchants(
+    limit: int = Query(5, ge=1, le=50),
+    days: int = Query(30, ge=1, le=366),
+    current_user = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    def compute():
+        # Merchants are not rolled up, so this reads the window from transactions
+        end = datetime.utcnow()
+        return InsightsService.get_top_merchants(db, current_user.id, end - timedelta(days=days), end, limit)
+    return InsightsService.cached(current_user.id, "top-merchants", (limit, days), compute)
 
 @router.get("/burn-rate")
-def get_burn_rate():
-    # Mock data for demo
-    return {
-        "current_month_spent": 2100.0,
-        "days_passed": 15,
-        "daily_burn_rate": 140.0,
-        "projected_monthly_spend": 4200.0
-    }
+def get_burn_rate(current_user = Depends(get_current_user), db: Session = Depends(get_db)):
+    def compute():
+        today = datetime.utcnow().date()
+        days_in_month = calendar.monthrange(today.year, today.month)[1]
+        spent = InsightsService.get_month_buckets(db, current_user.id, 1, today)[0]["expenses"]
+        daily_burn_rate = spent / today.day
+        return {
+            "current_month_spent": round(spent, 2),
+            "days_passed": today.day,
+            "daily_burn_rate": round(daily_burn_rate, 2),
+            "projected_monthly_spend": round(daily_burn_rate * days_in_month, 2)
+        }
+    return InsightsService.cached(current_user.id, "burn-rate", (datetime.utcnow().date(),), compute)
 
 @router.get("/category-breakdown")
-def get_category_breakdown():
-    # Mock data for demo
-    return [
-        {"category": "Dining", "amount": 450.0, "percentage": 25.0},
-        {"category": "Groceries", "amount": 380.0, "percentage": 21.1},
-        {"category": "Gas", "amount": 240.0, "percentage": 13.3},
-        {"category": "Shopping", "amount": 320.0, "percentage": 17.8},
-        {"category": "Entertainment", "amount": 210.0, "percentage": 11.7},
-        {"category": "Utilities", "amount": 200.0, "percentage": 11.1}
-    ]
+def get_category_breakdown_alias(
+    months: int = Query(1, ge=1, le=24),
+    current_user = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    return get_category_breakdown(months, current_user, db)
 
 @router.get("/savings-trend")
-def get_savings_trend(months: int = 6):
-    # Mock data for demo
-    return [
-        {"month": "August 2024", "income": 5000.0, "expenses": 3200.0, "savings": 1800.0},
-        {"month": "September 2024", "income": 5200.0, "expenses": 3400.0, "savings": 1800.0},
-        {"month": "October 2024", "income": 4800.0, "expenses": 3600.0, "savings": 1200.0},
-        {"month": "November 2024", "income": 5100.0, "expenses": 3300.0, "savings": 1800.0},
-        {"month": "December 2024", "income": 5300.0, "expenses": 3800.0, "savings": 1500.0},
-        {"month": "January 2025", "income": 5000.0, "expenses": 3500.0, "savings": 1500.0}
-    ]
\ No newline at end of file
+def get_savings_trend(
+    months: int = Query(6, ge=1, le=24),
+    current_user = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    return get_monthly_trends(months, current_user, db)
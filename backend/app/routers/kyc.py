@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File,
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.dependencies import get_current_user
+from app.auth import principal_cache
 from app.models.user import User, UserRole, KYCStatus
 from app.models.kyc import KYCDocument, KYCVerificationLog, DocumentType
 from app.services.kyc_verification import KYCVerificationService
@@ -275,6 +276,7 @@ def verify_kyc_document(
     
     db.add(verification_log)
     db.commit()
+    principal_cache.invalidate_user(kyc_document.user_id)
     
     return {
         "message": f"KYC document {verification.action} successfully",
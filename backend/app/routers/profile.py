@@ -95,7 +95,7 @@ def update_profile(profile_data: dict, current_user = Depends(get_current_user),
     if 'name' in profile_data:
         current_user.name = profile_data['name']
     db.commit()
-    db.refresh(current_user)
+    db.refresh(current_user.record)
     
     return {
         "id": current_user.id,
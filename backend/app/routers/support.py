@@ -1,8 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import Column, Integer, String, Text, DateTime, Enum as SQLEnum
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Column, Integer, String, Text, DateTime, Enum as SQLEnum, Index, select
 from sqlalchemy.sql import func
-from app.database import get_db, Base
+from app.database import get_async_db, Base
 from app.dependencies import get_current_user
 from app.models.user import User
 from pydantic import BaseModel
@@ -36,7 +36,10 @@ class TicketStatus(str, enum.Enum):
 # Database Models
 class SupportTicket(Base):
     __tablename__ = "support_tickets"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        Index("ix_support_tickets_user_created", "user_id", "created_at"),
+        {'extend_existing': True},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, nullable=False)
@@ -87,13 +90,10 @@ class TicketResponse(BaseModel):
 async def create_support_ticket(
     ticket_data: TicketCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new support ticket"""
     try:
-        # Ensure tables exist
-        Base.metadata.create_all(bind=db.bind)
-        
         # Create new ticket
         db_ticket = SupportTicket(
             user_id=current_user.id,
@@ -105,8 +105,8 @@ async def create_support_ticket(
         )
         
         db.add(db_ticket)
-        db.commit()
-        db.refresh(db_ticket)
+        await db.commit()
+        await db.refresh(db_ticket)
         
         return {
             "message": "Support ticket created successfully",
@@ -115,19 +115,19 @@ async def create_support_ticket(
             "estimated_response": "24 hours"
         }
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         print(f"Error creating support ticket: {e}")
         raise HTTPException(status_code=500, detail="Failed to create support ticket")
 
 @router.get("/tickets")
 async def get_user_tickets(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all tickets for the current user"""
-    tickets = db.query(SupportTicket).filter(
+    tickets = (await db.scalars(select(SupportTicket).filter(
         SupportTicket.user_id == current_user.id
-    ).order_by(SupportTicket.created_at.desc()).all()
+    ).order_by(SupportTicket.created_at.desc()))).all()
     
     return [
         {
@@ -146,13 +146,13 @@ async def get_user_tickets(
 async def get_ticket_details(
     ticket_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get details of a specific ticket"""
-    ticket = db.query(SupportTicket).filter(
+    ticket = (await db.scalars(select(SupportTicket).filter(
         SupportTicket.id == ticket_id,
         SupportTicket.user_id == current_user.id
-    ).first()
+    ))).first()
     
     if not ticket:
         raise HTTPException(status_code=404, detail="Ticket not found")
@@ -173,13 +173,10 @@ async def get_ticket_details(
 async def send_chat_message(
     chat_data: ChatMessageCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Send a chat message and get bot response"""
     try:
-        # Ensure tables exist
-        Base.metadata.create_all(bind=db.bind)
-        
         # Save user message
         user_message = ChatMessage(
             user_id=current_user.id,
@@ -201,7 +198,7 @@ async def send_chat_message(
         )
         db.add(bot_message)
         
-        db.commit()
+        await db.commit()
         
         return {
             "reply": bot_reply,
@@ -209,7 +206,7 @@ async def send_chat_message(
             "timestamp": datetime.now()
         }
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         print(f"Error in chat: {e}")
         # Return a fallback response instead of raising an exception
         return {
@@ -222,17 +219,14 @@ async def send_chat_message(
 async def get_chat_history(
     conversation_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get chat history for a conversation"""
     try:
-        # Ensure tables exist
-        Base.metadata.create_all(bind=db.bind)
-        
-        messages = db.query(ChatMessage).filter(
+        messages = (await db.scalars(select(ChatMessage).filter(
             ChatMessage.conversation_id == conversation_id,
             ChatMessage.user_id == current_user.id
-        ).order_by(ChatMessage.created_at.asc()).all()
+        ).order_by(ChatMessage.created_at.asc()))).all()
         
         return [
             {
@@ -288,15 +282,15 @@ def generate_bot_response(user_message: str) -> str:
 @router.get("/admin/tickets")
 async def get_all_tickets(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all support tickets (admin only)"""
     if getattr(current_user, 'role', 'user') != 'admin':
         raise HTTPException(status_code=403, detail="Admin access required")
     
-    tickets = db.query(SupportTicket).order_by(
+    tickets = (await db.scalars(select(SupportTicket).order_by(
         SupportTicket.created_at.desc()
-    ).all()
+    ))).all()
     
     return [
         {
@@ -316,17 +310,17 @@ async def update_ticket_status(
     ticket_id: int,
     status: TicketStatus,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update ticket status (admin only)"""
     if getattr(current_user, 'role', 'user') != 'admin':
         raise HTTPException(status_code=403, detail="Admin access required")
     
-    ticket = db.query(SupportTicket).filter(SupportTicket.id == ticket_id).first()
+    ticket = await db.get(SupportTicket, ticket_id)
     if not ticket:
         raise HTTPException(status_code=404, detail="Ticket not found")
     
     ticket.status = status.value
-    db.commit()
+    await db.commit()
     
     return {"message": f"Ticket status updated to {status.value}"}
\ No newline at end of file
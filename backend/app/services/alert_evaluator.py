@@ -0,0 +1,208 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Dict, Iterable, List, Set, Tuple
+from sqlalchemy import and_, event, insert, or_, select
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal
+from app.models.account import Account, AccountType
+from app.models.alert import Alert, AlertType
+from app.models.budget import Budget
+from app.services.rollup_service import RollupDeltas
+
+logger = logging.getLogger(__name__)
+
+# Transaction writes record on the session which accounts and budget months
+# they touched. After commit that scope is handed to a small worker pool,
+# which checks budget thresholds and balances and inserts any new alerts in
+# one batch. Work waiting for a worker is merged per user, so an import that
+# commits many batches is evaluated a few times rather than once per batch,
+# and the request that wrote never waits for it.
+
+# Percent of the limit, highest first; only the highest one crossed is reported
+BUDGET_THRESHOLDS = (100, 80)
+# Balances on these accounts are amounts owed, so a low value is not a warning
+_NO_LOW_BALANCE = (AccountType.credit_card, AccountType.loan)
+
+_executor = ThreadPoolExecutor(max_workers=settings.ALERT_WORKERS, thread_name_prefix="alert-eval")
+_lock = threading.Lock()
+# user_id -> {"accounts": set, "months": set} waiting for a worker
+_pending: Dict[int, dict] = {}
+_stats = {"scheduled": 0, "coalesced": 0, "dropped": 0, "evaluated": 0, "failed": 0, "alerts_created": 0}
+
+
+def track_transaction_writes(db: Session, deltas: RollupDeltas):
+    """Record the accounts and months touched by `deltas` for evaluation once `db` commits"""
+    scope = db.info.setdefault("alert_scope", {})
+    for (user_id, account_id, day, _, _), (amount, count) in deltas.items():
+        if not (amount or count):
+            continue
+        entry = scope.setdefault(user_id, {"accounts": set(), "months": set()})
+        entry["accounts"].add(account_id)
+        entry["months"].add((day.year, day.month))
+
+
+def _schedule(user_id: int, scope: dict):
+    with _lock:
+        queued = _pending.get(user_id)
+        if queued is not None:
+            queued["accounts"] |= scope["accounts"]
+            queued["months"] |= scope["months"]
+            _stats["coalesced"] += 1
+            return
+        if len(_pending) >= settings.ALERT_MAX_PENDING_USERS:
+            # The next write for this user evaluates the same conditions again
+            _stats["dropped"] += 1
+            return
+        _pending[user_id] = scope
+        _stats["scheduled"] += 1
+    _executor.submit(_run, user_id)
+
+
+def _run(user_id: int):
+    # Taken off the queue before evaluating, so writes committed meanwhile schedule a fresh pass
+    with _lock:
+        scope = _pending.pop(user_id, None)
+    if scope is None:
+        return
+    db = SessionLocal()
+    try:
+        created = evaluate_alerts(db, user_id, scope["accounts"], scope["months"])
+        with _lock:
+            _stats["evaluated"] += 1
+            _stats["alerts_created"] += created
+    except Exception as e:
+        db.rollback()
+        with _lock:
+            _stats["failed"] += 1
+        logger.error(f"ALERT EVALUATION ERROR for user {user_id}: {e}")
+    finally:
+        db.close()
+
+
+def _budget_alerts(db: Session, user_id: int, months: Set[Tuple[int, int]]) -> Dict[str, tuple]:
+    budgets = db.query(Budget).filter(
+        Budget.user_id == user_id,
+        or_(*[and_(Budget.year == year, Budget.month == month) for year, month in months])
+    ).all()
+
+    alerts = {}
+    for budget in budgets:
+        limit = Decimal(str(budget.limit_amount or 0))
+        if limit <= 0:
+            continue
+        spent = Decimal(str(budget.spent_amount or 0))
+        used = spent / limit * 100
+        for threshold in BUDGET_THRESHOLDS:
+            if used < threshold:
+                continue
+            if threshold >= 100:
+                message = f"You've exceeded your '{budget.name}' budget! You've spent ₹{spent:.2f} of ₹{limit:.2f}"
+            else:
+                message = f"You've used {used:.0f}% of your '{budget.name}' budget (₹{spent:.2f} / ₹{limit:.2f})"
+            alerts[f"budget:{budget.id}:{threshold}"] = (AlertType.budget_exceeded, message)
+            break
+    return alerts
+
+
+def _low_balance_alerts(db: Session, user_id: int, account_ids: Iterable[int]) -> Dict[str, tuple]:
+    threshold = Decimal(str(settings.LOW_BALANCE_THRESHOLD))
+    accounts = db.query(Account).filter(
+        Account.id.in_(list(account_ids)),
+        Account.user_id == user_id,
+        Account.is_active == True,
+        Account.account_type.notin_(_NO_LOW_BALANCE),
+        Account.balance < threshold
+    ).all()
+
+    # At most one low-balance alert per account per day
+    today = datetime.now(timezone.utc).date().isoformat()
+    return {
+        f"low_balance:{account.id}:{today}": (
+            AlertType.low_balance,
+            f"Low balance: {account.name or account.masked_account or 'your account'} has "
+            f"₹{Decimal(str(account.balance)):.2f}, below ₹{threshold:.2f}"
+        )
+        for account in accounts
+    }
+
+
+def _insert_ignoring_duplicates(db: Session):
+    dialect = db.bind.dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as upsert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as upsert
+    else:
+        return insert(Alert)
+    # Another worker may have inserted the same key since we looked
+    return upsert(Alert).on_conflict_do_nothing(index_elements=["user_id", "dedup_key"])
+
+
+def insert_alerts(db: Session, alerts: List[dict]) -> int:
+    """
+    Insert alerts ({user_id, type, message, dedup_key}) whose (user_id,
+    dedup_key) has not been reported yet, in one batch and in the caller's
+    transaction. Returns the number inserted.
+    """
+    if not alerts:
+        return 0
+    reported = set(db.execute(
+        select(Alert.user_id, Alert.dedup_key).where(
+            Alert.user_id.in_({alert["user_id"] for alert in alerts}),
+            Alert.dedup_key.in_({alert["dedup_key"] for alert in alerts})
+        )
+    ).all())
+    rows = [
+        dict(alert, is_read=False) for alert in alerts
+        if (alert["user_id"], alert["dedup_key"]) not in reported
+    ]
+    if rows:
+        db.execute(_insert_ignoring_duplicates(db), rows)
+    return len(rows)
+
+
+def evaluate_alerts(db: Session, user_id: int, account_ids: Iterable[int], months: Iterable[Tuple[int, int]]) -> int:
+    """
+    Check the budgets of `months` and the balances of `account_ids` for one
+    user and insert an alert for every condition not already reported.
+    Returns the number of alerts created.
+    """
+    months, account_ids = set(months), set(account_ids)
+    candidates: Dict[str, tuple] = {}
+    if months:
+        candidates.update(_budget_alerts(db, user_id, months))
+    if account_ids:
+        candidates.update(_low_balance_alerts(db, user_id, account_ids))
+    if not candidates:
+        return 0
+
+    created = insert_alerts(db, [
+        {"user_id": user_id, "type": alert_type, "message": message, "dedup_key": key}
+        for key, (alert_type, message) in candidates.items()
+    ])
+    if created:
+        db.commit()
+    return created
+
+
+def evaluator_stats() -> dict:
+    with _lock:
+        return dict(_stats, pending=len(_pending), workers=settings.ALERT_WORKERS)
+
+
+@event.listens_for(Session, "after_commit")
+def _evaluate_after_commit(session):
+    scope = session.info.pop("alert_scope", None)
+    if not scope:
+        return
+    for user_id, entry in scope.items():
+        _schedule(user_id, entry)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session):
+    session.info.pop("alert_scope", None)
@@ -0,0 +1,251 @@
+import logging
+import threading
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Iterator, List, Optional
+from sqlalchemy import func, or_, tuple_, update
+from sqlalchemy.orm import Query, Session
+from app.config import settings
+from app.database import SessionLocal, try_advisory_lock
+from app.models.account import Account, AccountType
+from app.models.alert import AlertType
+from app.models.bill import Bill, BillStatus
+from app.services.alert_evaluator import insert_alerts
+from app.transactions.csv_import import apply_balance_deltas, insert_batch
+
+logger = logging.getLogger(__name__)
+
+# Every BILL_SCHEDULER_INTERVAL_SECONDS one process (the holder of the
+# advisory lock) walks due bills through the (due_date, status) index in
+# batches: autopay bills due today or earlier are debited as transactions,
+# unpaid bills past their due date become overdue, and bills due within
+# BILL_REMINDER_DAYS get a bill_due reminder. Each batch is one transaction.
+
+_ADVISORY_LOCK_KEY = 72164003
+BILL_CATEGORY = "Bills & Utilities"
+# Autopay debits come from the user's first active funds account, never a card or loan
+_NO_AUTOPAY = (AccountType.credit_card, AccountType.loan)
+# Bills written before status had a default count as upcoming
+_UNPAID = or_(Bill.status == BillStatus.upcoming, Bill.status.is_(None))
+
+_stop = threading.Event()
+_thread: Optional[threading.Thread] = None
+_last_run: dict = {}
+
+
+def _batches(query: Query, lock: bool = True) -> Iterator[List[Bill]]:
+    """
+    Walk `query` in (due_date, id) order, one batch at a time. With `lock`,
+    each batch is locked FOR UPDATE and rows another transaction holds are
+    skipped until the next run. The caller commits between batches.
+    """
+    last = None
+    while True:
+        page = query
+        if last is not None:
+            page = page.filter(tuple_(Bill.due_date, Bill.id) > tuple_(*last))
+        page = page.order_by(Bill.due_date, Bill.id).limit(settings.BILL_SCHEDULER_BATCH_SIZE)
+        if lock:
+            page = page.with_for_update(skip_locked=True)
+        bills = page.all()
+        if not bills:
+            return
+        last = (bills[-1].due_date, bills[-1].id)
+        yield bills
+        if len(bills) < settings.BILL_SCHEDULER_BATCH_SIZE:
+            return
+
+
+def _pay_autopay_bills(db: Session, today: date) -> int:
+    query = db.query(Bill).filter(
+        Bill.auto_pay == True,
+        Bill.due_date <= today,
+        or_(Bill.status != BillStatus.paid, Bill.status.is_(None))
+    )
+    paid = 0
+    for bills in _batches(query):
+        funding = dict(
+            db.query(Account.user_id, func.min(Account.id))
+            .filter(
+                Account.user_id.in_({bill.user_id for bill in bills}),
+                Account.is_active == True,
+                Account.account_type.notin_(_NO_AUTOPAY)
+            )
+            .group_by(Account.user_id)
+            .all()
+        )
+        # Bills of users without an account stay unpaid and go overdue
+        payable = [bill for bill in bills if bill.user_id in funding]
+        if not payable:
+            db.rollback()
+            continue
+
+        now = datetime.now(timezone.utc)
+        rows = [
+            {
+                "user_id": bill.user_id,
+                "account_id": funding[bill.user_id],
+                "amount": Decimal(str(bill.amount_due)),
+                "txn_type": "debit",
+                "description": f"Autopay: {bill.biller_name}",
+                "category": BILL_CATEGORY,
+                "merchant": bill.biller_name,
+                "txn_date": now
+            }
+            for bill in payable
+        ]
+        # Same write path as CSV imports: bulk insert, rollups, budgets, alert checks, one UPDATE per account
+        apply_balance_deltas(db, insert_batch(db, rows))
+        db.execute(
+            update(Bill)
+            .where(Bill.id.in_([bill.id for bill in payable]))
+            .values(status=BillStatus.paid)
+            .execution_options(synchronize_session=False)
+        )
+        insert_alerts(db, [
+            {
+                "user_id": bill.user_id,
+                "type": AlertType.bill_due,
+                "message": f"Paid ₹{Decimal(str(bill.amount_due)):.2f} to {bill.biller_name} by autopay",
+                "dedup_key": f"bill_paid:{bill.id}:{bill.due_date.isoformat()}"
+            }
+            for bill in payable
+        ])
+        db.commit()
+        paid += len(payable)
+    return paid
+
+
+def _mark_overdue(db: Session, today: date) -> int:
+    query = db.query(Bill).filter(Bill.due_date < today, _UNPAID)
+    overdue = 0
+    for bills in _batches(query):
+        db.execute(
+            update(Bill)
+            .where(Bill.id.in_([bill.id for bill in bills]))
+            .values(status=BillStatus.overdue)
+            .execution_options(synchronize_session=False)
+        )
+        insert_alerts(db, [
+            {
+                "user_id": bill.user_id,
+                "type": AlertType.bill_due,
+                "message": f"{bill.biller_name} bill of ₹{Decimal(str(bill.amount_due)):.2f} was due on {bill.due_date.isoformat()} and is overdue",
+                "dedup_key": f"bill_overdue:{bill.id}:{bill.due_date.isoformat()}"
+            }
+            for bill in bills
+        ])
+        db.commit()
+        overdue += len(bills)
+    return overdue
+
+
+def _reminder(bill: Bill, today: date) -> dict:
+    days_left = (bill.due_date - today).days
+    when = "today" if days_left == 0 else "tomorrow" if days_left == 1 else f"in {days_left} days"
+    action = "will be paid by autopay" if bill.auto_pay else "is due"
+    return {
+        "user_id": bill.user_id,
+        "type": AlertType.bill_due,
+        "message": f"{bill.biller_name} bill of ₹{Decimal(str(bill.amount_due)):.2f} {action} {when}",
+        "dedup_key": f"bill_due:{bill.id}:{bill.due_date.isoformat()}"
+    }
+
+
+def _reminder_query(db: Session, today: date) -> Query:
+    return db.query(Bill).filter(
+        Bill.due_date >= today,
+        Bill.due_date <= today + timedelta(days=settings.BILL_REMINDER_DAYS),
+        _UNPAID
+    )
+
+
+def _send_reminders(db: Session, today: date) -> int:
+    sent = 0
+    for bills in _batches(_reminder_query(db, today), lock=False):
+        sent += insert_alerts(db, [_reminder(bill, today) for bill in bills])
+        db.commit()
+    return sent
+
+
+def remind_user_bills(db: Session, user_id: int, today: Optional[date] = None) -> dict:
+    """Reminders for one user's unpaid bills due within BILL_REMINDER_DAYS, recording any not yet sent"""
+    today = today or datetime.now(timezone.utc).date()
+    bills = _reminder_query(db, today).filter(Bill.user_id == user_id).order_by(Bill.due_date, Bill.id).all()
+    created = insert_alerts(db, [_reminder(bill, today) for bill in bills])
+    if created:
+        db.commit()
+    return {
+        "reminders": [
+            {
+                "id": bill.id,
+                "name": bill.biller_name,
+                "amount": float(bill.amount_due),
+                "dueDate": bill.due_date.isoformat(),
+                "daysLeft": (bill.due_date - today).days,
+                "autoPay": bool(bill.auto_pay)
+            } for bill in bills
+        ],
+        "count": len(bills),
+        "alerts_created": created
+    }
+
+
+def run_bill_scheduler(today: Optional[date] = None) -> Optional[dict]:
+    """
+    One scheduler pass. Returns how many bills were paid, marked overdue and
+    reminded, or None when another process holds the scheduler lock.
+    """
+    today = today or datetime.now(timezone.utc).date()
+    with try_advisory_lock(_ADVISORY_LOCK_KEY) as acquired:
+        if not acquired:
+            return None
+        db = SessionLocal()
+        try:
+            result = {
+                "paid": _pay_autopay_bills(db, today),
+                "overdue": _mark_overdue(db, today),
+                "reminded": _send_reminders(db, today)
+            }
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+    _last_run.update(result, finished_at=datetime.now(timezone.utc).isoformat())
+    return result
+
+
+def scheduler_stats() -> dict:
+    return {
+        "enabled": _thread is not None and _thread.is_alive(),
+        "interval_seconds": settings.BILL_SCHEDULER_INTERVAL_SECONDS,
+        "batch_size": settings.BILL_SCHEDULER_BATCH_SIZE,
+        "reminder_days": settings.BILL_REMINDER_DAYS,
+        "last_run": dict(_last_run) or None
+    }
+
+
+def _run(interval: float):
+    while not _stop.wait(interval):
+        try:
+            result = run_bill_scheduler()
+            if result and any(result.values()):
+                logger.info(f"Bill scheduler: {result}")
+        except Exception as e:
+            logger.error(f"Bill scheduler failed: {e}")
+
+
+def start_bill_scheduler():
+    """Run the scheduler every BILL_SCHEDULER_INTERVAL_SECONDS on a daemon thread"""
+    global _thread
+    interval = settings.BILL_SCHEDULER_INTERVAL_SECONDS
+    if interval <= 0 or (_thread is not None and _thread.is_alive()):
+        return
+    _stop.clear()
+    _thread = threading.Thread(target=_run, args=(interval,), name="bill-scheduler", daemon=True)
+    _thread.start()
+
+
+def stop_bill_scheduler():
+    _stop.set()
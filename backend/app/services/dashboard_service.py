@@ -0,0 +1,180 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from sqlalchemy.orm import Session
+from sqlalchemy import event, select, func, case, true
+from typing import Any, Callable, Dict
+from datetime import date, datetime
+from app.config import settings
+from app.database import SessionLocal
+from app.models.account import Account
+from app.models.transaction import Transaction
+from app.models.budget import Budget
+from app.models.user import User, KYCStatus
+from app.utils.cache import TTLCache, VersionCounter, user_write_versions
+
+# Dashboard stats are the first call after every login; a short TTL absorbs
+# repeated loads, and the per-user write version drops entries on new transactions.
+_stats_cache = TTLCache(maxsize=10000, ttl=settings.DASHBOARD_STATS_TTL_SECONDS)
+# Account and budget writes change the counts and balance in the stats too
+_dashboard_versions = VersionCounter()
+# One entry shared by every admin; polling dashboards hit the database at most once per TTL
+_system_cache = TTLCache(maxsize=1, ttl=settings.SYSTEM_SUMMARY_TTL_SECONDS)
+
+logger = logging.getLogger(__name__)
+
+# Shared by every bundle request so concurrent page loads cannot open more
+# than DASHBOARD_BUNDLE_WORKERS extra DB sessions between them.
+_bundle_executor = ThreadPoolExecutor(max_workers=settings.DASHBOARD_BUNDLE_WORKERS, thread_name_prefix="dashboard")
+
+
+class DashboardService:
+
+    @staticmethod
+    def compute_stats(db: Session, user_id: int, today: date = None) -> dict:
+        """Account count, balance, month income/expenses and active budgets in one statement"""
+        today = today or date.today()
+        month_start = datetime(today.year, today.month, 1)
+        next_month = datetime(today.year + (today.month // 12), today.month % 12 + 1, 1)
+
+        accounts = select(
+            func.count(Account.id).label("total_accounts"),
+            func.coalesce(func.sum(Account.balance), 0).label("total_balance")
+        ).where(Account.user_id == user_id).subquery()
+
+        month = select(
+            func.coalesce(func.sum(case((Transaction.txn_type == 'credit', Transaction.amount), else_=0)), 0).label("income"),
+            func.coalesce(func.sum(case((Transaction.txn_type == 'debit', Transaction.amount), else_=0)), 0).label("expenses")
+        ).where(
+            Transaction.user_id == user_id,
+            Transaction.txn_date >= month_start,
+            Transaction.txn_date < next_month
+        ).subquery()
+
+        budgets = select(
+            func.count(Budget.id).label("active_budgets")
+        ).where(
+            Budget.user_id == user_id,
+            Budget.month == today.month,
+            Budget.year == today.year
+        ).subquery()
+
+        row = db.execute(
+            select(
+                accounts.c.total_accounts, accounts.c.total_balance,
+                month.c.income, month.c.expenses, budgets.c.active_budgets
+            ).select_from(accounts.join(month, true()).join(budgets, true()))
+        ).one()
+
+        income = float(row.income)
+        expenses = float(row.expenses)
+        return {
+            "total_accounts": row.total_accounts,
+            "total_balance": float(row.total_balance),
+            "income_this_month": income,
+            "expenses_this_month": expenses,
+            "net_this_month": income - expenses,
+            "active_budgets": row.active_budgets
+        }
+
+    @staticmethod
+    def get_stats(db: Session, user_id: int) -> dict:
+        key = (user_id, user_write_versions.get(user_id), _dashboard_versions.get(user_id), date.today())
+        return _stats_cache.get_or_set(key, lambda: DashboardService.compute_stats(db, user_id))
+
+    @staticmethod
+    def compute_system_summary(db: Session) -> dict:
+        """System-wide user, account and transaction counts in one statement"""
+        users = select(
+            func.count().label("total_users"),
+            func.count().filter(User.is_active == True).label("active_users"),
+            func.count().filter(User.kyc_status == KYCStatus.unverified).label("pending_kyc"),
+            func.count().filter(User.kyc_status == KYCStatus.verified).label("verified_kyc")
+        ).select_from(User).subquery()
+        accounts = select(func.count().label("total_accounts")).select_from(Account).subquery()
+        transactions = select(func.count().label("total_transactions")).select_from(Transaction).subquery()
+
+        row = db.execute(
+            select(users, accounts.c.total_accounts, transactions.c.total_transactions)
+            .select_from(users.join(accounts, true()).join(transactions, true()))
+        ).one()
+
+        return {
+            "total_users": row.total_users,
+            "active_users": row.active_users,
+            "total_accounts": row.total_accounts,
+            "total_transactions": row.total_transactions,
+            "pending_kyc": row.pending_kyc,
+            "verified_kyc": row.verified_kyc
+        }
+
+    @staticmethod
+    def get_system_summary(db: Session) -> dict:
+        return _system_cache.get_or_set("summary", lambda: DashboardService.compute_system_summary(db))
+
+    @staticmethod
+    def _run_section(loader: Callable[[Session], Any]) -> Dict[str, Any]:
+        # Sessions are not thread-safe, so every section gets its own
+        started = time.perf_counter()
+        db = SessionLocal()
+        try:
+            return {"ok": True, "data": loader(db), "ms": round((time.perf_counter() - started) * 1000, 2)}
+        except Exception as e:
+            db.rollback()
+            logger.error(f"DASHBOARD SECTION ERROR: {str(e)}")
+            detail = getattr(e, "detail", None) or str(e)
+            return {"ok": False, "error": detail, "ms": round((time.perf_counter() - started) * 1000, 2)}
+        finally:
+            db.close()
+
+    @staticmethod
+    def gather_sections(loaders: Dict[str, Callable[[Session], Any]], timeout: float = None) -> dict:
+        """
+        Run section loaders concurrently on the bundle pool. A failing or slow
+        section is reported under `errors` without failing the others.
+        """
+        timeout = settings.DASHBOARD_SECTION_TIMEOUT_SECONDS if timeout is None else timeout
+        started = time.perf_counter()
+        futures = {name: _bundle_executor.submit(DashboardService._run_section, loader) for name, loader in loaders.items()}
+        wait(futures.values(), timeout=timeout)
+
+        sections, timings, errors = {}, {}, {}
+        for name, future in futures.items():
+            if not future.done():
+                # The thread cannot be interrupted; it finishes and closes its session on its own
+                sections[name] = None
+                errors[name] = "timeout"
+                timings[name] = round(timeout * 1000, 2)
+                continue
+            result = future.result()
+            timings[name] = result["ms"]
+            if result["ok"]:
+                sections[name] = result["data"]
+            else:
+                sections[name] = None
+                errors[name] = result["error"]
+
+        return {
+            **sections,
+            "timings_ms": dict(timings, total=round((time.perf_counter() - started) * 1000, 2)),
+            "errors": errors
+        }
+
+
+@event.listens_for(Session, "before_flush")
+def _track_dashboard_writes(session, flush_context, instances):
+    touched = session.info.setdefault("dashboard_touched", set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, (Account, Budget)) and obj.user_id is not None:
+            touched.add(obj.user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    for user_id in session.info.pop("dashboard_touched", ()):
+        _dashboard_versions.bump(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session):
+    session.info.pop("dashboard_touched", None)
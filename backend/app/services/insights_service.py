@@ -0,0 +1,235 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func, case, desc, event
+from fastapi import HTTPException
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from datetime import date, datetime, timedelta, time
+import calendar
+from app.models.transaction import Transaction
+from app.models.daily_rollup import DailyRollup
+from app.utils.cache import TTLCache, VersionCounter, user_write_versions
+
+# Closed months only change when a backdated write lands in them. Their
+# buckets are keyed by a version per (user, year, month), read before the
+# query and bumped only for the months a write touched, so a result computed
+# before a write can never be stored where later reads find it and writes to
+# the current month leave closed buckets alone. The TTL bounds staleness from
+# writes handled by other processes, whose bumps this one never sees.
+_month_cache = TTLCache(maxsize=20000, ttl=3600)
+_month_versions = VersionCounter()
+# Endpoint results are keyed by a per-user version that every committed
+# transaction write bumps, so stale results simply stop being addressed.
+_result_cache = TTLCache(maxsize=4096, ttl=300)
+
+
+def parse_date_window(start_date: Optional[str], end_date: Optional[str]) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """
+    Parse ISO start/end query params into a half-open [start, end) window.
+    A bare date as end_date includes that whole day.
+    """
+    try:
+        start = datetime.fromisoformat(start_date) if start_date else None
+        end = None
+        if end_date:
+            end = datetime.fromisoformat(end_date)
+            if len(end_date) <= 10:
+                end += timedelta(days=1)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Dates must be ISO formatted (YYYY-MM-DD)")
+    return start, end
+
+
+def _shift_month(year: int, month: int, delta: int) -> Tuple[int, int]:
+    index = year * 12 + (month - 1) + delta
+    return index // 12, index % 12 + 1
+
+
+class InsightsService:
+
+    @staticmethod
+    def _filters(user_id: int, start: Optional[datetime], end: Optional[datetime]) -> list:
+        filters = [Transaction.user_id == user_id]
+        if start:
+            filters.append(Transaction.txn_date >= start)
+        if end:
+            filters.append(Transaction.txn_date < end)
+        return filters
+
+    @staticmethod
+    def _rollup_filters(user_id: int, start: Optional[datetime], end: Optional[datetime]) -> list:
+        filters = [DailyRollup.user_id == user_id]
+        if start:
+            filters.append(DailyRollup.day >= start.date())
+        if end:
+            filters.append(DailyRollup.day < end.date())
+        return filters
+
+    @staticmethod
+    def _day_aligned(*values: Optional[datetime]) -> bool:
+        """Whole-day windows can be answered from daily_rollups instead of transactions"""
+        return all(v is None or (v.tzinfo is None and v.time() == time(0)) for v in values)
+
+    @staticmethod
+    def get_summary(db: Session, user_id: int, start: Optional[datetime] = None, end: Optional[datetime] = None) -> dict:
+        """Income, expenses, count and top spending category in two aggregate queries"""
+        if InsightsService._day_aligned(start, end):
+            filters = InsightsService._rollup_filters(user_id, start, end)
+            amount, count_col, txn_type, category = (
+                DailyRollup.total_amount, func.sum(DailyRollup.txn_count),
+                DailyRollup.txn_type, DailyRollup.category
+            )
+            model = DailyRollup
+        else:
+            filters = InsightsService._filters(user_id, start, end)
+            amount, count_col, txn_type, category = (
+                Transaction.amount, func.count(Transaction.id),
+                Transaction.txn_type, Transaction.category
+            )
+            model = Transaction
+
+        income, expenses, count = db.query(
+            func.coalesce(func.sum(case((txn_type == 'credit', amount), else_=0)), 0),
+            func.coalesce(func.sum(case((txn_type == 'debit', amount), else_=0)), 0),
+            func.coalesce(count_col, 0)
+        ).select_from(model).filter(*filters).one()
+
+        top = db.query(category).filter(
+            *filters,
+            txn_type == 'debit',
+            category.isnot(None),
+            category != ''
+        ).group_by(category).order_by(desc(func.sum(amount))).first()
+
+        income = float(income)
+        expenses = float(expenses)
+        net_savings = income - expenses
+        return {
+            "income": income,
+            "expenses": expenses,
+            "net_flow": net_savings,
+            "savings_rate": (net_savings / income * 100) if income > 0 else 0,
+            "top_category": top[0] if top else "None",
+            "transactions_count": int(count)
+        }
+
+    @staticmethod
+    def get_top_merchants(
+        db: Session,
+        user_id: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: int = 5
+    ) -> List[dict]:
+        total = func.sum(Transaction.amount)
+        rows = db.query(
+            Transaction.merchant, total.label("total_spent"), func.count(Transaction.id)
+        ).filter(
+            *InsightsService._filters(user_id, start, end),
+            Transaction.txn_type == 'debit',
+            Transaction.merchant.isnot(None),
+            Transaction.merchant != ''
+        ).group_by(Transaction.merchant).order_by(desc(total)).limit(limit).all()
+
+        return [
+            {"merchant": merchant, "total_spent": float(amount), "transaction_count": count}
+            for merchant, amount, count in rows
+        ]
+
+    @staticmethod
+    def get_total_spent(db: Session, user_id: int, start: Optional[datetime] = None, end: Optional[datetime] = None) -> float:
+        spent = db.query(func.coalesce(func.sum(Transaction.amount), 0)).filter(
+            *InsightsService._filters(user_id, start, end),
+            Transaction.txn_type == 'debit'
+        ).scalar()
+        return float(spent)
+
+    @staticmethod
+    def cached(user_id: int, endpoint: str, params: tuple, compute: Callable[[], Any]) -> Any:
+        """Serve an endpoint result from the per-user cache, computing it on a miss"""
+        version = user_write_versions.get(user_id)
+        return _result_cache.get_or_set((user_id, version, endpoint, params), compute)
+
+    @staticmethod
+    def invalidate_user(user_id: int, months: Iterable[Tuple[int, int]] = ()):
+        """Forget a user's cached results, and the month buckets touched by a write"""
+        user_write_versions.bump(user_id)
+        for year, month in months:
+            _month_versions.bump((user_id, year, month))
+
+    @staticmethod
+    def get_month_buckets(db: Session, user_id: int, months: int, today: Optional[date] = None) -> List[dict]:
+        """
+        Per-month income, expenses and debit totals by category for the last
+        `months` months (oldest first, current month last). Closed months come
+        from the bucket cache; the current month and any uncached months are
+        folded from daily_rollups in a single query.
+        """
+        today = today or datetime.utcnow().date()
+        wanted = [_shift_month(today.year, today.month, -i) for i in range(months - 1, -1, -1)]
+        current = (today.year, today.month)
+        keys = {ym: (user_id,) + ym + (_month_versions.get((user_id,) + ym),) for ym in wanted}
+
+        buckets: Dict[Tuple[int, int], dict] = {}
+        missing = []
+        for ym in wanted:
+            cached = _month_cache.get(keys[ym]) if ym != current else None
+            if cached is not None:
+                buckets[ym] = cached
+            else:
+                missing.append(ym)
+
+        if missing:
+            first, last = missing[0], missing[-1]
+            start = date(first[0], first[1], 1)
+            end_year, end_month = _shift_month(last[0], last[1], 1)
+            end = date(end_year, end_month, 1)
+
+            fresh = {ym: {"income": 0.0, "expenses": 0.0, "count": 0, "categories": {}} for ym in missing}
+            rows = db.query(
+                DailyRollup.day, DailyRollup.txn_type, DailyRollup.category,
+                func.sum(DailyRollup.total_amount), func.sum(DailyRollup.txn_count)
+            ).filter(
+                DailyRollup.user_id == user_id,
+                DailyRollup.day >= start,
+                DailyRollup.day < end
+            ).group_by(DailyRollup.day, DailyRollup.txn_type, DailyRollup.category).all()
+
+            for day, txn_type, category, amount, count in rows:
+                bucket = fresh.get((day.year, day.month))
+                if bucket is None:
+                    continue
+                amount = float(amount or 0)
+                bucket["count"] += int(count or 0)
+                if txn_type == 'credit':
+                    bucket["income"] += amount
+                else:
+                    bucket["expenses"] += amount
+                    label = category or "Uncategorized"
+                    bucket["categories"][label] = bucket["categories"].get(label, 0.0) + amount
+
+            for ym, bucket in fresh.items():
+                buckets[ym] = bucket
+                if ym != current:
+                    _month_cache.set(keys[ym], bucket)
+
+        return [
+            dict(buckets[ym], year=ym[0], month=ym[1], label=f"{calendar.month_name[ym[1]]} {ym[0]}")
+            for ym in wanted
+        ]
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    # RollupService records the (user, year, month) of every write it applies
+    touched = session.info.pop("rollup_touched", None)
+    if not touched:
+        return
+    by_user: Dict[int, set] = {}
+    for user_id, year, month in touched:
+        by_user.setdefault(user_id, set()).add((year, month))
+    for user_id, months in by_user.items():
+        InsightsService.invalidate_user(user_id, months)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session):
+    session.info.pop("rollup_touched", None)
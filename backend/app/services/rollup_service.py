@@ -0,0 +1,172 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func, select, delete, insert, and_, or_
+from typing import Dict, Iterable, Optional, Tuple
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from app.models.daily_rollup import DailyRollup
+from app.models.transaction import Transaction, TxnType
+
+# (user_id, account_id, day, category, txn_type) -> [amount, count]
+RollupKey = Tuple[int, int, date, str, str]
+RollupDeltas = Dict[RollupKey, list]
+
+UPSERT_CHUNK_SIZE = 500
+
+
+def _day(value: Optional[datetime]) -> date:
+    if value is None:
+        return datetime.now(timezone.utc).date()
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)
+        return value.date()
+    return value
+
+
+def _type_value(txn_type) -> str:
+    return txn_type.value if isinstance(txn_type, TxnType) else TxnType(str(txn_type).lower()).value
+
+
+class RollupService:
+
+    @staticmethod
+    def add(
+        deltas: RollupDeltas,
+        user_id: int,
+        account_id: int,
+        txn_date,
+        category: Optional[str],
+        txn_type,
+        amount,
+        sign: int = 1
+    ) -> RollupDeltas:
+        """Accumulate one transaction (sign=1) or its reversal (sign=-1) into `deltas`"""
+        key = (user_id, account_id, _day(txn_date), category or "", _type_value(txn_type))
+        entry = deltas.setdefault(key, [Decimal("0"), 0])
+        entry[0] += Decimal(str(amount)) * sign
+        entry[1] += sign
+        return deltas
+
+    @staticmethod
+    def add_transaction(deltas: RollupDeltas, transaction: Transaction, sign: int = 1) -> RollupDeltas:
+        return RollupService.add(
+            deltas, transaction.user_id, transaction.account_id, transaction.txn_date,
+            transaction.category, transaction.txn_type, transaction.amount, sign
+        )
+
+    @staticmethod
+    def deltas_for_rows(rows: Iterable[dict]) -> RollupDeltas:
+        """Rollup deltas for bulk-insert parameter dicts as built by the CSV importer"""
+        deltas: RollupDeltas = {}
+        for row in rows:
+            RollupService.add(
+                deltas, row["user_id"], row["account_id"], row["txn_date"],
+                row.get("category"), row["txn_type"], row["amount"]
+            )
+        return deltas
+
+    @staticmethod
+    def apply(db: Session, deltas: RollupDeltas):
+        """
+        Upsert accumulated deltas in the caller's transaction. Rows whose
+        count drops to zero are removed so deletes leave no residue.
+        """
+        changes = [(key, value) for key, value in deltas.items() if value[0] or value[1]]
+        if not changes:
+            return
+
+        # Lets post-commit listeners (e.g. the insights cache) see what changed
+        db.info.setdefault("rollup_touched", set()).update(
+            (key[0], key[2].year, key[2].month) for key, _ in changes
+        )
+
+        dialect = db.bind.dialect.name
+        if dialect in ("postgresql", "sqlite"):
+            if dialect == "postgresql":
+                from sqlalchemy.dialects.postgresql import insert as upsert
+            else:
+                from sqlalchemy.dialects.sqlite import insert as upsert
+
+            for i in range(0, len(changes), UPSERT_CHUNK_SIZE):
+                chunk = changes[i:i + UPSERT_CHUNK_SIZE]
+                stmt = upsert(DailyRollup).values([
+                    {
+                        "user_id": key[0], "account_id": key[1], "day": key[2],
+                        "category": key[3], "txn_type": key[4],
+                        "total_amount": amount, "txn_count": count
+                    } for key, (amount, count) in chunk
+                ])
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=["user_id", "account_id", "day", "category", "txn_type"],
+                    set_={
+                        "total_amount": DailyRollup.total_amount + stmt.excluded.total_amount,
+                        "txn_count": DailyRollup.txn_count + stmt.excluded.txn_count,
+                    }
+                )
+                db.execute(stmt)
+        else:
+            for key, (amount, count) in changes:
+                row = db.get(DailyRollup, key)
+                if row:
+                    row.total_amount = Decimal(str(row.total_amount)) + amount
+                    row.txn_count += count
+                else:
+                    db.add(DailyRollup(
+                        user_id=key[0], account_id=key[1], day=key[2], category=key[3],
+                        txn_type=key[4], total_amount=amount, txn_count=count
+                    ))
+            db.flush()
+
+        emptied = [key for key, (_, count) in changes if count < 0]
+        if emptied:
+            db.execute(
+                delete(DailyRollup)
+                .where(
+                    DailyRollup.txn_count <= 0,
+                    or_(*[
+                        and_(
+                            DailyRollup.user_id == key[0], DailyRollup.account_id == key[1],
+                            DailyRollup.day == key[2], DailyRollup.category == key[3],
+                            DailyRollup.txn_type == key[4]
+                        ) for key in emptied
+                    ])
+                )
+                .execution_options(synchronize_session=False)
+            )
+
+    @staticmethod
+    def backfill(db: Session, user_id: Optional[int] = None) -> int:
+        """Rebuild rollups from the transactions table. Returns the number of rollup rows written"""
+        day = func.date(Transaction.txn_date)
+        category = func.coalesce(Transaction.category, "")
+        source = select(
+            Transaction.user_id,
+            Transaction.account_id,
+            day,
+            category,
+            Transaction.txn_type,
+            func.sum(Transaction.amount),
+            func.count(Transaction.id)
+        ).where(
+            Transaction.user_id.isnot(None),
+            Transaction.account_id.isnot(None)
+        ).group_by(Transaction.user_id, Transaction.account_id, day, category, Transaction.txn_type)
+
+        clear = delete(DailyRollup)
+        if user_id is not None:
+            source = source.where(Transaction.user_id == user_id)
+            clear = clear.where(DailyRollup.user_id == user_id)
+
+        db.execute(clear)
+        db.execute(
+            insert(DailyRollup).from_select(
+                ["user_id", "account_id", "day", "category", "txn_type", "total_amount", "txn_count"],
+                source
+            )
+        )
+        db.commit()
+
+        query = db.query(func.count()).select_from(DailyRollup)
+        if user_id is not None:
+            query = query.filter(DailyRollup.user_id == user_id)
+        return query.scalar()
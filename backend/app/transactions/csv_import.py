@@ -1,68 +1,159 @@
+import codecs
 import csv
-import io
 from datetime import datetime
-from decimal import Decimal
+from decimal import Decimal, InvalidOperation
+from typing import Dict, Iterator, List, Optional, Tuple
 from fastapi import HTTPException, UploadFile
+from sqlalchemy import insert, update
 from sqlalchemy.orm import Session
+from app.config import settings
 from app.models.transaction import Transaction
 from app.models.account import Account
+from app.services.rollup_service import RollupService
+from app.budgets.service import BudgetService
+from app.services.alert_evaluator import track_transaction_writes
 
+# Only the first MAX_REPORTED_ERRORS row errors are returned to the client so
+# that a badly formatted 1M-row file cannot grow the response without bound.
+MAX_REPORTED_ERRORS = 100
+
+
+def _parse_date(value: str) -> datetime:
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return datetime.strptime(value, '%Y-%m-%d')
+
+
+def parse_csv_row(row: Dict[str, str], account_id: int, user_id: int) -> dict:
+    """Turn one CSV row into insert parameters for the transactions table"""
+    # Expected CSV columns: date, amount, type, description, category
+    transaction_type = (row.get('type') or '').strip().lower()
+    if transaction_type not in ['credit', 'debit']:
+        raise ValueError(f"Invalid transaction type '{transaction_type}'")
+
+    try:
+        amount = Decimal(row['amount'])
+    except (InvalidOperation, TypeError):
+        raise ValueError(f"Invalid amount '{row.get('amount')}'")
+
+    return {
+        "user_id": user_id,
+        "account_id": account_id,
+        "amount": amount,
+        "txn_type": transaction_type,
+        "description": row.get('description', ''),
+        "category": row.get('category', ''),
+        "merchant": row.get('merchant', ''),
+        "txn_date": _parse_date(row['date'])
+    }
+
+
+def iter_csv_batches(
+    stream,
+    account_id: int,
+    user_id: int,
+    batch_size: int,
+    skip_rows: int = 0
+) -> Iterator[Tuple[List[dict], List[str], int]]:
+    """
+    Parse a text stream incrementally and yield (rows, errors, last_row_num)
+    for every `batch_size` parsed lines. Only one batch is held in memory at
+    a time. `skip_rows` data lines are consumed without parsing, which lets a
+    resumed import continue after its last committed batch.
+    """
+    reader = csv.DictReader(stream)
+    rows: List[dict] = []
+    errors: List[str] = []
+    row_num = 1
 
-def import_transactions_from_csv(file: UploadFile, account_id: int, db: Session):
-    if not file.filename.endswith('.csv'):
-        raise HTTPException(status_code=400, detail="File must be CSV format")
-    
-    content = file.file.read()
-    csv_data = io.StringIO(content.decode('utf-8'))
-    reader = csv.DictReader(csv_data)
-    
-    transactions_created = 0
-    errors = []
-    
     for row_num, row in enumerate(reader, start=2):
+        if row_num - 2 < skip_rows:
+            continue
         try:
-            # Expected CSV columns: date, amount, type, description, category
-            transaction_date = datetime.strptime(row['date'], '%Y-%m-%d')
-            amount = Decimal(row['amount'])
-            transaction_type = row['type'].lower()
-            
-            if transaction_type not in ['credit', 'debit']:
-                errors.append(f"Row {row_num}: Invalid transaction type '{transaction_type}'")
-                continue
-            
-            # Get account and user_id
-            account = db.query(Account).filter(Account.id == account_id).first()
-            if not account:
-                raise HTTPException(status_code=404, detail="Account not found")
-            
-            transaction = Transaction(
-                user_id=account.user_id,
-                account_id=account_id,
-                amount=amount,
-                txn_type=transaction_type,
-                description=row.get('description', ''),
-                category=row.get('category', ''),
-                merchant=row.get('merchant', ''),
-                txn_date=transaction_date
-            )
-            
-            db.add(transaction)
-            
-            # Update account balance
-            if transaction_type == "credit":
-                account.balance = Decimal(str(account.balance)) + amount
-            else:
-                account.balance = Decimal(str(account.balance)) - amount
-            
-            transactions_created += 1
-            
+            rows.append(parse_csv_row(row, account_id, user_id))
         except Exception as e:
             errors.append(f"Row {row_num}: {str(e)}")
-    
-    db.commit()
-    
+
+        if len(rows) + len(errors) >= batch_size:
+            yield rows, errors, row_num
+            rows, errors = [], []
+
+    if rows or errors:
+        yield rows, errors, row_num
+
+
+def insert_batch(db: Session, rows: List[dict]) -> Dict[int, Decimal]:
+    """
+    Bulk insert parsed rows, update their daily rollups and budgets, queue
+    alert checks for after commit and return the balance delta per account
+    """
+    if not rows:
+        return {}
+
+    db.execute(insert(Transaction), rows)
+    rollup_deltas = RollupService.deltas_for_rows(rows)
+    RollupService.apply(db, rollup_deltas)
+    BudgetService.apply_spend_deltas(db, rollup_deltas)
+    track_transaction_writes(db, rollup_deltas)
+
+    deltas: Dict[int, Decimal] = {}
+    for row in rows:
+        signed = row["amount"] if row["txn_type"] == "credit" else -row["amount"]
+        deltas[row["account_id"]] = deltas.get(row["account_id"], Decimal("0")) + signed
+    return deltas
+
+
+def apply_balance_deltas(db: Session, deltas: Dict[int, Decimal]):
+    """Apply aggregated balance changes with one atomic UPDATE per account"""
+    for account_id, delta in deltas.items():
+        if delta:
+            db.execute(
+                update(Account)
+                .where(Account.id == account_id)
+                .values(balance=Account.balance + delta)
+            )
+
+
+def open_csv_stream(binary_file) -> Iterator[str]:
+    """Decode a binary upload line by line as csv consumes it"""
+    return codecs.iterdecode(binary_file, 'utf-8-sig')
+
+
+def import_transactions_from_csv(file: UploadFile, account_id: int, db: Session, batch_size: Optional[int] = None):
+    if not file.filename.endswith('.csv'):
+        raise HTTPException(status_code=400, detail="File must be CSV format")
+
+    account = db.query(Account).filter(Account.id == account_id).first()
+    if not account:
+        raise HTTPException(status_code=404, detail="Account not found")
+
+    batch_size = batch_size or settings.CSV_IMPORT_BATCH_SIZE
+    stream = open_csv_stream(file.file)
+
+    transactions_created = 0
+    error_count = 0
+    errors = []
+    balance_deltas: Dict[int, Decimal] = {}
+
+    try:
+        for rows, batch_errors, _ in iter_csv_batches(stream, account_id, account.user_id, batch_size):
+            for acc_id, delta in insert_batch(db, rows).items():
+                balance_deltas[acc_id] = balance_deltas.get(acc_id, Decimal("0")) + delta
+            transactions_created += len(rows)
+            error_count += len(batch_errors)
+            errors.extend(batch_errors[:MAX_REPORTED_ERRORS - len(errors)])
+
+        # One balance update for the whole statement instead of one per row
+        apply_balance_deltas(db, balance_deltas)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
     return {
         "message": f"Imported {transactions_created} transactions",
         "transactions_created": transactions_created,
-        "errors": errors
-    }
\ No newline at end of file
+        "errors": errors,
+        "error_count": error_count
+    }
@@ -0,0 +1,222 @@
+import json
+import logging
+import os
+import shutil
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from fastapi import HTTPException, UploadFile
+from sqlalchemy import or_, and_, update
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal
+from app.models.import_job import ImportJob, ImportJobStatus
+from app.transactions.csv_import import (
+    MAX_REPORTED_ERRORS,
+    apply_balance_deltas,
+    insert_batch,
+    iter_csv_batches,
+    open_csv_stream,
+)
+
+logger = logging.getLogger(__name__)
+
+# Imports run here instead of on the request thread. Each batch commits its
+# rows, balance deltas and the job's progress together, so a job interrupted
+# by a restart resumes from `rows_consumed` without double-applying anything.
+# The spool file lives on the instance that accepted the upload (owner_host):
+# only that instance claims a job right away, others wait until its heartbeat
+# is stale and can read the file, which needs a shared IMPORT_SPOOL_DIR.
+_executor = ThreadPoolExecutor(max_workers=settings.IMPORT_JOB_WORKERS, thread_name_prefix="csv-import")
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def job_to_dict(job: ImportJob) -> dict:
+    return {
+        "job_id": job.id,
+        "account_id": job.account_id,
+        "filename": job.filename,
+        "status": job.status.value if job.status else ImportJobStatus.queued.value,
+        "rows_processed": job.rows_processed or 0,
+        "rows_failed": job.rows_failed or 0,
+        "errors": json.loads(job.errors) if job.errors else [],
+        "error_message": job.error_message,
+        "created_at": job.created_at,
+        "finished_at": job.finished_at
+    }
+
+
+def enqueue_import(db: Session, file: UploadFile, account_id: int, user_id: int) -> ImportJob:
+    """Spool the upload to disk, record a queued job and hand it to the worker pool"""
+    if not file.filename.endswith('.csv'):
+        raise HTTPException(status_code=400, detail="File must be CSV format")
+
+    os.makedirs(settings.IMPORT_SPOOL_DIR, exist_ok=True)
+    file_path = os.path.join(settings.IMPORT_SPOOL_DIR, f"{uuid.uuid4().hex}.csv")
+    with open(file_path, "wb") as spool:
+        shutil.copyfileobj(file.file, spool, 1024 * 1024)
+
+    job = ImportJob(
+        user_id=user_id,
+        account_id=account_id,
+        filename=file.filename,
+        file_path=file_path,
+        owner_host=settings.IMPORT_JOB_HOST,
+        status=ImportJobStatus.queued
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+
+    _executor.submit(run_import_job, job.id)
+    return job
+
+
+def _remove_spool(file_path: Optional[str]):
+    if not file_path:
+        return
+    try:
+        os.remove(file_path)
+    except OSError:
+        pass
+
+
+def _claim_job(db: Session, job_id: int) -> bool:
+    """
+    Atomically mark a job as running so only one worker processes it. This
+    instance claims its own jobs when queued or orphaned; another instance's
+    only once nothing has touched them for IMPORT_JOB_STALE_SECONDS.
+    """
+    stale_before = _utcnow() - timedelta(seconds=settings.IMPORT_JOB_STALE_SECONDS)
+    owned = or_(ImportJob.owner_host == settings.IMPORT_JOB_HOST, ImportJob.owner_host.is_(None))
+    stale = or_(
+        ImportJob.heartbeat_at < stale_before,
+        and_(ImportJob.heartbeat_at.is_(None), ImportJob.created_at < stale_before)
+    )
+    result = db.execute(
+        update(ImportJob)
+        .where(
+            ImportJob.id == job_id,
+            or_(
+                and_(
+                    owned,
+                    or_(
+                        ImportJob.status == ImportJobStatus.queued,
+                        and_(
+                            ImportJob.status == ImportJobStatus.running,
+                            or_(ImportJob.heartbeat_at.is_(None), ImportJob.heartbeat_at < stale_before)
+                        )
+                    )
+                ),
+                and_(ImportJob.status.in_([ImportJobStatus.queued, ImportJobStatus.running]), stale)
+            )
+        )
+        .values(status=ImportJobStatus.running, owner_host=settings.IMPORT_JOB_HOST, heartbeat_at=_utcnow())
+    )
+    db.commit()
+    return result.rowcount == 1
+
+
+def run_import_job(job_id: int) -> bool:
+    """Process a queued or orphaned import job batch by batch. Returns False when another worker owns it"""
+    db = SessionLocal()
+    try:
+        if not _claim_job(db, job_id):
+            return False
+
+        job = db.query(ImportJob).filter(ImportJob.id == job_id).first()
+        errors = json.loads(job.errors) if job.errors else []
+
+        with open(job.file_path, "rb") as f:
+            batches = iter_csv_batches(
+                open_csv_stream(f),
+                job.account_id,
+                job.user_id,
+                settings.CSV_IMPORT_BATCH_SIZE,
+                skip_rows=job.rows_consumed or 0
+            )
+            for rows, batch_errors, last_row_num in batches:
+                apply_balance_deltas(db, insert_batch(db, rows))
+
+                errors.extend(batch_errors[:MAX_REPORTED_ERRORS - len(errors)])
+                job.rows_processed = (job.rows_processed or 0) + len(rows)
+                job.rows_failed = (job.rows_failed or 0) + len(batch_errors)
+                job.rows_consumed = last_row_num - 1
+                job.errors = json.dumps(errors)
+                job.heartbeat_at = _utcnow()
+                db.commit()
+
+        job.status = ImportJobStatus.completed
+        job.finished_at = _utcnow()
+        db.commit()
+
+        _remove_spool(job.file_path)
+        return True
+
+    except Exception as e:
+        logger.error(f"IMPORT JOB {job_id} ERROR: {str(e)}")
+        db.rollback()
+        try:
+            db.execute(
+                update(ImportJob)
+                .where(ImportJob.id == job_id)
+                .values(status=ImportJobStatus.failed, error_message=str(e), finished_at=_utcnow())
+            )
+            db.commit()
+        except Exception:
+            db.rollback()
+            # Still queued or running, so a later resume needs the spool file
+            return True
+        # A failed job is never resumed
+        try:
+            _remove_spool(db.query(ImportJob.file_path).filter(ImportJob.id == job_id).scalar())
+        except Exception:
+            db.rollback()
+        return True
+    finally:
+        db.close()
+
+
+def _resume_job(job_id: int):
+    # A job still heartbeating belongs to a live worker (or to this process
+    # before a quick restart), and another instance's queued job to that
+    # instance; check again once either could go stale.
+    if run_import_job(job_id):
+        return
+    db = SessionLocal()
+    try:
+        status = db.query(ImportJob.status).filter(ImportJob.id == job_id).scalar()
+    finally:
+        db.close()
+    if status in (ImportJobStatus.queued, ImportJobStatus.running):
+        timer = threading.Timer(settings.IMPORT_JOB_STALE_SECONDS, _executor.submit, args=(_resume_job, job_id))
+        timer.daemon = True
+        timer.start()
+
+
+def resume_pending_jobs():
+    """
+    Re-submit jobs left queued or running by a previous process: this
+    instance's own, and other instances' whose spool file is readable here.
+    Jobs spooled elsewhere are left to their owner rather than failed.
+    """
+    db = SessionLocal()
+    try:
+        pending = db.query(ImportJob.id, ImportJob.owner_host, ImportJob.file_path).filter(
+            ImportJob.status.in_([ImportJobStatus.queued, ImportJobStatus.running])
+        ).all()
+    finally:
+        db.close()
+
+    resumable = [
+        job_id for job_id, owner_host, file_path in pending
+        if owner_host in (None, settings.IMPORT_JOB_HOST) or os.path.exists(file_path)
+    ]
+    for job_id in resumable:
+        _executor.submit(_resume_job, job_id)
+    return len(resumable)
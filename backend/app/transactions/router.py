@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, status, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, status, Query, Request, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional, Union, Any
 from decimal import Decimal
@@ -10,9 +10,15 @@ from app.models.transaction import Transaction
 from app.models.account import Account
 
 
-from app.transactions.schemas import TransactionCreate, TransactionResponse
+from app.transactions.schemas import TransactionCreate, TransactionResponse, TransactionPage
 from app.transactions.csv_import import import_transactions_from_csv
+from app.transactions.import_jobs import enqueue_import, job_to_dict
+from app.models.import_job import ImportJob
 from app.dependencies import get_current_user
+from app.utils.pagination import paginate_keyset
+from app.services.rollup_service import RollupService
+from app.budgets.service import BudgetService
+from app.services.alert_evaluator import track_transaction_writes
 
 router = APIRouter()
 
@@ -60,6 +66,13 @@ def create_transaction(transaction: TransactionCreate, db: Session = Depends(get
         else:
             account.balance = Decimal(str(account.balance)) - transaction_amount
 
+        # 4. Keep the daily rollup and budget spend in step within the same transaction
+        rollup_deltas = RollupService.add_transaction({}, db_transaction)
+        RollupService.apply(db, rollup_deltas)
+        BudgetService.apply_spend_deltas(db, rollup_deltas)
+        # 5. Budget and balance alerts are checked after commit, off the request
+        track_transaction_writes(db, rollup_deltas)
+
         db.commit()
         db.refresh(db_transaction)
         
@@ -77,13 +90,14 @@ def create_transaction_no_slash(transaction: TransactionCreate, db: Session = De
     """Duplicate endpoint without trailing slash for compatibility"""
     return create_transaction(transaction, db, current_user)
 
-@router.get("/", response_model=List[TransactionResponse])
+@router.get("/", response_model=Union[List[TransactionResponse], TransactionPage])
 def get_transactions(
     account_id: Optional[int] = Query(None),
     category: Optional[str] = Query(None),
     transaction_type: Optional[str] = Query(None),
     limit: int = Query(50),
     offset: int = Query(0),
+    after: Optional[str] = Query(None, description="Cursor from a previous page; pass an empty value to start cursor mode"),
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
@@ -98,8 +112,17 @@ def get_transactions(
         if transaction_type:
             query = query.filter(Transaction.txn_type == transaction_type)
         
+        if after is not None:
+            # Cursor mode: seek on (user/account, txn_date, id) instead of skipping rows
+            if not account_id:
+                query = query.filter(Transaction.user_id == current_user.id)
+            items, next_cursor = paginate_keyset(query, Transaction.txn_date, Transaction.id, after, limit)
+            return {"items": items, "next_cursor": next_cursor}
+        
         return query.order_by(Transaction.txn_date.desc()).offset(offset).limit(limit).all()
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch transactions: {str(e)}")
 
@@ -128,8 +151,6 @@ def update_transaction(
     current_user = Depends(get_current_user)
 ):
     try:
-        db.begin()
-        
         transaction = db.query(Transaction).join(Account).filter(
             Transaction.id == transaction_id,
             Account.user_id == current_user.id
@@ -139,6 +160,8 @@ def update_transaction(
             db.rollback()
             raise HTTPException(status_code=404, detail="Transaction not found")
         
+        rollup_deltas = RollupService.add_transaction({}, transaction, sign=-1)
+        
         # Reverse old balance impact
         old_account = db.query(Account).filter(Account.id == transaction.account_id).first()
         if old_account:
@@ -167,6 +190,11 @@ def update_transaction(
             else:
                 new_account.balance = current_balance - new_amount
         
+        RollupService.add_transaction(rollup_deltas, transaction)
+        RollupService.apply(db, rollup_deltas)
+        BudgetService.apply_spend_deltas(db, rollup_deltas)
+        track_transaction_writes(db, rollup_deltas)
+        
         db.commit()
         db.refresh(transaction)
         return transaction
@@ -205,14 +233,19 @@ def delete_transaction(transaction_id: int, db: Session = Depends(get_db), curre
         else:
             account.balance = current_balance + transaction_amount
     
+    rollup_deltas = RollupService.add_transaction({}, transaction, sign=-1)
+    RollupService.apply(db, rollup_deltas)
+    BudgetService.apply_spend_deltas(db, rollup_deltas)
     db.delete(transaction)
     db.commit()
     return None
 
 @router.post("/import-csv")
 def import_csv(
+    response: Response,
     file: UploadFile = File(...), 
     account_id: int = Query(...), 
+    background: bool = Query(False, description="Queue the import and return a job id immediately"),
     db: Session = Depends(get_db), 
     current_user = Depends(get_current_user)
 ):
@@ -225,6 +258,11 @@ def import_csv(
         if not account:
             raise HTTPException(status_code=404, detail="Account not found")
         
+        if background:
+            job = enqueue_import(db, file, account_id, current_user.id)
+            response.status_code = status.HTTP_202_ACCEPTED
+            return job_to_dict(job)
+        
         return import_transactions_from_csv(file, account_id, db)
         
     except HTTPException as http_exc:
@@ -232,6 +270,18 @@ def import_csv(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to import CSV: {str(e)}")
 
+@router.get("/import-jobs/{job_id}")
+def get_import_job(job_id: int, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
+    """Report progress of a background CSV import"""
+    job = db.query(ImportJob).filter(
+        ImportJob.id == job_id,
+        ImportJob.user_id == current_user.id
+    ).first()
+    
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job_to_dict(job)
+
 
 
 
@@ -1,7 +1,7 @@
 from pydantic import BaseModel, field_validator
 from decimal import Decimal
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from enum import Enum
 
 class TransactionType(str, Enum):
@@ -42,4 +42,8 @@ class TransactionResponse(BaseModel):
     created_at: datetime
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class TransactionPage(BaseModel):
+    items: List[TransactionResponse]
+    next_cursor: Optional[str] = None
@@ -1,4 +1,10 @@
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Callable, List, Optional
+from fastapi import HTTPException
 from passlib.context import CryptContext
+from app.config import settings
 
 # Fix for "password cannot be longer than 72 bytes":
 # This error occurs because passlib's bcrypt backend (when using raw bcrypt) 
@@ -24,4 +30,138 @@ def hash_password(password: str) -> str:
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     if len(plain_password.encode('utf-8')) > 72:
         plain_password = plain_password[:72]
-    return pwd_context.verify(plain_password, hashed_password)
\ No newline at end of file
+    return pwd_context.verify(plain_password, hashed_password)
+
+# --- Offloaded hashing ---
+# bcrypt is deliberately slow (~250 ms). Running it on the request threads lets
+# a login storm occupy every worker thread, so the auth endpoints hand it to a
+# small dedicated pool instead. At most PASSWORD_HASH_MAX_PENDING hashes may be
+# running or queued; beyond that callers get a 503 straight away rather than
+# waiting behind an ever-growing queue.
+
+_executor: Optional[Executor] = None
+_executor_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_stats = {"pending": 0, "peak_pending": 0, "completed": 0, "rejected": 0, "timed_out": 0, "wait_ms_total": 0.0}
+
+
+def _get_executor() -> Executor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                if settings.PASSWORD_HASH_EXECUTOR == "process":
+                    # Separate interpreters, for bcrypt builds that hold the GIL
+                    _executor = ProcessPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS)
+                else:
+                    _executor = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+    return _executor
+
+
+def _admit(count: int = 1, reject: bool = True) -> bool:
+    with _stats_lock:
+        if _stats["pending"] + count > settings.PASSWORD_HASH_MAX_PENDING:
+            if reject:
+                _stats["rejected"] += count
+            return False
+        _stats["pending"] += count
+        _stats["peak_pending"] = max(_stats["peak_pending"], _stats["pending"])
+        return True
+
+
+def _submit(fn: Callable, *args) -> Future:
+    """
+    Submit one admitted hash. Its slot is released when the work actually
+    finishes (or is cancelled before starting), not when the caller stops
+    waiting, so `pending` never undercounts what the pool is running.
+    """
+    started = time.perf_counter()
+    try:
+        future = _get_executor().submit(fn, *args)
+    except Exception:
+        with _stats_lock:
+            _stats["pending"] -= 1
+        raise
+
+    def release(done: Future):
+        with _stats_lock:
+            _stats["pending"] -= 1
+            if not done.cancelled():
+                _stats["completed"] += 1
+                _stats["wait_ms_total"] += (time.perf_counter() - started) * 1000
+
+    future.add_done_callback(release)
+    return future
+
+
+def _overloaded() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="Authentication service is busy, please retry shortly",
+        headers={"Retry-After": "1"}
+    )
+
+
+def _run(fn: Callable, *args):
+    if not _admit():
+        raise _overloaded()
+    future = _submit(fn, *args)
+    try:
+        return future.result(timeout=settings.PASSWORD_HASH_TIMEOUT_SECONDS)
+    except FutureTimeout:
+        # A hash already running cannot be stopped; it keeps its slot until done
+        future.cancel()
+        with _stats_lock:
+            _stats["timed_out"] += 1
+        raise _overloaded()
+
+
+def hash_password_pooled(password: str) -> str:
+    """hash_password on the bounded hashing pool. Raises 503 when the pool is saturated"""
+    return _run(hash_password, password)
+
+
+def verify_password_pooled(plain_password: str, hashed_password: str) -> bool:
+    """verify_password on the bounded hashing pool. Raises 503 when the pool is saturated"""
+    return _run(verify_password, plain_password, hashed_password)
+
+
+def hash_passwords(passwords: List[str]) -> List[str]:
+    """
+    Hash many passwords in parallel for bulk jobs. Work is submitted one
+    pool-width at a time so interactive logins are never stuck behind a
+    whole import; a chunk waits for room instead of failing with 503.
+    """
+    # A chunk larger than PASSWORD_HASH_MAX_PENDING could never be admitted
+    width = max(1, min(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_PENDING))
+    hashed: List[str] = []
+    for i in range(0, len(passwords), width):
+        chunk = passwords[i:i + width]
+        while not _admit(len(chunk), reject=False):
+            time.sleep(0.05)
+        futures: List[Future] = []
+        try:
+            for password in chunk:
+                futures.append(_submit(hash_password, password))
+        except Exception:
+            # _submit gave back the failed slot; give back those never tried
+            with _stats_lock:
+                _stats["pending"] -= len(chunk) - len(futures) - 1
+            raise
+        hashed.extend(future.result() for future in futures)
+    return hashed
+
+
+def hashing_stats() -> dict:
+    with _stats_lock:
+        stats = dict(_stats)
+    workers = settings.PASSWORD_HASH_WORKERS
+    stats.update(
+        executor=settings.PASSWORD_HASH_EXECUTOR,
+        workers=workers,
+        max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+        queue_depth=max(stats["pending"] - workers, 0),
+        avg_wait_ms=round(stats["wait_ms_total"] / stats["completed"], 2) if stats["completed"] else 0.0
+    )
+    stats["wait_ms_total"] = round(stats["wait_ms_total"], 2)
+    return stats
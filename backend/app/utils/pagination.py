@@ -0,0 +1,109 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy import func, tuple_
+from sqlalchemy.orm import Query
+
+# Keyset (cursor) pagination over (txn_date, id) ordered newest first.
+# The cursor is an opaque url-safe token wrapping "<txn_date iso>,<id>" of
+# the last row on the previous page, so each page seeks straight into the
+# (owner, txn_date, id) index instead of scanning and discarding an offset.
+
+_SQLITE_SORT_FORMAT = "%Y-%m-%d %H:%M:%f"
+
+
+def encode_cursor(sort_value: datetime, row_id: int) -> str:
+    """Encode the sort key of the last row of a page into an opaque cursor"""
+    raw = f"{sort_value.isoformat()},{row_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor produced by encode_cursor, raising 400 when malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+        sort_part, id_part = raw.rsplit(",", 1)
+        return datetime.fromisoformat(sort_part), int(id_part)
+    except (ValueError, binascii.Error, UnicodeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+
+def paginate_keyset(
+    query,
+    sort_column,
+    id_column,
+    after: Optional[str],
+    limit: int,
+    key: Optional[Callable[[Any], Tuple[datetime, int]]] = None
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Fetch one page of `query` ordered by (sort_column, id_column) descending.
+
+    An empty `after` starts from the newest row. Returns the rows and the
+    cursor for the next page, or None when this is the last page. `key`
+    extracts (sort_value, id) from a result row when rows are not plain
+    entities (e.g. column-only selects).
+    """
+    sort_key = sort_column
+    if query.session.bind.dialect.name == "sqlite":
+        # SQLite keeps datetimes as text: server defaults are stored without
+        # fractional seconds but bound values with them, so raw comparison
+        # sorts a row before a cursor from the same second. Compare both in
+        # one format instead.
+        sort_key = func.strftime(_SQLITE_SORT_FORMAT, sort_column)
+
+    if after:
+        cursor_value, cursor_id = decode_cursor(after)
+        if sort_key is not sort_column:
+            cursor_value = func.strftime(_SQLITE_SORT_FORMAT, cursor_value)
+        query = query.filter(tuple_(sort_key, id_column) < tuple_(cursor_value, cursor_id))
+
+    rows = query.order_by(sort_key.desc(), id_column.desc()).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        if key:
+            sort_value, row_id = key(last)
+        else:
+            sort_value, row_id = getattr(last, sort_column.key), getattr(last, id_column.key)
+        next_cursor = encode_cursor(sort_value, row_id)
+
+    return rows, next_cursor
+
+
+def count_rows(query: Query, mode: str = "estimated") -> Tuple[Optional[int], bool]:
+    """
+    Total row count for a listing as (total, is_estimate).
+
+    mode="exact" runs COUNT(*). mode="estimated" asks the Postgres planner
+    for its row estimate instead, which costs nothing on huge tables; other
+    databases fall back to an exact count. mode="none" skips counting.
+    """
+    if mode == "none":
+        return None, False
+
+    query = query.order_by(None)
+    session = query.session
+    if mode == "estimated" and session.bind.dialect.name == "postgresql":
+        try:
+            compiled = query.statement.compile(dialect=session.bind.dialect)
+            params = compiled.params
+            if compiled.positional:
+                # asyncpg takes $n placeholders with a tuple
+                params = tuple(params[name] for name in compiled.positiontup)
+            plan = session.connection().exec_driver_sql(
+                f"EXPLAIN (FORMAT JSON) {compiled}", params
+            ).scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]["Plan"]["Plan Rows"]), True
+        except Exception:
+            pass
+
+    return query.count(), False
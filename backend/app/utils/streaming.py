@@ -0,0 +1,250 @@
+import csv
+import io
+import re
+import unicodedata
+import zlib
+from urllib.parse import quote
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Query, Session
+from app.config import settings
+from app.database import SessionLocal
+
+# Exports are produced while the response is being sent: rows are read from a
+# server-side cursor in batches of EXPORT_YIELD_PER, formatted into chunks and
+# handed to the client straight away, so memory stays flat however many rows
+# there are and the first bytes leave before the query has finished.
+
+
+def stream_query(build_query: Callable[[Session], Query], yield_per: Optional[int] = None) -> Iterator:
+    """
+    Iterate the rows of `build_query(session)` through a server-side cursor.
+    The generator owns its session because it outlives the request handler
+    (and the request's get_db session) while the response streams.
+    """
+    db = SessionLocal()
+    try:
+        yield from build_query(db).yield_per(yield_per or settings.EXPORT_YIELD_PER)
+    finally:
+        db.close()
+
+
+def csv_chunks(
+    header: Sequence[str],
+    rows: Iterable,
+    to_row: Callable[[object], List],
+    chunk_rows: Optional[int] = None
+) -> Iterator[bytes]:
+    """Format rows as CSV, yielding UTF-8 bytes every `chunk_rows` rows"""
+    chunk_rows = chunk_rows or settings.EXPORT_YIELD_PER
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    # Send the header immediately so the download starts before the first fetch
+    yield buffer.getvalue().encode("utf-8")
+    buffer.seek(0)
+    buffer.truncate()
+
+    pending = 0
+    for row in rows:
+        writer.writerow(to_row(row))
+        pending += 1
+        if pending >= chunk_rows:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if pending:
+        yield buffer.getvalue().encode("utf-8")
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Compress a byte stream into a single gzip member on the fly"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        # Sync-flush per chunk so compressed bytes go out as soon as rows are formatted
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def attachment_header(filename: str) -> str:
+    """
+    Content-Disposition value for a download named `filename`. Headers must be
+    latin-1, so the plain filename parameter gets an ASCII fallback (accents
+    dropped, quotes and anything else unsafe replaced) and the real name
+    travels percent-encoded in filename* (RFC 5987/6266).
+    """
+    decomposed = unicodedata.normalize("NFKD", filename)
+    ascii_name = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    ascii_name = re.sub(r'[^A-Za-z0-9._ -]+', "_", ascii_name).strip() or "download"
+    return f"attachment; filename=\"{ascii_name}\"; filename*=UTF-8''{quote(filename, safe='')}"
+
+
+def csv_download(chunks: Iterable[bytes], filename: str, gzip: bool = False) -> StreamingResponse:
+    """Wrap CSV chunks in an attachment response, optionally as filename.gz"""
+    if gzip:
+        return StreamingResponse(
+            gzip_chunks(chunks),
+            media_type="application/gzip",
+            headers={"Content-Disposition": attachment_header(f"{filename}.gz")}
+        )
+    return StreamingResponse(
+        chunks,
+        media_type="text/csv",
+        headers={"Content-Disposition": attachment_header(filename)}
+    )
+
+
+# --- Columnar exports (optional pyarrow dependency) ---
+# Column types for columnar exports; rows are taken positionally, so a spec
+# lists (name, type) in the same order as the exported query's columns.
+COLUMN_TYPES = ("int", "string", "decimal", "timestamp")
+
+COLUMNAR_MEDIA_TYPES = {
+    "parquet": ("application/vnd.apache.parquet", ".parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", ".arrow"),
+}
+
+
+# Codecs each writer accepts; anything else would fail partway through the stream
+_CODECS = {
+    "parquet": ("snappy", "gzip", "brotli", "lz4", "zstd"),
+    "arrow": ("lz4_frame", "zstd"),
+}
+
+
+def _compression(export_format: str) -> Optional[str]:
+    """The configured codec for `export_format`, None for uncompressed. Raises 500 when unsupported"""
+    if export_format == "parquet":
+        name, codec = "EXPORT_PARQUET_COMPRESSION", settings.EXPORT_PARQUET_COMPRESSION
+    else:
+        name, codec = "EXPORT_IPC_COMPRESSION", settings.EXPORT_IPC_COMPRESSION
+    codec = (codec or "").lower()
+    if codec in ("", "none", "uncompressed"):
+        return None
+    if codec not in _CODECS[export_format]:
+        raise HTTPException(
+            status_code=500,
+            detail=f"{name} must be one of {', '.join(_CODECS[export_format])} or none, not {codec!r}"
+        )
+    return codec
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        return pyarrow
+    except ImportError:
+        raise HTTPException(status_code=501, detail="Parquet/Arrow export requires the optional pyarrow package")
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that collects bytes until the generator drains them"""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _arrow_schema(pa, columns: Sequence[Tuple[str, str]]):
+    types = {
+        "int": pa.int64(),
+        "string": pa.string(),
+        "decimal": pa.decimal128(15, 2),
+        "timestamp": pa.timestamp("us", tz="UTC"),
+    }
+    return pa.schema([(name, types[kind]) for name, kind in columns])
+
+
+def _plain(value):
+    # Enums (txn_type, account_type, ...) are stored as their value
+    return getattr(value, "value", value)
+
+
+def columnar_chunks(
+    columns: Sequence[Tuple[str, str]],
+    rows: Iterable,
+    export_format: str,
+    batch_rows: Optional[int] = None
+) -> Iterator[bytes]:
+    """
+    Encode rows as Parquet (one row group per batch) or an Arrow IPC stream,
+    yielding the encoded bytes after every `batch_rows` rows so only one
+    batch is ever held in memory.
+    """
+    pa = _require_pyarrow()
+    compression = _compression(export_format)
+    batch_rows = batch_rows or settings.EXPORT_ROW_GROUP_SIZE
+    schema = _arrow_schema(pa, columns)
+    sink = _ChunkSink()
+
+    if export_format == "parquet":
+        import pyarrow.parquet as pq
+        writer = pq.ParquetWriter(sink, schema, compression=compression or "none")
+        write = writer.write_batch
+    else:
+        writer = pa.ipc.new_stream(
+            sink, schema, options=pa.ipc.IpcWriteOptions(compression=compression)
+        )
+        write = writer.write_batch
+
+    def flush(buffered):
+        arrays = [pa.array(values, type=field.type) for values, field in zip(buffered, schema)]
+        write(pa.RecordBatch.from_arrays(arrays, schema=schema))
+
+    buffered = [[] for _ in columns]
+    count = 0
+    try:
+        for row in rows:
+            for values, value in zip(buffered, row):
+                values.append(_plain(value))
+            count += 1
+            if count >= batch_rows:
+                flush(buffered)
+                buffered = [[] for _ in columns]
+                count = 0
+                yield sink.drain()
+        if count:
+            flush(buffered)
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def columnar_download(
+    columns: Sequence[Tuple[str, str]],
+    rows: Iterable,
+    filename: str,
+    export_format: str
+) -> StreamingResponse:
+    """Stream rows as filename.parquet or filename.arrow"""
+    _require_pyarrow()
+    # Checked before the response starts, while an error can still be reported
+    _compression(export_format)
+    media_type, extension = COLUMNAR_MEDIA_TYPES[export_format]
+    return StreamingResponse(
+        columnar_chunks(columns, rows, export_format),
+        media_type=media_type,
+        headers={"Content-Disposition": attachment_header(f"{filename}{extension}")}
+    )
@@ -0,0 +1,21 @@
+import sys
+from app.database import SessionLocal
+from app.services.rollup_service import RollupService
+
+def backfill_rollups(user_id=None):
+    """Rebuild daily_rollups from the transactions table (all users or one user)"""
+    db = SessionLocal()
+    try:
+        target = f"user {user_id}" if user_id is not None else "all users"
+        print(f"Backfilling daily rollups for {target}...")
+        rows = RollupService.backfill(db, user_id)
+        print(f"Wrote {rows} rollup rows")
+    except Exception as e:
+        db.rollback()
+        print(f"Backfill error: {e}")
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    backfill_rollups(int(sys.argv[1]) if len(sys.argv) > 1 else None)
@@ -0,0 +1,33 @@
+import os
+import tempfile
+
+# Point the app at a throwaway SQLite database before any test imports it
+_db_path = os.path.join(tempfile.mkdtemp(), "backend_test.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_path}"
+os.environ["INIT_DB_ON_STARTUP"] = "true"
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture(scope="session")
+def client():
+    from app.main import app
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def headers(client):
+    login = client.post("/api/auth/login", json={"email": "user@bank.com", "password": "user123"})
+    return {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+
+@pytest.fixture
+def account_id(client, headers):
+    response = client.post(
+        "/api/accounts/",
+        json={"name": "Main", "bank_name": "Test Bank", "account_type": "savings", "balance": 1000},
+        headers=headers
+    )
+    return response.json()["id"]
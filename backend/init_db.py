@@ -0,0 +1,10 @@
+from app.bootstrap import bootstrap
+
+def init_db():
+    """Create tables, apply pending migrations and seed the default users"""
+    print("Initializing database...")
+    bootstrap()
+    print("Database initialized")
+
+if __name__ == "__main__":
+    init_db()
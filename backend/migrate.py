@@ -0,0 +1,26 @@
+import sys
+from app.migrations import migration_status, run_migrations
+
+def migrate(target=None):
+    """Apply pending schema migrations (all of them, or up to a target version)"""
+    print("Applying schema migrations...")
+    applied = run_migrations(target=target)
+    if not applied:
+        print("Schema is up to date")
+    else:
+        total = sum(m["duration_ms"] for m in applied)
+        print(f"Applied {len(applied)} migration(s) in {round(total, 2)} ms")
+
+def status():
+    """Print every known migration with when it was applied and how long it took"""
+    for m in migration_status():
+        if m["applied_at"] is None:
+            print(f"{m['version']}  pending                           {m['description']}")
+        else:
+            print(f"{m['version']}  {m['applied_at']:%Y-%m-%d %H:%M:%S}  {m['duration_ms']:>9.2f} ms  {m['description']}")
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "status":
+        status()
+    else:
+        migrate(sys.argv[1] if len(sys.argv) > 1 else None)
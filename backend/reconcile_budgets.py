@@ -0,0 +1,12 @@
+import sys
+from app.budgets.reconcile import reconcile_budgets
+
+if __name__ == "__main__":
+    user_id = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    target = f"user {user_id}" if user_id is not None else "all users"
+    print(f"Reconciling budget spend for {target}...")
+    corrected = reconcile_budgets(user_id)
+    if corrected is None:
+        print("Another process is reconciling; nothing done")
+    else:
+        print(f"Corrected {corrected} budget(s)")
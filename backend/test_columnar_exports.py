@@ -0,0 +1,36 @@
+import io
+import pytest
+from fastapi import HTTPException
+
+pa = pytest.importorskip("pyarrow")
+import pyarrow.parquet as pq
+
+from app.utils import streaming
+
+COLUMNS = [("id", "int"), ("category", "string")]
+ROWS = [(i, f"c{i}") for i in range(5)]
+
+
+def _encode(export_format):
+    return b"".join(streaming.columnar_chunks(COLUMNS, iter(ROWS), export_format, batch_rows=2))
+
+
+@pytest.mark.parametrize("codec", ["snappy", "gzip", "zstd", "none"])
+def test_parquet_codecs(monkeypatch, codec):
+    monkeypatch.setattr(streaming.settings, "EXPORT_PARQUET_COMPRESSION", codec)
+    table = pq.read_table(io.BytesIO(_encode("parquet")))
+    assert table.column("id").to_pylist() == [0, 1, 2, 3, 4]
+
+
+@pytest.mark.parametrize("codec", ["lz4_frame", "zstd", "none"])
+def test_arrow_codecs(monkeypatch, codec):
+    monkeypatch.setattr(streaming.settings, "EXPORT_IPC_COMPRESSION", codec)
+    table = pa.ipc.open_stream(_encode("arrow")).read_all()
+    assert table.column("category").to_pylist() == ["c0", "c1", "c2", "c3", "c4"]
+
+
+def test_parquet_only_codec_is_rejected_for_arrow_before_streaming(monkeypatch):
+    monkeypatch.setattr(streaming.settings, "EXPORT_IPC_COMPRESSION", "snappy")
+    with pytest.raises(HTTPException) as raised:
+        streaming.columnar_download(COLUMNS, iter(ROWS), "export", "arrow")
+    assert raised.value.status_code == 500
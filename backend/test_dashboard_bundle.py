@@ -0,0 +1,9 @@
+def test_dashboard_bundle_loads_every_section(client, headers):
+    client.post("/api/bills", json={"name": "Rent", "amount": 500, "due_date": "2030-01-01"}, headers=headers)
+
+    response = client.get("/api/dashboard/bundle", headers=headers)
+
+    assert response.status_code == 200
+    bundle = response.json()
+    assert not bundle.get("errors"), bundle.get("errors")
+    assert "Rent" in [bill["name"] for bill in bundle["bills"]]
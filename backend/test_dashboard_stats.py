@@ -0,0 +1,30 @@
+from datetime import date
+
+
+def _stats(client, headers):
+    response = client.get("/api/dashboard-stats", headers=headers)
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_stats_follow_account_and_budget_writes(client, headers, account_id):
+    before = _stats(client, headers)
+
+    created = client.post(
+        "/api/accounts/",
+        json={"name": "Second", "bank_name": "Test Bank", "account_type": "savings", "balance": 250},
+        headers=headers
+    )
+    assert created.status_code in (200, 201), created.text
+    after_account = _stats(client, headers)
+    assert after_account["total_accounts"] == before["total_accounts"] + 1
+    assert after_account["total_balance"] == before["total_balance"] + 250
+
+    today = date.today()
+    budget = client.post(
+        "/api/budgets/",
+        json={"name": "Groceries", "amount": 300, "category_id": 1, "month": today.month, "year": today.year},
+        headers=headers
+    )
+    assert budget.status_code == 201, budget.text
+    assert _stats(client, headers)["active_budgets"] == after_account["active_budgets"] + 1
@@ -0,0 +1,35 @@
+from app.database import SessionLocal
+from app.models.import_job import ImportJob, ImportJobStatus
+from app.models.user import User
+from app.transactions import import_jobs
+
+
+def _failing_batches(*args, **kwargs):
+    raise ValueError("unreadable upload")
+
+
+def test_failed_job_removes_its_spool_file(client, headers, account_id, tmp_path, monkeypatch):
+    spool = tmp_path / "upload.csv"
+    spool.write_text("date,amount,type\n2025-01-01,1,debit\n")
+    db = SessionLocal()
+    try:
+        user_id = db.query(User.id).filter(User.email == "user@bank.com").scalar()
+        job = ImportJob(user_id=user_id, account_id=account_id, filename="upload.csv", file_path=str(spool),
+                        owner_host=import_jobs.settings.IMPORT_JOB_HOST, status=ImportJobStatus.queued)
+        db.add(job)
+        db.commit()
+        job_id = job.id
+    finally:
+        db.close()
+
+    monkeypatch.setattr(import_jobs, "iter_csv_batches", _failing_batches)
+    import_jobs.run_import_job(job_id)
+
+    db = SessionLocal()
+    try:
+        job = db.query(ImportJob).filter(ImportJob.id == job_id).one()
+        assert job.status == ImportJobStatus.failed
+        assert job.error_message == "unreadable upload"
+    finally:
+        db.close()
+    assert not spool.exists()
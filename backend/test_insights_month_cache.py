@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta
+from app.database import SessionLocal
+from app.models.user import User
+from app.services.insights_service import InsightsService, _month_cache
+
+
+def _post_transaction(client, headers, account_id, amount, when):
+    response = client.post(
+        "/api/transactions/",
+        json={"account_id": account_id, "amount": amount, "txn_type": "credit", "category": "Salary", "date": when.isoformat()},
+        headers=headers
+    )
+    assert response.status_code in (200, 201), response.text
+
+
+def _user_id(email):
+    db = SessionLocal()
+    try:
+        return db.query(User.id).filter(User.email == email).scalar()
+    finally:
+        db.close()
+
+
+def _buckets(user_id):
+    db = SessionLocal()
+    try:
+        return InsightsService.get_month_buckets(db, user_id, 3)
+    finally:
+        db.close()
+
+
+def test_current_month_write_keeps_closed_month_buckets(client, headers, account_id):
+    user_id = _user_id("user@bank.com")
+    now = datetime.utcnow()
+    closed = now.replace(day=1) - timedelta(days=20)
+    _post_transaction(client, headers, account_id, 100, closed)
+    _buckets(user_id)
+
+    _post_transaction(client, headers, account_id, 5, now)
+    misses = _month_cache.stats()["misses"]
+    buckets = _buckets(user_id)
+
+    # Both closed months are served from the cache
+    assert _month_cache.stats()["misses"] == misses
+    assert buckets[-1]["income"] >= 5
+
+    # A backdated write invalidates only the month it lands in
+    _post_transaction(client, headers, account_id, 50, closed)
+    before = _month_cache.stats()["misses"]
+    buckets = _buckets(user_id)
+    assert _month_cache.stats()["misses"] == before + 1
+    closed_bucket = next(b for b in buckets if (b["year"], b["month"]) == (closed.year, closed.month))
+    assert closed_bucket["income"] >= 150
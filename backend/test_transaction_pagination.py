@@ -0,0 +1,21 @@
+def test_keyset_pages_do_not_repeat_rows_from_the_same_second(client, headers, account_id):
+    created = []
+    for i in range(7):
+        # No date, so txn_date comes from the database default and shares a second
+        response = client.post(
+            "/api/transactions/",
+            json={"account_id": account_id, "amount": 1 + i, "txn_type": "debit", "description": f"t{i}"},
+            headers=headers
+        )
+        assert response.status_code in (200, 201), response.text
+        created.append(response.json()["id"])
+
+    first = client.get("/api/transactions/", params={"account_id": account_id, "after": "", "limit": 3}, headers=headers).json()
+    second = client.get(
+        "/api/transactions/", params={"account_id": account_id, "after": first["next_cursor"], "limit": 3}, headers=headers
+    ).json()
+
+    first_ids = [t["id"] for t in first["items"]]
+    second_ids = [t["id"] for t in second["items"]]
+    assert first_ids == sorted(created, reverse=True)[:3]
+    assert second_ids == sorted(created, reverse=True)[3:6]
@@ -58,8 +58,8 @@ export const getAllAccounts = async () => {
   return response.data;
 };
 
-export const getAllTransactions = async () => {
-  const response = await axiosClient.get('/api/admin/transactions');
+export const getAllTransactions = async (params = {}) => {
+  const response = await axiosClient.get('/api/admin/transactions', { params });
   return response.data;
 };
 
@@ -276,10 +276,16 @@ export const updateSystemConfig = async (config) => {
 };
 
 // CSV Import/Export functions
+const downloadFilename = (response, fallback) => {
+  const disposition = response.headers?.['content-disposition'] || '';
+  const match = disposition.match(/filename="?([^"]+)"?/);
+  return match ? match[1] : fallback;
+};
+
 export const exportTransactionsCSV = async () => {
   try {
-    const response = await axiosClient.get('/api/admin/transactions/export');
-    return response.data;
+    const response = await axiosClient.get('/api/admin/transactions/export', { responseType: 'blob' });
+    return { blob: response.data, filename: downloadFilename(response, 'transactions.csv') };
   } catch (error) {
     console.error('Failed to export transactions CSV:', error);
     throw error;
@@ -288,8 +294,8 @@ export const exportTransactionsCSV = async () => {
 
 export const exportUserTransactionsCSV = async (userId) => {
   try {
-    const response = await axiosClient.get(`/api/admin/transactions/user/${userId}/export`);
-    return response.data;
+    const response = await axiosClient.get(`/api/admin/transactions/user/${userId}/export`, { responseType: 'blob' });
+    return { blob: response.data, filename: downloadFilename(response, `user_${userId}_transactions.csv`) };
   } catch (error) {
     console.error('Failed to export user transactions CSV:', error);
     throw error;
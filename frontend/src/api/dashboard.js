@@ -5,6 +5,11 @@ export const getDashboardStats = async () => {
   return response.data;
 };
 
+export const getDashboardBundle = async () => {
+  const response = await axiosClient.get('/api/dashboard/bundle');
+  return response.data;
+};
+
 export const getSpendingByCategory = async (month, year) => {
   const params = new URLSearchParams();
   if (month) params.append('month', month);
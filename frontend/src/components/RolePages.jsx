@@ -1013,14 +1013,19 @@ export const AuditOverview = () => {
 // New Enhanced Admin Components
 export const TransactionOverview = () => {
   const [transactions, setTransactions] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [total, setTotal] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [searchTerm, setSearchTerm] = useState('');
 
   useEffect(() => {
     const loadTransactions = async () => {
       try {
-        const data = await getAllTransactions();
-        setTransactions(data);
+        const data = await getAllTransactions({ limit: 100 });
+        setTransactions(data.transactions || []);
+        setNextCursor(data.next_cursor);
+        setTotal(data.total);
       } catch (error) {
         console.error('Error loading transactions:', error);
       } finally {
@@ -1030,6 +1035,20 @@ export const TransactionOverview = () => {
     loadTransactions();
   }, []);
 
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const data = await getAllTransactions({ limit: 100, after: nextCursor });
+      setTransactions(prev => [...prev, ...(data.transactions || [])]);
+      setNextCursor(data.next_cursor);
+    } catch (error) {
+      console.error('Error loading transactions:', error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const filteredTransactions = transactions.filter(txn => 
     !searchTerm || 
     txn.user_name?.toLowerCase().includes(searchTerm.toLowerCase()) ||
@@ -1106,6 +1125,21 @@ export const TransactionOverview = () => {
             <p className="mt-1 text-sm text-gray-500">Try adjusting your search criteria.</p>
           </div>
         )}
+
+        <div className="flex items-center justify-between px-6 py-4 border-t border-gray-100">
+          <span className="text-sm text-gray-500">
+            Showing {transactions.length}{total != null ? ` of ~${total.toLocaleString()}` : ''} transactions
+          </span>
+          {nextCursor && (
+            <button
+              onClick={loadMore}
+              disabled={loadingMore}
+              className="px-4 py-2 text-sm font-semibold text-white bg-gradient-to-r from-blue-600 to-purple-600 rounded-lg disabled:opacity-50"
+            >
+              {loadingMore ? 'Loading...' : 'Load more'}
+            </button>
+          )}
+        </div>
       </div>
     </div>
   );
@@ -3,11 +3,8 @@ import { useNavigate } from 'react-router-dom';
 import { PieChart, Pie, Cell, ResponsiveContainer, Tooltip, Legend } from 'recharts';
 import Navbar from '../components/Navbar'; 
 import Loader from '../components/Loader';
-import { getAccounts } from '../api/accounts';
 import { getTransactions } from '../api/transactions';
-import { getBudgets } from '../api/budgets';
-import { getDashboardStats } from '../api/dashboard';
-import { getRewards } from '../api/rewards';
+import { getDashboardBundle } from '../api/dashboard';
 import { 
   AlertCircle, 
   DollarSign,
@@ -38,13 +35,14 @@ const Dashboard = () => {
         
         // Debug authentication before making API calls
         
-        const [accountsData, transactionsData, budgetsData, statsData, rewardsData] = await Promise.all([
-          getAccounts().catch(() => []),
-          getTransactions().catch(() => []),
-          getBudgets().catch(() => []),
-          getDashboardStats().catch(() => ({})),
-          getRewards().catch(() => [])
+        const [bundle, transactionsData] = await Promise.all([
+          getDashboardBundle().catch(() => ({})),
+          getTransactions().catch(() => [])
         ]);
+        const accountsData = bundle.accounts || [];
+        const budgetsData = bundle.budgets || [];
+        const statsData = bundle.stats || {};
+        const rewardsData = bundle.rewards || [];
         
         setAccounts(accountsData);
         setTransactions(transactionsData);
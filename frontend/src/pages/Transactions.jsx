@@ -295,8 +295,10 @@ const Transactions = () => {
       const formDataObj = new FormData();
       formDataObj.append('file', importFile);
       
+      // Queue the import as a background job so large statements are not
+      // cut off by the request timeout, then poll until it finishes
       const response = await axiosClient.post(
-        `/api/transactions/import-csv?account_id=${formData.account_id}`,
+        `/api/transactions/import-csv?account_id=${formData.account_id}&background=true`,
         formDataObj,
         {
           headers: {
@@ -305,19 +307,29 @@ const Transactions = () => {
         }
       );
       
+      let job = response.data;
+      while (job.status === 'queued' || job.status === 'running') {
+        await new Promise(resolve => setTimeout(resolve, 1500));
+        const progress = await axiosClient.get(`/api/transactions/import-jobs/${job.job_id}`);
+        job = progress.data;
+      }
+      
+      if (job.status === 'failed') {
+        throw new Error(job.error_message || 'Import failed');
+      }
+      
       setShowImportModal(false);
       setImportFile(null);
       await fetchData();
       
-      const result = response.data;
-      const message = `Imported ${result.transactions_created} transactions${result.errors.length > 0 ? ` with ${result.errors.length} errors` : ''}`;
+      const message = `Imported ${job.rows_processed} transactions${job.rows_failed > 0 ? ` with ${job.rows_failed} errors` : ''}`;
       
-      await createAlert('CSV Import Complete', message, result.errors.length > 0 ? 'medium' : 'info');
+      await createAlert('CSV Import Complete', message, job.rows_failed > 0 ? 'medium' : 'info');
       NotificationService.showNotification('CSV Import Complete', { body: message });
       
     } catch (error) {
       console.error('Import failed:', error);
-      setError(error.response?.data?.detail || 'Failed to import CSV');
+      setError(error.response?.data?.detail || error.message || 'Failed to import CSV');
     } finally {
       setImportLoading(false);
     }
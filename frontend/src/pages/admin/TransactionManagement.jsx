@@ -19,8 +19,8 @@ const TransactionManagement = () => {
   useEffect(() => {
     const loadTransactions = async () => {
       try {
-        const data = await adminApi.getAllTransactions();
-        setTransactions(data);
+        const data = await adminApi.getAllTransactions({ limit: 1000 });
+        setTransactions(data.transactions || []);
       } catch (error) {
         console.error('Error loading transactions:', error);
       } finally {
@@ -63,7 +63,7 @@ const TransactionManagement = () => {
         response = await adminApi.exportTransactionsCSV();
       }
       
-      const blob = new Blob([response.csv_data], { type: 'text/csv;charset=utf-8;' });
+      const blob = response.blob;
       const link = document.createElement('a');
       const url = URL.createObjectURL(blob);
       link.setAttribute('href', url);
@@ -99,8 +99,8 @@ const TransactionManagement = () => {
           alert(`${result.message}\n\nImported: ${result.imported_count} transactions\nErrors: ${result.total_errors}`);
           
           // Reload transactions after import
-          const data = await adminApi.getAllTransactions();
-          setTransactions(data);
+          const data = await adminApi.getAllTransactions({ limit: 1000 });
+          setTransactions(data.transactions || []);
           
           setShowImportModal(false);
           setImportFile(null);
@@ -31,7 +31,7 @@ const AuditorDashboard = () => {
       
       setUsers(usersData || []);
       setAccounts(accountsData || []);
-      setTransactions(transactionsData || []);
+      setTransactions(transactionsData?.transactions || []);
       setLogs(logsData || []);
     } catch (error) {
       console.error('Failed to load audit data:', error);
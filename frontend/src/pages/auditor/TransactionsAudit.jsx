@@ -17,7 +17,7 @@ const TransactionsAudit = () => {
   const loadTransactions = async () => {
     try {
       const transactionsData = await adminApi.getAllTransactions();
-      setTransactions(transactionsData || []);
+      setTransactions(transactionsData?.transactions || []);
     } catch (error) {
       console.error('Failed to load transactions:', error);
       // Mock data
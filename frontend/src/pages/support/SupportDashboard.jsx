@@ -47,19 +47,19 @@ const SupportDashboard = () => {
         }),
         adminApi.getAllTransactions().catch(err => {
           console.warn('Failed to load transactions:', err.message);
-          return [];
+          return { transactions: [] };
         })
       ]);
       
       console.log('Support Dashboard Data loaded:', { 
         users: usersData?.length || 0, 
         accounts: accountsData?.length || 0, 
-        transactions: transactionsData?.length || 0 
+        transactions: transactionsData?.transactions?.length || 0 
       });
       
       setUsers(Array.isArray(usersData) ? usersData : []);
       setAccounts(Array.isArray(accountsData) ? accountsData : []);
-      setTransactions(Array.isArray(transactionsData) ? transactionsData : []);
+      setTransactions(Array.isArray(transactionsData?.transactions) ? transactionsData.transactions : []);
     } catch (error) {
       console.error('Failed to load support data:', error);
       setUsers([]);